@@ -1,17 +1,69 @@
 import argparse
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
 from connectx import Game
+from connectx.ratings import sprt_bounds, sprt_llr
+
+
+def playShard(agent: str, benchmarkAgent: str, agentPlayer: int, games: int, rows: int, cols: int,
+              winCondition: int, seed: int) -> dict[str, int]:
+    """
+    Plays a shard of the benchmark's games, with the agent being tested always in the same player position.
+
+    :param agent: String that specifies the agent being tested.
+    :param benchmarkAgent: String that specifies the agent being benchmarked against.
+    :param agentPlayer: Integer value for which player the agent being tested is.
+    :param games: Integer number of games to play.
+    :param rows: Integer value for the number of rows on the board.
+    :param cols: Integer value for the number of columns on the board.
+    :param winCondition: Integer value for the number of counters in a row needed to win.
+    :param seed: Seed for the agents' random choices, so that each shard plays different games.
+    :return: Dictionary of the agent being tested's number of wins, draws and losses.
+    """
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+    game = Game(
+        verbose=False,
+        board_rows=rows,
+        board_cols=cols,
+        win_condition=winCondition,
+        player1=agent if agentPlayer == 1 else benchmarkAgent,
+        player2=benchmarkAgent if agentPlayer == 1 else agent
+    )
+    outcomes = {
+        "win": 0,
+        "draw": 0,
+        "loss": 0
+    }
+    for _ in range(games):
+        result = game.all_turns()
+        if result == agentPlayer:
+            outcomes["win"] += 1
+        elif result is None:
+            outcomes["draw"] += 1
+        else:
+            outcomes["loss"] += 1
+        game.board.reset_board()
+    game.close()
+    return outcomes
 
 
 if __name__ == '__main__':
     """
     This file is used to benchmark an agent against another agent.
-    Command line arguments can be used to configure the benchmarking, specifying parameters of the board, game and 
+    Command line arguments can be used to configure the benchmarking, specifying parameters of the board, game and
     players.
     Use command -h or --help to see available arguments.
 
     Usage:
     '''sh
-    python3 play.py -g 100 -a connectx/models/PPO_6-7-4_v0.1/PPO_6-7-4_v0.1_50000
+    python3 benchmark.py -g 100 --workers 8 -a connectx/models/PPO_6-7-4_v0.1/PPO_6-7-4_v0.1_50000
+    python3 benchmark.py -g 5000 --sprt 0 50 -a ab6 -b look3
     '''
     """
     parser = argparse.ArgumentParser()
@@ -27,57 +79,111 @@ if __name__ == '__main__':
                         help='The agent being tested.')
     parser.add_argument('-b', '--benchmarkAgent', type=str, nargs='?', default='look3',
                         help='The agent being benchmarked against.')
+    parser.add_argument('--workers', type=int, nargs='?', default=1,
+                        help='Number of processes to play the games across.')
+    parser.add_argument('--seed', type=int, nargs='?', default=None,
+                        help='Seed that the seeds of each shard of games are drawn from, to repeat a benchmark.')
+    parser.add_argument('--sprt', type=float, nargs=2, default=None, metavar=('ELO0', 'ELO1'),
+                        help='Stop as soon as a sequential probability ratio test finds whether the agent is ELO0 or '
+                             'ELO1 stronger than the benchmark agent, with --games becoming the most games played in '
+                             'each player position.')
+    parser.add_argument('--alpha', type=float, nargs='?', default=0.05,
+                        help='Probability of the test finding the agent is ELO1 stronger when it is ELO0 stronger.')
+    parser.add_argument('--beta', type=float, nargs='?', default=0.05,
+                        help='Probability of the test finding the agent is ELO0 stronger when it is ELO1 stronger.')
     args = parser.parse_args()
 
-    outcomes = {
-        "win": 0,
-        "draw": 0,
-        "loss": 0
-    }
+    if args.workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if args.sprt is not None:
+        lowerBound, upperBound = sprt_bounds(args.alpha, args.beta)
 
     print(f"\nAgent being benchmarked: {args.agent}")
     print(f"Benchmark agent: {args.benchmarkAgent}\n")
 
-    game1 = Game(
-        verbose=False,
-        winCondition=args.winCondition,
-        boardRows=args.rows,
-        boardCols=args.columns,
-        player1=args.agent,
-        player2=args.benchmarkAgent
-    )
-    print("Running games as player 1...")
-    for _ in range(args.games):
-        result = game1.allTurns()
-        if result == 1:
-            outcomes["win"] += 1
-        elif result == 2:
-            outcomes["loss"] += 1
-        else:
-            outcomes["draw"] += 1
-        game1.board.reset_board()
-    print("Player 1 games complete.\n")
-    print(f"Agent record as player 1: {outcomes['win']} Wins, {outcomes['draw']} Draws, {outcomes['loss']} Losses\n")
+    # Games in each player position are split into shards, several per worker, so that progress can be reported as
+    # each shard completes. A sequential test is checked after every shard, so its shards are kept small.
+    if args.sprt is not None:
+        shardSize = 1
+    else:
+        shardSize = math.ceil(args.games / (min(args.games, 4 * args.workers) if args.workers > 1 else 1))
+    shards = []
+    for start in range(0, args.games, shardSize):
+        # Shards alternate between player positions, so that the games played so far are balanced between them.
+        for agentPlayer in (1, 2):
+            shards.append((agentPlayer, min(shardSize, args.games - start)))
+    # Every shard gets an independent seed, so that shards don't repeat each other's games.
+    seeds = [int(s.generate_state(1, np.uint64)[0]) for s in np.random.SeedSequence(args.seed).spawn(len(shards))]
 
-    game2 = Game(
-        verbose=False,
-        winCondition=args.winCondition,
-        boardRows=args.rows,
-        boardCols=args.columns,
-        player1=args.benchmarkAgent,
-        player2=args.agent
-    )
-    print("Running games as player 2...")
-    for _ in range(args.games):
-        result = game2.allTurns()
-        if result == 2:
-            outcomes["win"] += 1
-        elif result == 1:
-            outcomes["loss"] += 1
-        else:
-            outcomes["draw"] += 1
-        game2.board.reset_board()
-    print("Player 2 games complete.\n")
+    outcomes = {
+        1: {"win": 0, "draw": 0, "loss": 0},
+        2: {"win": 0, "draw": 0, "loss": 0}
+    }
+    gamesPlayed = 0
+    llr = 0.0
+
+    def recordShard(agentPlayer: int, shardOutcomes: dict[str, int]) -> bool:
+        """
+        Adds a shard's outcomes to the totals, and reports progress.
 
-    print(f"Agent overall win percentage: {(outcomes['win'] * 100)/(2 * args.games):.2f}%")
-    print(f"Agent overall record: {outcomes['win']} Wins, {outcomes['draw']} Draws, {outcomes['loss']} Losses")
+        :return: Boolean indicating whether the sequential test, if there is one, has stopped the benchmark.
+        """
+        global gamesPlayed, llr
+        for outcome, count in shardOutcomes.items():
+            outcomes[agentPlayer][outcome] += count
+        gamesPlayed += sum(shardOutcomes.values())
+        wins = sum(o['win'] for o in outcomes.values())
+        draws = sum(o['draw'] for o in outcomes.values())
+        losses = sum(o['loss'] for o in outcomes.values())
+        progress = f"{gamesPlayed}/{2 * args.games} games complete: {wins} Wins, {draws} Draws, {losses} Losses"
+        if args.sprt is None:
+            print(progress)
+            return False
+
+        llr = sprt_llr(wins, draws, losses, *args.sprt)
+        print(f"{progress}, LLR {llr:.2f} ({lowerBound:.2f}, {upperBound:.2f})")
+        return not lowerBound < llr < upperBound
+
+    print(f"Running games across {args.workers} worker(s)...")
+    if args.workers == 1:
+        for (agentPlayer, games), seed in zip(shards, seeds):
+            if recordShard(agentPlayer, playShard(args.agent, args.benchmarkAgent, agentPlayer, games, args.rows,
+                                                  args.columns, args.winCondition, seed)):
+                break
+    else:
+        with ProcessPoolExecutor(args.workers) as executor:
+            futures = {
+                executor.submit(playShard, args.agent, args.benchmarkAgent, agentPlayer, games, args.rows,
+                                args.columns, args.winCondition, seed): agentPlayer
+                for (agentPlayer, games), seed in zip(shards, seeds)
+            }
+            # Shorter games, which are more often decisive, finish first, so a sequential test that saw shards as they
+            # completed would be biased towards stopping early on them. Its shards are taken in the order they were
+            # submitted instead, with later shards still being played in the meantime.
+            completed = futures if args.sprt is not None else as_completed(futures)
+            for future in completed:
+                if recordShard(futures[future], future.result()):
+                    # Shards already being played are left to finish, but their games aren't counted.
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+    print("Games complete.\n")
+
+    for agentPlayer in (1, 2):
+        print(f"Agent record as player {agentPlayer}: {outcomes[agentPlayer]['win']} Wins, "
+              f"{outcomes[agentPlayer]['draw']} Draws, {outcomes[agentPlayer]['loss']} Losses")
+    wins = sum(o['win'] for o in outcomes.values())
+    draws = sum(o['draw'] for o in outcomes.values())
+    losses = sum(o['loss'] for o in outcomes.values())
+    print(f"\nAgent overall win percentage: {(wins * 100) / gamesPlayed:.2f}%")
+    print(f"Agent overall record: {wins} Wins, {draws} Draws, {losses} Losses")
+
+    if args.sprt is not None:
+        elo0, elo1 = args.sprt
+        if llr >= upperBound:
+            print(f"\nSPRT accepted that the agent is {elo1:g} Elo stronger than the benchmark agent, after "
+                  f"{gamesPlayed} games.")
+        elif llr <= lowerBound:
+            print(f"\nSPRT accepted that the agent is {elo0:g} Elo stronger than the benchmark agent, after "
+                  f"{gamesPlayed} games.")
+        else:
+            print(f"\nSPRT was inconclusive after {gamesPlayed} games, with a log-likelihood ratio of {llr:.2f}.")
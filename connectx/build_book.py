@@ -0,0 +1,51 @@
+import argparse
+import time
+from connectx.players.agents.book import OpeningBook
+
+
+if __name__ == '__main__':
+    """
+    This file is used to build an opening book, solving every position up to a number of moves into the game.
+    Agents that use opening books will find the book automatically for its board size.
+    Use command -h or --help to see available arguments.
+
+    The positions nearest the start of the game are the slowest to solve. A complete book is practical for smaller
+    boards, but on the standard 6x7 board the empty board alone takes hours to solve, so only a partial book can be
+    built, using --timeLimit to leave out positions that can't be solved quickly.
+
+    Usage:
+    '''sh
+    python3 build_book.py -r 5 -c 6 -d 8
+    python3 build_book.py -d 6 --minDepth 4 --timeLimit 2 --weak
+    '''
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--depth', type=int, nargs='?', default=8,
+                        help='Number of moves into the game to solve positions up to. Every position up to this depth '
+                             'is solved, which is not feasible on the standard 6x7 board without --timeLimit.')
+    parser.add_argument('--minDepth', type=int, nargs='?', default=0,
+                        help='Number of moves into the game to solve positions from, skipping the slowest positions.')
+    parser.add_argument('--timeLimit', type=float, nargs='?', default=None,
+                        help='Seconds each position may take to solve before it is left out of the book.')
+    parser.add_argument('-w', '--winCondition', type=int, nargs='?', default=4,
+                        help='Specify number of counters in a row needed to win.')
+    parser.add_argument('-r', '--rows', type=int, nargs='?', default=6,
+                        help='Specify number of rows on board.')
+    parser.add_argument('-c', '--columns', type=int, nargs='?', default=7,
+                        help='Specify number of columns on board.')
+    parser.add_argument('--weak', action='store_true',
+                        help='Only solve for the result (win, draw or loss) of each position, which is much faster.')
+    parser.add_argument('-o', '--output', type=str, nargs='?', default=None,
+                        help='Filepath to write the book to, defaulting to where agents look for it.')
+    args = parser.parse_args()
+
+    output = args.output
+    if output is None:
+        output = OpeningBook.filepath(args.rows, args.columns, args.winCondition)
+
+    print(f"\nBuilding opening book to a depth of {args.depth} moves...")
+    start = time.time()
+    book = OpeningBook.build(args.rows, args.columns, args.winCondition, args.depth, args.weak,
+                             min_depth=args.minDepth, time_limit=args.timeLimit)
+    OpeningBook.write(book, output)
+    print(f"Wrote {len(book)} positions to \'{output}\' in {time.time() - start:.1f}s.")
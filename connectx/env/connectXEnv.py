@@ -1,5 +1,9 @@
+import random
+
 import gym
-from connectx.game.game import TrainingGame
+from connectx.game import batch
+from connectx.game.game import Game
+from connectx.players.players import UserPlayer
 
 import numpy as np
 
@@ -9,6 +13,8 @@ class ConnectXEnv(gym.Env):
     Custom Environment for Connect X that follows gym interface.
     """
     metadata = {'render.modes': ['human']}
+    OBS_DTYPES = [np.dtype(np.int8), np.dtype(np.float32), np.dtype(np.float64)]
+    OBS_MODES = ['flat', 'planes']
 
     def __init__(self,
                  verbose: bool = False,
@@ -16,7 +22,9 @@ class ConnectXEnv(gym.Env):
                  cols: int = 7,
                  winCondition: int = 4,
                  player1: str or None = None,
-                 player2: str or None = None):
+                 player2: str or None = None,
+                 obsDtype: np.dtype = np.float64,
+                 obsMode: str = 'flat'):
         """
         This class is used to create a Connect-X Environment for the agents to use to train.
 
@@ -26,16 +34,30 @@ class ConnectXEnv(gym.Env):
         :param winCondition: Integer value for the number of counters in a row required to win.
         :param player1: String indicating the player taking the role of player 1.
         :param player2: String indicating the player taking the role of player 2.
+        :param obsDtype: Numpy data type of the observations, one of int8, float32 or float64. An int8 observation is an
+            eighth of the size of a float64 one, for algorithms that store many observations.
+        :param obsMode: String indicating the layout of the observations: 'flat' for the board followed by the column
+            counters, as in Board.get_observation, or 'planes' for an array of shape (4, rows, cols) holding the agent's
+            counters, the opponent's counters, the position a counter dropped in each column would land in, and whether
+            the agent is player 1, for convolutional policies.
         """
         super(ConnectXEnv, self).__init__()
 
-        # Use a child of game specifically made for agent training.
-        self.game = TrainingGame(verbose=verbose,
-                                 boardRows=rows,
-                                 boardCols=cols,
-                                 winCondition=winCondition,
-                                 player1=player1,
-                                 player2=player2)
+        obsDtype = np.dtype(obsDtype)
+        if obsDtype not in self.OBS_DTYPES:
+            raise ValueError("obsDtype must be one of int8, float32 or float64.")
+        if obsMode not in self.OBS_MODES:
+            raise ValueError(f"obsMode must be one of {self.OBS_MODES}.")
+        self.obsMode = obsMode
+
+        # The agent being trained is the player left as None, which the game would otherwise let a user play as.
+        self.game = Game(verbose=verbose,
+                         board_rows=rows,
+                         board_cols=cols,
+                         win_condition=winCondition,
+                         player1=player1,
+                         player2=player2,
+                         obs_dtype=obsDtype)
         self.agentNum = self._getAgentVal()
         self.opponentNum = 1 if self.agentNum == 2 else 2
 
@@ -44,12 +66,14 @@ class ConnectXEnv(gym.Env):
         # self.prev_actions = None
         # Removed this feature this can be classified as a Markov state game
         # where history is irrelevant.
-        self.observation_space = gym.spaces.Box(low=-1, high=self.game.board.rows,
-                                                shape=(
-                                                    self.game.board.maxMoves + len(self.game.board.col_counters()),),
-                                                dtype=np.float64)
-
-        self.firstTurn = True
+        if self.obsMode == 'planes':
+            # The planes are written into the same array every step, rather than a new one being built.
+            self._planes = np.zeros((1, 4, self.game.board.rows, self.game.board.cols), dtype=obsDtype)
+            self.observation_space = gym.spaces.Box(low=0, high=1, shape=self._planes.shape[1:], dtype=obsDtype)
+        else:
+            self.observation_space = gym.spaces.Box(low=-1, high=self.game.board.rows,
+                                                    shape=(self.game.board.max_moves + self.game.board.cols,),
+                                                    dtype=obsDtype)
 
     def _getAgentVal(self) -> int:
         """
@@ -58,20 +82,46 @@ class ConnectXEnv(gym.Env):
         :return: Integer defining the player value of the agent being trained.
         """
         return [i + 1 for i,
-                name in enumerate(self.game.players) if name is None][0]
+                player in enumerate(self.game.players) if isinstance(player, UserPlayer)][0]
+
+    def _opponentTurn(self):
+        """
+        Function that makes the opponent take their turn.
+        """
+        action = self.game.player(self.opponentNum).perform_turn()
+        self.game.board.update_board(action, self.opponentNum)
+
+    def _observation(self) -> np.ndarray:
+        """
+        Function to obtain the observation of the board, as the agent sees it.
+
+        :return: Numpy array of the observation, in the layout given by obsMode.
+        """
+        board = self.game.board
+        if self.obsMode == 'planes':
+            batch.planes(board.board_array().reshape(1, board.rows, board.cols), board.col_counters().reshape(1, -1),
+                         self.agentNum, out=self._planes)
+            observation = self._planes[0]
+        else:
+            observation = board.get_observation()
+        # The observation is a view that changes with the board, so it is copied for callers that keep it past the next
+        # reset, such as vectorised environments.
+        return observation.copy()
 
     def _calculateSubReward(self, player: int) -> float:
         """
         Calculates the sub-rewards specified for the agents.
         That being any number of counters in the following range: 1 < x < winCondition.
+        Lines are counted along every diagonal, as in Board.check_for_lines, so the sub-rewards of boards with diagonal
+        lines shorter than the win condition are larger than those models trained before the move to bitboards saw.
 
         :param player: Integer player value for player whose reward is being calculated.
         :return: Float value for the sub-reward.
         """
+        lines = self.game.board.line_histogram((player,))[player]
         reward = 0
-        for i in range(2, self.game.board.winCondition):
-            reward += self.game.board.check_for_lines(
-                player, i) * ((i ** 2) * 0.001)
+        for i in range(2, self.game.board.win_condition):
+            reward += lines[i] * ((i ** 2) * 0.001)
         return reward
 
     def _trainingStep(self, action: int):
@@ -91,28 +141,34 @@ class ConnectXEnv(gym.Env):
 
         if not done:
             # Agent being trained takes its turn.
-            self.game.trainingAgentTurn(action, self.agentNum)
+            self.game.board.update_board(action, self.agentNum)
             # Checks if action caused game to end in a win for training agent.
-            if self.game.board.check_for_lines(self.agentNum) > 0:
+            if self.game.board.last_move_wins():
                 reward += 10.0
                 done = True
+            elif self.game.board.num_moves == self.game.board.max_moves:
+                # The game is a draw once the board is full.
+                done = True
             else:
                 # Calculates sub-reward if game not ended.
                 reward += self._calculateSubReward(self.agentNum)
 
                 # Opponent gets to take turn.
-                self.game.opponentTurn(self.opponentNum)
+                self._opponentTurn()
                 # Check if opponent's turn ended game.
-                if self.game.board.check_for_lines(self.opponentNum) > 0:
+                if self.game.board.last_move_wins():
                     reward = -10.0
                     done = True
+                elif self.game.board.num_moves == self.game.board.max_moves:
+                    done = True
                 else:
                     # Calculate negative rewards.
                     reward -= self._calculateSubReward(self.opponentNum)
 
         # Create observation space and return relevant information.
-        observation = self.game.board.get_observation()
-        info = {}
+        # The mask of legal actions is given for the next step.
+        observation = self._observation()
+        info = {"action_mask": self.action_masks()}
         return observation, reward, done, info
 
     def step(self, action: int) -> tuple:
@@ -122,26 +178,44 @@ class ConnectXEnv(gym.Env):
         :param action: The action that the agent is taking.
         :return: Tuple containing the observation, reward, game-over flag, and info.
         """
-        if self.firstTurn and self.opponentNum == 1:
-            # Check if first turn in the game is being played, and make the
-            # opponent take a turn if they are player 1.
-            self.game.opponentTurn(self.opponentNum)
-            self.firstTurn = False
-
         return self._trainingStep(action)
 
     def reset(self) -> np.array:
         """
         Reset the board so the environment can be reused.
+        If the opponent is player 1, they take their first turn straight away, so the agent sees their counter.
 
         :return observation: Return the observation of the reset board.
         """
         self.game.board.reset_board()
-        self.firstTurn = True
+        if self.opponentNum == 1:
+            self._opponentTurn()
 
-        observation = self.game.board.get_observation()
+        observation = self._observation()
         return observation  # reward, done, info can't be included
 
+    def action_masks(self) -> np.ndarray:
+        """
+        Find the actions the agent can take without choosing a full column, in the form used by maskable policies.
+
+        :return: Boolean array indicating whether each action is legal.
+        """
+        return self.game.board.legal_moves()
+
+    def seed(self, seed: int or None = None) -> list[int or None]:
+        """
+        Seed the random choices of the opponent.
+
+        :param seed: The seed, or None to leave the random choices unseeded.
+        :return: List of the seed used.
+        """
+        # Agents make their random choices with the global random generators, which each environment worker process
+        # has its own copy of.
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        return [seed]
+
     def render(self, mode='human'):
         """
         Show the board during the game.
@@ -150,4 +224,8 @@ class ConnectXEnv(gym.Env):
         """
         self.game.board.print_board(None)
 
-    # def close (self):
+    def close(self):
+        """
+        Shut down the worker processes of the opponent, if it has any.
+        """
+        self.game.close()
@@ -0,0 +1,90 @@
+import random
+
+import gym
+import numpy as np
+
+
+class MirrorWrapper(gym.Wrapper):
+    """
+    Wrapper for the Connect-X Environment that shows the agent a mirror image of the board in some episodes.
+    """
+
+    def __init__(self, env: gym.Env, mirror_prob: float = 0.5):
+        """
+        Connect-X is symmetric under reversing the columns of the board, so an episode played on the mirror image of the
+        board is as valid a training example as the original. Mirroring episodes at random means the rollouts collected
+        by the agent contain both versions of positions, without any extra games having to be played.
+
+        The game itself is always played on the real board, so the opponent is unaffected. Only the observations the
+        agent sees, and the actions it takes, are mirrored.
+
+        Usage:
+        '''python
+        env = MirrorWrapper(ConnectXEnv(player2='look3'))
+        model = PPO('MlpPolicy', env)
+        '''
+
+        :param env: The Connect-X Environment being wrapped.
+        :param mirror_prob: Float probability of each episode being mirrored.
+        """
+        super(MirrorWrapper, self).__init__(env)
+
+        if not 0 <= mirror_prob <= 1:
+            raise ValueError("mirror_prob must be between 0 and 1.")
+        self.mirror_prob: float = mirror_prob
+
+        self._rows: int = env.game.board.rows
+        self._cols: int = env.game.board.cols
+        self.mirrored: bool = False
+
+    def _mirrorObservation(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Reverses the columns of an observation, made up of either the board followed by the column counters, or the
+        planes of the board.
+
+        :param observation: Numpy array of the observation of the real board.
+        :return: Numpy array of the observation of the mirrored board.
+        """
+        if observation.ndim == 3:
+            return observation[:, :, ::-1].copy()
+        num_cells = self._rows * self._cols
+        board = observation[:num_cells].reshape(self._rows, self._cols)[:, ::-1]
+        return np.concatenate((board.ravel(), observation[num_cells:][::-1]))
+
+    def step(self, action: int) -> tuple:
+        """
+        Take a step within the environment, mirroring the action and the resulting observation if the episode is
+        mirrored.
+
+        :param action: The action that the agent is taking, on the board it sees.
+        :return: Tuple containing the observation, reward, game-over flag, and info.
+        """
+        if self.mirrored:
+            action = self._cols - 1 - action
+        observation, reward, done, info = self.env.step(action)
+        if self.mirrored:
+            observation = self._mirrorObservation(observation)
+            if "action_mask" in info:
+                info["action_mask"] = info["action_mask"][::-1]
+        return observation, reward, done, info
+
+    def action_masks(self) -> np.ndarray:
+        """
+        Find the actions the agent can take without choosing a full column, on the board it sees.
+
+        :return: Boolean array indicating whether each action is legal.
+        """
+        masks = self.env.action_masks()
+        return masks[::-1] if self.mirrored else masks
+
+    def reset(self, **kwargs) -> np.array:
+        """
+        Reset the environment, and choose whether the new episode is mirrored.
+
+        :return observation: Return the observation of the reset board, as the agent sees it.
+        """
+        observation = self.env.reset(**kwargs)
+        self.mirrored = random.random() < self.mirror_prob
+        if self.mirrored:
+            observation = self._mirrorObservation(observation)
+        return observation
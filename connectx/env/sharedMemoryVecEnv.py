@@ -0,0 +1,174 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Callable
+
+import gym
+from stable_baselines3.common.env_util import is_wrapped
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+import numpy as np
+
+
+def _worker(remote, parentRemote, envFnWrapper: CloudpickleWrapper, sharedName: str, shape: tuple, dtype,
+            index: int):
+    """
+    Runs an environment in a worker process, writing its observations into its row of the shared observation array.
+
+    :param remote: The worker's end of the pipe that commands are received, and results sent, on.
+    :param parentRemote: The main process's end of the pipe, which the worker closes.
+    :param envFnWrapper: Wrapped function that creates the environment.
+    :param sharedName: The name of the shared memory holding the observations of every environment.
+    :param shape: The shape of the array of observations of every environment.
+    :param dtype: The data type of the observations.
+    :param index: The index of the worker's environment, and so its row of the observations.
+    """
+    parentRemote.close()
+    env = envFnWrapper.var()
+    sharedMemory = shared_memory.SharedMemory(name=sharedName)
+    observations = np.ndarray(shape, dtype=dtype, buffer=sharedMemory.buf)
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == 'step':
+                observation, reward, done, info = env.step(data)
+                if done:
+                    # Reset the environment as soon as its game ends, keeping the final observation in the info.
+                    info["terminal_observation"] = observation
+                    observation = env.reset()
+                observations[index] = observation
+                remote.send((reward, done, info))
+            elif cmd == 'reset':
+                observations[index] = env.reset()
+                remote.send(None)
+            elif cmd == 'seed':
+                remote.send(env.seed(data))
+            elif cmd == 'get_attr':
+                remote.send(getattr(env, data))
+            elif cmd == 'set_attr':
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == 'env_method':
+                remote.send(getattr(env, data[0])(*data[1], **data[2]))
+            elif cmd == 'is_wrapped':
+                remote.send(is_wrapped(env, data))
+            elif cmd == 'close':
+                env.close()
+                remote.close()
+                break
+            else:
+                raise NotImplementedError(f"'{cmd}' is not a command of the worker.")
+    finally:
+        sharedMemory.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Vectorised Environment that runs each environment in its own process, like stable-baselines3's SubprocVecEnv, but
+    with observations passed back through shared memory.
+    """
+
+    def __init__(self, envFns: list[Callable[[], gym.Env]], startMethod: str or None = None):
+        """
+        Every worker writes its environment's observations straight into its row of an array held in shared memory, so
+        only the actions, rewards, game-over flags and infos are sent through the pipes between processes, and the
+        observations of every environment are read back without being pickled or copied.
+
+        :param envFns: List of functions that each create one of the environments.
+        :param startMethod: The method used to start the worker processes, defaulting to 'forkserver' where it is
+            available, and 'spawn' otherwise.
+        """
+        self.waiting = False
+        self.closed = False
+
+        # Create a single environment in the main process to find the spaces and observation dtype.
+        env = envFns[0]()
+        observationSpace, actionSpace = env.observation_space, env.action_space
+        env.close()
+
+        shape = (len(envFns),) + observationSpace.shape
+        dtype = np.dtype(observationSpace.dtype)
+        self._sharedMemory = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self._observations = np.ndarray(shape, dtype=dtype, buffer=self._sharedMemory.buf)
+
+        if startMethod is None:
+            startMethod = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(startMethod)
+
+        self.remotes, self.workRemotes = zip(*[ctx.Pipe() for _ in envFns])
+        self.processes = []
+        for index, (workRemote, remote, envFn) in enumerate(zip(self.workRemotes, self.remotes, envFns)):
+            args = (workRemote, remote, CloudpickleWrapper(envFn), self._sharedMemory.name, shape, dtype, index)
+            # Daemon processes are killed if the main process exits without closing the environments.
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            workRemote.close()
+
+        super(SharedMemoryVecEnv, self).__init__(len(envFns), observationSpace, actionSpace)
+
+    def step_async(self, actions: np.ndarray):
+        for remote, action in zip(self.remotes, actions):
+            remote.send(('step', action))
+        self.waiting = True
+
+    def step_wait(self) -> tuple:
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        rewards, dones, infos = zip(*results)
+        # Every worker has written its observation by the time it sends its result.
+        return self._observations.copy(), np.array(rewards, dtype=np.float32), np.array(dones), list(infos)
+
+    def reset(self) -> np.ndarray:
+        for remote in self.remotes:
+            remote.send(('reset', None))
+        for remote in self.remotes:
+            remote.recv()
+        return self._observations.copy()
+
+    def seed(self, seed: int or None = None) -> list[int or None]:
+        for index, remote in enumerate(self.remotes):
+            remote.send(('seed', seed + index if seed is not None else None))
+        return [remote.recv() for remote in self.remotes]
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self._observations = None
+        self._sharedMemory.close()
+        self._sharedMemory.unlink()
+        self.closed = True
+
+    def _getTargetRemotes(self, indices) -> list:
+        return [self.remotes[i] for i in self._get_indices(indices)]
+
+    def get_attr(self, attr_name: str, indices=None) -> list:
+        targetRemotes = self._getTargetRemotes(indices)
+        for remote in targetRemotes:
+            remote.send(('get_attr', attr_name))
+        return [remote.recv() for remote in targetRemotes]
+
+    def set_attr(self, attr_name: str, value, indices=None):
+        targetRemotes = self._getTargetRemotes(indices)
+        for remote in targetRemotes:
+            remote.send(('set_attr', (attr_name, value)))
+        for remote in targetRemotes:
+            remote.recv()
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> list:
+        targetRemotes = self._getTargetRemotes(indices)
+        for remote in targetRemotes:
+            remote.send(('env_method', (method_name, method_args, method_kwargs)))
+        return [remote.recv() for remote in targetRemotes]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> list[bool]:
+        targetRemotes = self._getTargetRemotes(indices)
+        for remote in targetRemotes:
+            remote.send(('is_wrapped', wrapper_class))
+        return [remote.recv() for remote in targetRemotes]
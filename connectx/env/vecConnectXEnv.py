@@ -0,0 +1,245 @@
+import random
+
+import gym
+from stable_baselines3.common.vec_env import VecEnv
+
+from connectx.env.connectXEnv import ConnectXEnv
+from connectx.game import batch
+from connectx.game.game import Game
+
+import numpy as np
+
+
+class VecConnectXEnv(VecEnv):
+    """
+    Batched Environment for Connect X that follows the stable-baselines3 VecEnv interface.
+    """
+    # Methods of the batch that return an array with a row for each environment.
+    BATCH_METHODS = ['action_masks']
+
+    def __init__(self,
+                 numEnvs: int = 8,
+                 rows: int = 6,
+                 cols: int = 7,
+                 winCondition: int = 4,
+                 player1: str or None = None,
+                 player2: str or None = None,
+                 seed: int or None = None,
+                 obsDtype: np.dtype = np.float64,
+                 obsMode: str = 'flat'):
+        """
+        This class is used to create many Connect-X Environments, for the agents to use to train, which are stepped
+        together.
+
+        The boards of every environment are kept in a single array, and every step is applied to all of them at once,
+        with wins and rewards found using array operations. Each environment gives the same observations and rewards as
+        a ConnectXEnv, and is reset as soon as its game ends, with the final observation of the game given in its info.
+
+        :param numEnvs: Integer number of environments.
+        :param rows: Integer value for the number of rows the boards will have.
+        :param cols: Integer value for the number of columns the boards will have.
+        :param winCondition: Integer value for the number of counters in a row required to win.
+        :param player1: String indicating the opponent taking the role of player 1, as any agent accepted by Game, or
+            None for the agent being trained.
+        :param player2: String indicating the opponent taking the role of player 2, as any agent accepted by Game, or
+            None for the agent being trained.
+        :param seed: Seed for the opponents' random choices.
+        :param obsDtype: Numpy data type of the observations, one of int8, float32 or float64, as in ConnectXEnv.
+        :param obsMode: String indicating the layout of the observations, 'flat' or 'planes', as in ConnectXEnv.
+        """
+        if (player1 is None) == (player2 is None):
+            raise ValueError("Exactly one of player1 and player2 must be None, for the agent being trained.")
+        obsDtype = np.dtype(obsDtype)
+        if obsDtype not in ConnectXEnv.OBS_DTYPES:
+            raise ValueError("obsDtype must be one of int8, float32 or float64.")
+        if obsMode not in ConnectXEnv.OBS_MODES:
+            raise ValueError(f"obsMode must be one of {ConnectXEnv.OBS_MODES}.")
+        self.obsMode = obsMode
+
+        self.rows = rows
+        self.cols = cols
+        self.winCondition = winCondition
+        self.maxMoves = rows * cols
+        self.agentNum = 1 if player1 is None else 2
+        self.opponentNum = 1 if self.agentNum == 2 else 2
+        # The opponent chooses its actions on every board at once, rather than playing on the game's board.
+        self.game = Game(verbose=False,
+                         board_rows=rows,
+                         board_cols=cols,
+                         win_condition=winCondition,
+                         player1=player1,
+                         player2=player2)
+        self.opponent = self.game.player(self.opponentNum)
+
+        self.grids, self.heights = batch.new_grids(numEnvs, rows, cols)
+        self._actions: np.ndarray or None = None
+        # Weighting of the lines of each length in the sub-rewards, as in ConnectXEnv.
+        self._subRewardWeights = np.array([(i ** 2) * 0.001 for i in range(2, winCondition)])
+
+        if self.obsMode == 'planes':
+            observationSpace = gym.spaces.Box(low=0, high=1, shape=(4, rows, cols), dtype=obsDtype)
+        else:
+            observationSpace = gym.spaces.Box(low=-1, high=rows, shape=(self.maxMoves + cols,), dtype=obsDtype)
+        super(VecConnectXEnv, self).__init__(numEnvs, observationSpace, gym.spaces.Discrete(cols))
+        self.seed(seed)
+
+    def _observations(self) -> np.ndarray:
+        """
+        :return: Array of the observation of each environment, laid out as in ConnectXEnv.
+        """
+        if self.obsMode == 'planes':
+            out = np.empty((self.num_envs,) + self.observation_space.shape, dtype=self.observation_space.dtype)
+            return batch.planes(self.grids, self.heights, self.agentNum, out=out)
+        observations = np.concatenate((self.grids.reshape(self.num_envs, -1), self.heights), axis=1)
+        return observations.astype(self.observation_space.dtype)
+
+    def _opponentActions(self, envs: np.ndarray) -> np.ndarray:
+        """
+        Chooses the opponent's action in each of the given environments.
+
+        :param envs: Array of the indices of the environments the opponent is taking a turn in.
+        :return: Array of the opponent's action in each of the given environments.
+        """
+        if len(envs) == 0:
+            return np.empty(0, dtype=np.int64)
+        return self.opponent.act_batch(self.grids[envs])
+
+    def _calculateSubRewards(self, envs: np.ndarray, player: int) -> np.ndarray:
+        """
+        Calculates the sub-rewards specified for the agents, in each of the given environments.
+        That being any number of counters in the following range: 1 < x < winCondition.
+
+        :param envs: Array of the indices of the environments whose sub-rewards are calculated.
+        :param player: Integer player value for player whose reward is being calculated.
+        :return: Array of the sub-reward in each of the given environments.
+        """
+        lines = batch.line_histogram(self.grids[envs], player, self.winCondition)
+        return lines[:, 2:self.winCondition] @ self._subRewardWeights
+
+    def _resetEnvs(self, envs: np.ndarray):
+        """
+        Empties the boards of the given environments, with the opponent taking their first turn if they are player 1.
+
+        :param envs: Array of the indices of the environments being reset.
+        """
+        self.grids[envs] = 0
+        self.heights[envs] = 0
+        if self.opponentNum == 1 and len(envs):
+            batch.drop(self.grids, self.heights, envs, self._opponentActions(envs), self.opponentNum)
+
+    def reset(self) -> np.ndarray:
+        """
+        Reset every environment's board.
+
+        :return: Array of the observation of each environment.
+        """
+        self._resetEnvs(np.arange(self.num_envs))
+        return self._observations()
+
+    def step_async(self, actions: np.ndarray):
+        self._actions = np.asarray(actions, dtype=np.int64)
+
+    def step_wait(self) -> tuple:
+        """
+        Takes the agent's actions, and the opponent's replies, in every environment.
+
+        :return: Tuple containing the observations, rewards, game-over flags and infos of every environment.
+        """
+        actions = self._actions
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        allEnvs = np.arange(self.num_envs)
+
+        # Ends game if column full.
+        full = self.heights[allEnvs, actions] == self.rows
+        rewards[full] = -10.0
+        dones[full] = True
+
+        envs = allEnvs[~full]
+        batch.drop(self.grids, self.heights, envs, actions[envs], self.agentNum)
+        won = batch.wins(self.grids[envs], self.agentNum, self.winCondition)
+        rewards[envs[won]] += 10.0
+        dones[envs[won]] = True
+        envs = envs[~won]
+        # The game is a draw once the board is full.
+        drawn = self.heights[envs].sum(axis=1) == self.maxMoves
+        dones[envs[drawn]] = True
+        envs = envs[~drawn]
+        rewards[envs] += self._calculateSubRewards(envs, self.agentNum)
+
+        # Opponent gets to take turn.
+        batch.drop(self.grids, self.heights, envs, self._opponentActions(envs), self.opponentNum)
+        won = batch.wins(self.grids[envs], self.opponentNum, self.winCondition)
+        rewards[envs[won]] = -10.0
+        dones[envs[won]] = True
+        envs = envs[~won]
+        drawn = self.heights[envs].sum(axis=1) == self.maxMoves
+        dones[envs[drawn]] = True
+        envs = envs[~drawn]
+        # Calculate negative rewards.
+        rewards[envs] -= self._calculateSubRewards(envs, self.opponentNum)
+
+        observations = self._observations()
+        finished = np.flatnonzero(dones)
+        terminalObservations = observations[finished].copy()
+        if len(finished):
+            self._resetEnvs(finished)
+            observations[finished] = self._observations()[finished]
+        # The mask of legal actions is given for the next step, so is that of the new game in finished environments.
+        masks = self.action_masks()
+        infos = [{"action_mask": mask} for mask in masks]
+        for i, observation in zip(finished, terminalObservations):
+            infos[i]["terminal_observation"] = observation
+        return observations, rewards, dones, infos
+
+    def action_masks(self) -> np.ndarray:
+        """
+        Find the actions the agent can take in each environment without choosing a full column, in the form used by
+        maskable policies.
+
+        :return: Boolean array of shape (numEnvs, cols) indicating whether each action is legal in each environment.
+        """
+        return self.heights < self.rows
+
+    def close(self):
+        self.game.close()
+
+    def seed(self, seed: int or None = None) -> list[int or None]:
+        # Agents make their random choices with the global random generators.
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        return [seed] * self.num_envs
+
+    def _indices(self, indices) -> list[int]:
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+
+    def get_attr(self, attr_name: str, indices=None) -> list:
+        # Every environment shares the attributes of the batch.
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> list:
+        if method_name not in self.BATCH_METHODS:
+            # Other methods, such as reset or seed, act on every environment at once, so can't be called on some of
+            # them, and calling them once for each environment would repeat them on the whole batch.
+            raise ValueError(f"Only the methods {self.BATCH_METHODS} can be called on the environments of a "
+                             f"VecConnectXEnv, not '{method_name}'.")
+        return list(getattr(self, method_name)(*method_args, **method_kwargs)[self._indices(indices)])
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> list[bool]:
+        return [False for _ in self._indices(indices)]
+
+    def render(self, mode: str = 'human'):
+        """
+        Show the board of the first environment during the game.
+
+        :param mode: The type of render to display.
+        """
+        print(self.grids[0])
@@ -0,0 +1,141 @@
+import numpy as np
+
+
+# Row and column steps of the four directions a line can run in: down, right, down-right and down-left.
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+def new_grids(num_boards: int, rows: int = 6, cols: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Creates a batch of empty boards.
+
+    Each board is a grid of the player value held in each position, with the top row of the board first, as in
+    Board.board_array.
+
+    :param num_boards: Integer number of boards in the batch.
+    :param rows: Integer value for the number of rows each board has.
+    :param cols: Integer value for the number of columns each board has.
+    :return: Tuple of the (num_boards, rows, cols) array of boards, and the (num_boards, cols) array of the number of
+        counters in each column of each board.
+    """
+    return np.zeros((num_boards, rows, cols), dtype=np.int8), np.zeros((num_boards, cols), dtype=np.int8)
+
+
+def drop(grids: np.ndarray, heights: np.ndarray, boards: np.ndarray, actions: np.ndarray, player: int):
+    """
+    Drops a counter into a column of each of the given boards, which must not be full.
+
+    :param grids: Array of boards, as returned by new_grids, which is changed in place.
+    :param heights: Array of the number of counters in each column of each board, which is changed in place.
+    :param boards: Array of the indices of the boards to drop counters in.
+    :param actions: Array of the column to drop a counter in, for each of the given boards.
+    :param player: The player value of the counters being dropped.
+    """
+    rows = grids.shape[1]
+    grids[boards, rows - 1 - heights[boards, actions], actions] = player
+    heights[boards, actions] += 1
+
+
+def _shifted(padded: np.ndarray, row_step: int, col_step: int, pad: int) -> np.ndarray:
+    """
+    Views a padded batch of masks, shifted so that each position holds the value of the position a number of steps away.
+
+    :param padded: Array of masks, padded by pad positions on each side of the rows and columns.
+    :param row_step: Integer number of rows away the value is taken from.
+    :param col_step: Integer number of columns away the value is taken from.
+    :param pad: Integer number of positions of padding.
+    :return: View of the shifted masks, the same shape as the unpadded masks.
+    """
+    rows = padded.shape[1] - (2 * pad)
+    cols = padded.shape[2] - (2 * pad)
+    return padded[:, pad + row_step:pad + row_step + rows, pad + col_step:pad + col_step + cols]
+
+
+def count_lines(grids: np.ndarray, player: int, line_len: int) -> np.ndarray:
+    """
+    Counts the lines of at least the specified length on each board, as Board.check_for_lines does.
+
+    :param grids: Array of boards, as returned by new_grids.
+    :param player: Integer value representing the player whose counters are being checked.
+    :param line_len: Integer for the number of counters in a row being looked for.
+    :return: Array of how many times the specified number of counters in a row were found on each board.
+    """
+    mask = grids == player
+    padded = np.pad(mask, ((0, 0), (line_len, line_len), (line_len, line_len)))
+    counts = np.zeros(len(grids), dtype=np.int64)
+    for row_step, col_step in DIRECTIONS:
+        # Counters that begin a line, i.e. do not have a counter of the same player behind them.
+        starts = mask & ~_shifted(padded, -row_step, -col_step, line_len)
+        # Counters that have (line_len - 1) more counters in a row in front of them.
+        lines = mask.copy()
+        for i in range(1, line_len):
+            lines &= _shifted(padded, i * row_step, i * col_step, line_len)
+        counts += (lines & starts).sum(axis=(1, 2))
+    return counts
+
+
+def line_histogram(grids: np.ndarray, player: int, win_condition: int) -> np.ndarray:
+    """
+    Counts the lines of every length up to the win condition on each board, as Board.line_histogram does.
+
+    :param grids: Array of boards, as returned by new_grids.
+    :param player: Integer value representing the player whose counters are being checked.
+    :param win_condition: Integer value for the number of counters in a row required to win.
+    :return: Array of shape (boards, win_condition + 1), where element [b, i] is the number of lines of i counters in a
+        row found on board b. Column 0 is always 0.
+    """
+    mask = grids == player
+    padded = np.pad(mask, ((0, 0), (win_condition, win_condition), (win_condition, win_condition)))
+    counts = np.zeros((len(grids), win_condition + 1), dtype=np.int64)
+    for row_step, col_step in DIRECTIONS:
+        starts = mask & ~_shifted(padded, -row_step, -col_step, win_condition)
+        lines = mask.copy()
+        for line_len in range(1, win_condition + 1):
+            # Each step extends the lines being matched by one counter, so every length is found in turn.
+            counts[:, line_len] += (lines & starts).sum(axis=(1, 2))
+            lines &= _shifted(padded, line_len * row_step, line_len * col_step, win_condition)
+    return counts
+
+
+def wins(grids: np.ndarray, player: int, win_condition: int) -> np.ndarray:
+    """
+    Checks each board for a line of the win condition length.
+
+    :param grids: Array of boards, as returned by new_grids.
+    :param player: Integer value representing the player whose counters are being checked.
+    :param win_condition: Integer value for the number of counters in a row required to win.
+    :return: Boolean array indicating whether the player has won on each board.
+    """
+    mask = grids == player
+    padded = np.pad(mask, ((0, 0), (win_condition, win_condition), (win_condition, win_condition)))
+    won = np.zeros(len(grids), dtype=bool)
+    for row_step, col_step in DIRECTIONS:
+        lines = mask.copy()
+        for i in range(1, win_condition):
+            lines &= _shifted(padded, i * row_step, i * col_step, win_condition)
+        won |= lines.any(axis=(1, 2))
+    return won
+
+
+def planes(grids: np.ndarray, heights: np.ndarray, player: int, out: np.ndarray or None = None) -> np.ndarray:
+    """
+    Builds the planes observation of each board, for convolutional policies.
+
+    The four planes of each board are the player's counters, their opponent's counters, the position a counter dropped
+    in each column would land in, and a plane that is all ones if the player is player 1 and all zeros otherwise.
+
+    :param grids: Array of boards, as returned by new_grids.
+    :param heights: Array of the number of counters in each column of each board.
+    :param player: Integer value representing the player to move, whose counters are in the first plane.
+    :param out: Array of shape (boards, 4, rows, cols) that the planes are written into, or None for a new int8 array.
+    :return: Array of shape (boards, 4, rows, cols) of the planes of each board.
+    """
+    num_boards, rows, cols = grids.shape
+    if out is None:
+        out = np.empty((num_boards, 4, rows, cols), dtype=np.int8)
+    np.equal(grids, player, out=out[:, 0])
+    np.equal(grids, 3 - player, out=out[:, 1])
+    # Rows are numbered from the top, and a full column has no row to land in, as its landing row would be -1.
+    np.equal(np.arange(rows)[None, :, None], (rows - 1 - heights.astype(np.int64))[:, None, :], out=out[:, 2])
+    out[:, 3] = player == 1
+    return out
@@ -1,17 +1,45 @@
 import warnings
 import logging
+import random
 from colorama import Fore, Style
 import numpy as np
 
 
+# Zobrist keys shared by every board of the same size, so that hashes can be compared between boards.
+_ZOBRIST_KEYS: dict[tuple[int, int], tuple[list[list[int]], int]] = {}
+
+
+def _zobrist_keys(rows: int, cols: int) -> tuple[list[list[int]], int]:
+    """
+    Gets the Zobrist keys for a board size, generating them on first use.
+    The keys are seeded from the board size, so they are the same in every process.
+
+    :param rows: Integer value for the number of rows the board has.
+    :param cols: Integer value for the number of columns the board has.
+    :return: Tuple of the 64-bit keys for each player's counter at each bit, indexed by player value then bit, and the
+        key for player 2 being the player to move.
+    """
+    if (rows, cols) not in _ZOBRIST_KEYS:
+        rng = random.Random(f"zobrist-{rows}-{cols}")
+        num_bits = (rows + 1) * cols
+        keys = [[], [rng.getrandbits(64) for _ in range(num_bits)], [rng.getrandbits(64) for _ in range(num_bits)]]
+        _ZOBRIST_KEYS[(rows, cols)] = (keys, rng.getrandbits(64))
+    return _ZOBRIST_KEYS[(rows, cols)]
+
+
 class Board:
-    def __init__(self, rows: int = 6, cols: int = 7, win_condition: int = 4):
+    def __init__(self, rows: int = 6, cols: int = 7, win_condition: int = 4, track_lines: bool = False,
+                 obs_dtype: np.dtype = np.int8):
         """
         This class is used to create and update the game board during a connect-x game.
 
         :param rows: Integer value for the number of rows the board will have.
         :param cols: Integer value for the number of columns the board will have.
         :param win_condition: Integer value for the number of counters in a row required to win.
+        :param track_lines: Bool that indicates whether the line counts for each player should be kept up to date as
+            moves are made, so that line_histogram becomes a lookup rather than a scan of the board.
+        :param obs_dtype: Numpy data type of the observation array. The default of np.int8 holds every position and
+            column counter in a single byte, and float types can be used for an observation that doesn't need casting.
         """
         if type(rows) is not int:
             raise TypeError("rows must be an integer.")
@@ -36,10 +64,64 @@ class Board:
         if rows > 20 or cols > 20:
             warnings.warn("The specified board size is quite large, consider making it smaller.")
 
+        if not isinstance(track_lines, bool):
+            raise TypeError("track_lines must be a bool.")
+        self.__track_lines: bool = track_lines
+
         self.__max_moves: int = self.rows * self.cols
-        self._board_array: np.ndarray = np.zeros(self.max_moves)
-        # Top left position of board is represented by 0th element of 1d matrix.
-        self._col_counters: np.ndarray = np.zeros(self.cols)
+
+        obs_dtype = np.dtype(obs_dtype)
+        if obs_dtype.kind not in 'iuf':
+            raise TypeError("obs_dtype must be an integer or float data type.")
+        if obs_dtype.kind in 'iu' and np.iinfo(obs_dtype).max < self.rows:
+            raise ValueError("obs_dtype must be able to hold the number of rows.")
+
+        # The board is stored as a pair of bitboards, one per player, held in Python integers so that any board size can
+        # be represented. Each column takes up (rows + 1) bits, with bit 0 of a column being its bottom position. The
+        # extra bit at the top of each column is always empty, and stops lines from wrapping between columns.
+        self._col_bits: int = self.rows + 1
+        # Bit shifts that move a position one step vertically, horizontally, and along both diagonals.
+        self._shifts: tuple[int, ...] = (1, self._col_bits, self._col_bits + 1, self._col_bits - 1)
+        # Index 0 is unused so that the player values can be used to index the masks directly.
+        self._masks: list[int] = [0, 0, 0]
+        self._heights: list[int] = [0] * self.cols
+        # Stack of (column, player) pairs for every counter placed, so that moves can be undone.
+        self._moves: list[tuple[int, int]] = []
+        # Zobrist hash of the position and player to move, kept up to date as counters are placed and removed. The hash
+        # of the position's mirror image, with the columns reversed, is kept alongside it.
+        self._zobrist, self._zobrist_side = _zobrist_keys(self.rows, self.cols)
+        self._hash: int = 0
+        self._mirror_hash: int = 0
+        # Running line counts for each player, laid out as returned by line_histogram.
+        self._line_counts: list[list[int]] = [[0] * (self.win_condition + 1) for _ in range(3)]
+
+        # The observation, laid out as the board array followed by the column counters, is kept up to date in place as
+        # counters are placed and removed, so that it never has to be built. Callers are given a read-only view of it.
+        self._obs: np.ndarray = np.zeros(self.max_moves + self.cols, dtype=obs_dtype)
+        self._init_obs_views()
+        # Index in the observation of the position at each height of each column.
+        self._obs_cells: list[list[int]] = [[((self.rows - 1 - height) * self.cols) + column
+                                             for height in range(self.rows)] for column in range(self.cols)]
+
+    def _init_obs_views(self):
+        """
+        Creates the read-only view of the observation given to callers, and the memoryview it is written through.
+        """
+        self._obs_view: np.ndarray = self._obs.view()
+        self._obs_view.flags.writeable = False
+        # Single elements are written through a memoryview, which is quicker than indexing the numpy array.
+        self._obs_items: memoryview = memoryview(self._obs)
+
+    def __getstate__(self) -> dict:
+        # Memoryviews can't be pickled, so the views of the observation are left out, and rebuilt when unpickled.
+        state = self.__dict__.copy()
+        del state['_obs_view']
+        del state['_obs_items']
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init_obs_views()
 
     @property
     def cols(self) -> int:
@@ -57,34 +139,135 @@ class Board:
     def max_moves(self) -> int:
         return self.__max_moves
 
+    @property
+    def track_lines(self) -> bool:
+        return self.__track_lines
+
+    @property
+    def hash_key(self) -> int:
+        return self._hash
+
+    @property
+    def num_moves(self) -> int:
+        return len(self._moves)
+
+    @property
+    def moves(self) -> tuple[tuple[int, int], ...]:
+        # Every (column, player) move made since the board was reset, in order.
+        return tuple(self._moves)
+
+    @property
+    def player_to_move(self) -> int:
+        return 1 if len(self._moves) % 2 == 0 else 2
+
+    def canonical_key(self) -> tuple[int, bool]:
+        """
+        Gets a hash that is the same for a position and its mirror image, as both have the same value and best moves
+        (once mirrored), so they only need to be stored once.
+
+        :return: Tuple of the lesser of the hashes of the position and its mirror image, and whether it was the mirror
+            image's. If so, columns must be mirrored, with cols - 1 - column, between the board and the stored position.
+        """
+        if self._mirror_hash < self._hash:
+            return self._mirror_hash, True
+        return self._hash, False
+
+    def _mirror_bit(self, bit: int) -> int:
+        """
+        Finds the bit of the position in the mirror image of the board, with the columns reversed.
+
+        :param bit: Integer index of a bit in the bitboards.
+        :return: Integer index of the mirrored bit.
+        """
+        col, row = divmod(bit, self._col_bits)
+        return ((self.cols - col - 1) * self._col_bits) + row
+
+    def _position_to_bit(self, i: int) -> int:
+        """
+        Converts a position in the 1D board array, where the 0th element is the top left of the board, to a bit index.
+
+        :param i: Integer position in the 1D board array.
+        :return: Integer index of the corresponding bit in the bitboards.
+        """
+        row, col = divmod(i, self.cols)
+        return (col * self._col_bits) + (self.rows - row - 1)
+
+    @property
+    def obs_dtype(self) -> np.dtype:
+        return self._obs.dtype
+
     def board_array(self) -> np.ndarray:
-        return self._board_array
+        """
+        Gets the 1D board array, where the top left position of the board is represented by the 0th element.
+
+        :return: Read-only view of the player value held in each position of the board, which changes as the board does.
+        """
+        return self._obs_view[:self.max_moves]
+
+    def get_bitboard(self, player: int) -> int:
+        """
+        Gets the bitboard of a player's counters, for agents that search using bitwise operations.
+        Each column takes up (rows + 1) bits, starting from the first column, and the first bit of each column is its
+        bottom position. The top bit of each column is always empty.
+
+        :param player: Integer value for the player whose counters are returned.
+        :return: Integer bitboard of the player's counters.
+        """
+        return self._masks[player]
 
     def get_board_element(self, i: int) -> int:
-        return self._board_array[i]
+        bit = 1 << self._position_to_bit(i)
+        if self._masks[1] & bit:
+            return 1
+        if self._masks[2] & bit:
+            return 2
+        return 0
 
     def set_board_element(self, i: int, val: int):
-        self._board_array[i] = val
+        # Directly sets a position, bypassing the move history and any tracked line counts.
+        index = self._position_to_bit(i)
+        bit = 1 << index
+        for player in (1, 2):
+            if self._masks[player] & bit:
+                self._masks[player] &= ~bit
+                self._hash ^= self._zobrist[player][index]
+                self._mirror_hash ^= self._zobrist[player][self._mirror_bit(index)]
+        if val:
+            self._masks[val] |= bit
+            self._hash ^= self._zobrist[val][index]
+            self._mirror_hash ^= self._zobrist[val][self._mirror_bit(index)]
+        self._obs_items[i] = val
 
     def col_counters(self) -> np.ndarray:
-        return self._col_counters
+        # Read-only view, which changes as the board does.
+        return self._obs_view[self.max_moves:]
 
     def get_col_counter(self, i: int) -> int:
-        return self._col_counters[i]
+        return self._heights[i]
 
     def check_col_full(self, i: int) -> bool:
-        return self.get_col_counter(i) == self.rows
+        return self._heights[i] == self.rows
+
+    def legal_moves(self) -> np.ndarray:
+        """
+        Finds the columns that a counter can be dropped into.
+
+        :return: Boolean array indicating whether each column is not full.
+        """
+        return self.col_counters() < self.rows
 
     def update_col_counter(self, i: int, val: int):
-        self._col_counters[i] += val
+        self._heights[i] += val
+        self._obs_items[self.max_moves + i] = self._heights[i]
 
     def get_observation(self) -> np.array:
         """
         Method used to return the observation of the game state for RL agents to use when training/playing.
 
-        :return: Numpy array of the current board and column counters.
+        :return: Read-only view of the current board and column counters, which changes as the board does. Copy it to
+            keep the observation of a particular board state.
         """
-        return np.array(list(self.board_array()) + list(self.col_counters()))
+        return self._obs_view
 
     def update_board(self, column: int, player: int):
         """
@@ -93,151 +276,127 @@ class Board:
         :param column: Integer value for column in which the counter is being dropped.
         :param player: Integer value for player whose counter is being placed.
         """
-        # Construct the position of the new counter for the 1D board array using column counters.
-        position = int(((self.rows - self.get_col_counter(column) - 1) * self.cols) + column)
-
-        self.set_board_element(position, player)
-        self.update_col_counter(column, 1)
+        # Actions from a model are numpy integers, which would turn the bitboards into fixed-width integers.
+        column = int(column)
+        # Construct the bit of the new counter using the column's current height.
+        height = self._heights[column]
+        bit = (column * self._col_bits) + height
+        self._masks[player] |= 1 << bit
+        self._heights[column] = height + 1
+        self._obs_items[self._obs_cells[column][height]] = player
+        self._obs_items[self.__max_moves + column] = height + 1
+        self._moves.append((column, player))
+        self._hash ^= self._zobrist[player][bit] ^ self._zobrist_side
+        self._mirror_hash ^= self._zobrist[player][self._mirror_bit(bit)] ^ self._zobrist_side
+
+        if self.__track_lines:
+            self._adjust_line_counts(bit, player, 1)
 
         logging.info(f"Player {player} put a counter in column {column + 1}.")
 
-    def _check(self, position: int, player: int, running_total: int) -> int:
-        """
-        Checks if counter is present in specific board position and what player's it is.
-
-        :param position: Integer corresponding to position currently being inspected.
-        :param player: Integer value representing player whose counters are currently being checked.
-        :param running_total: Integer for number of player's counters currently found in a row.
-        :return: Updated value of runningTotal variable.
+    def play(self, column: int, player: int = None):
         """
-        pos_counter = self.get_board_element(position)
-        if pos_counter == player:
-            return running_total + 1
-        return 0
+        Makes a move on the board that can later be reversed with undo, to allow searching without copying the board.
 
-    def _checkHorizontals(self, player: int, line_len: int = None) -> int:
-        """
-        Checks all horizontal rows of the board to see how many times the specified number of counters in a row was met.
-
-        :param player: Integer value representing player whose counters are currently being checked.
-        :param line_len: Integer for the number of counters in a row being looked for.
-        :return: Integer for how many times the specified number of counters in a row were found.
+        :param column: Integer value for column in which the counter is being dropped.
+        :param player: Integer value for player whose counter is being placed. Defaults to the player whose turn it is.
         """
-        total_count = 0
-        for i in range(self.rows):
-            # counter represents a running total for number of counters in a row, for each row.
-            counter = 0
-            for j in range(self.cols):
-                # position is constructed from iterators.
-                position = (i * self.cols) + j
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-        return total_count
+        if player is None:
+            player = self.player_to_move
+        self.update_board(column, player)
 
-    def _check_verticals(self, player: int, line_len: int = None) -> int:
+    def undo(self) -> int:
         """
-        Checks all vertical columns of the board to see how many times the specified number of counters in a row was
-        met.
+        Removes the most recently placed counter from the board, reversing update_board.
 
-        :param player: Integer value representing player whose counters are currently being checked.
-        :param line_len: Integer for the number of counters in a row being looked for.
-        :return: Integer for how many times the specified number of counters in a row were found.
+        :return: Integer value for the column the counter was removed from.
         """
-        total_count = 0
-        for i in range(self.cols):
-            # counter represents a running total for number of counters in a
-            # row, for each column.
-            counter = 0
-            for j in range(self.rows):
-                # position is constructed from iterators.
-                position = (j * self.cols) + i
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-        return total_count
-
-    def _check_diagonals_RL(self, player: int, line_len: int = None) -> int:
+        column, player = self._moves.pop()
+        height = self._heights[column] - 1
+        self._heights[column] = height
+        self._obs_items[self._obs_cells[column][height]] = 0
+        self._obs_items[self.__max_moves + column] = height
+        bit = (column * self._col_bits) + height
+
+        if self.__track_lines:
+            self._adjust_line_counts(bit, player, -1)
+        self._masks[player] &= ~(1 << bit)
+        self._hash ^= self._zobrist[player][bit] ^ self._zobrist_side
+        self._mirror_hash ^= self._zobrist[player][self._mirror_bit(bit)] ^ self._zobrist_side
+
+        logging.info(f"Player {player}'s counter was removed from column {column + 1}.")
+        return column
+
+    @staticmethod
+    def _run_lengths(mask: int, bit: int, shift: int) -> tuple[int, int]:
         """
-        Checks all possible diagonals, going from right to left, to see how many times the specified number of counters
-        in a row was met.
+        Finds how many counters lie in an unbroken line either side of a position, in a single direction.
 
-        :param player: Integer value representing player whose counters are currently being checked.
-        :param line_len: Integer for the number of counters in a row being looked for.
-        :return: Integer for how many times the specified number of counters in a row were found.
+        :param mask: Bitboard of the counters being checked.
+        :param bit: Integer index of the bit at the position being checked from.
+        :param shift: Integer bit shift for the direction being checked.
+        :return: Tuple of the number of counters found ahead of, and behind, the position.
         """
-        total_count = 0
-
-        for i in range(self.cols - line_len, self.cols - 1):
-            # Iterating along the base (columns) of the board, where diagonal is large enough for number of counters in
-            # a row being looked for.
-            counter = 0
-            for j in range(i + 1):
-                position = (j * self.cols) + i - j
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-
-        for m in range(self.rows - line_len + 1):
-            # Iterating along the sides of the board, where diagonal is large enough for number of counters in a row
-            # being looked for.
-            counter = 0
-            for n in range(self.rows - m):
-                position = ((m + n + 1) * self.cols) - n - 1
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-
-        return total_count
-
-    def _check_diagonals_LR(self, player: int, line_len: int = None) -> int:
+        run_lengths = []
+        for step in (shift, -shift):
+            run_len = 0
+            position = bit + step
+            while position >= 0 and (mask >> position) & 1:
+                run_len += 1
+                position += step
+            run_lengths.append(run_len)
+        return run_lengths[0], run_lengths[1]
+
+    def _adjust_line_counts(self, bit: int, player: int, sign: int):
         """
-        Checks all possible diagonals, going from left to right, to see how many times the specified number of counters
-        in a row was met.
+        Updates the tracked line counts for a counter being placed at, or removed from, a position.
+        Placing a counter joins the lines either side of it into one, and removing it splits them again. Lines of the
+        other player pass through empty positions only, so they are unaffected.
 
-        :param player: Integer value representing player whose counters are currently being checked.
-        :param line_len: Integer for the number of counters in a row being looked for.
-        :return: Integer for how many times the specified number of counters in a row were found.
+        :param bit: Integer index of the bit at the position of the counter.
+        :param player: Integer value for the player whose counter it is.
+        :param sign: Integer value of 1 if the counter is being placed, or -1 if it is being removed.
         """
-        total_count = 0
-
-        for i in range(1, self.cols - line_len + 1):
-            # Iterating along the base (columns) of the board, where diagonal is large enough for number of counters in
-            # a row being looked for.
-            counter = 0
-            for j in range(self.cols - i):
-                position = (j * self.cols) + i + j
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-
-        for m in range(self.rows - line_len + 1):
-            # Iterating along the sides of the board, where diagonal is large enough for number of counters in a row
-            # being looked for.
-            counter = 0
-            for n in range(self.rows - m):
-                position = ((m + n) * self.cols) + n
-                counter = self._check(position, player, counter)
-                if counter == line_len:
-                    total_count += 1
-
-        return total_count
-
-    def _check_diagonals(self, player: int, line_len: int) -> int:
+        mask = self._masks[player] & ~(1 << bit)
+        counts = self._line_counts[player]
+        for shift in self._shifts:
+            ahead, behind = self._run_lengths(mask, bit, shift)
+            joined = ahead + behind + 1
+            for line_len in range(1, min(joined, self.__win_condition) + 1):
+                counts[line_len] += sign * (1 - (ahead >= line_len) - (behind >= line_len))
+
+    def _count_lines(self, mask: int, shift: int, line_len: int) -> int:
         """
-        Checks all possible diagonals in both directions, to see how many times the specified number of counters in a
-        row was met.
+        Counts the lines of at least the specified length in a single direction of a bitboard.
 
-        :param player: Integer value representing player whose counters are currently being checked.
+        :param mask: Bitboard of the counters being checked.
+        :param shift: Integer bit shift for the direction being checked.
         :param line_len: Integer for the number of counters in a row being looked for.
         :return: Integer for how many times the specified number of counters in a row were found.
         """
-        return self._check_diagonals_RL(player, line_len) + self._check_diagonals_LR(player, line_len)
+        # Counters that begin a line, i.e. do not have a counter of the same player behind them.
+        starts = mask & ~(mask << shift)
+        # Counters that have (line_len - 1) more counters in a row in front of them. Each step doubles the length of
+        # the lines being matched, so only log2(line_len) shifts are needed rather than (line_len - 1).
+        lines = mask
+        matched = 1
+        while matched < line_len:
+            step = min(matched, line_len - matched)
+            lines &= lines >> (step * shift)
+            matched += step
+        # Each line is counted once, no matter how far it extends past line_len.
+        return (lines & starts).bit_count()
 
     def check_for_lines(self, player: int, line_len: int = None) -> int:
         """
         Checks entire board to see how many times the specified number of counters in a row was met.
 
+        Every diagonal is checked. The scanners this replaced skipped the right-to-left diagonals starting in the top
+        row to the left of column (cols - line_len), so before the move to bitboards, lines shorter than 4 on a 6x7
+        board were undercounted. This was changed on purpose: counts of shorter lines, and so the heuristic of
+        LookAheadAgent and the sub-rewards of ConnectXEnv, have been larger since, and models trained on the old
+        sub-rewards were trained on a different reward scale. Counts of lines of 4 on a 6x7 board are unchanged.
+
         :param player: Integer value representing player whose counters are currently being checked.
         :param line_len: Integer for the number of counters in a row being looked for.
         :return: Integer for how many times the specified number of counters in a row were found.
@@ -246,12 +405,58 @@ class Board:
             # Default value for the number of counters in a row being looked for is the win condition.
             line_len = self.__win_condition
 
-        num_lines_found = self._checkHorizontals(player, line_len) + self._check_verticals(
-            player, line_len) + self._check_diagonals(player, line_len)
+        mask = self._masks[player]
+        num_lines_found = sum(self._count_lines(mask, shift, line_len) for shift in self._shifts)
 
         logging.info(f"{num_lines_found} lines of {line_len} counters in a row found.")
         return num_lines_found
 
+    def line_histogram(self, players: tuple[int, ...] = (1, 2)) -> dict[int, list[int]]:
+        """
+        Counts the lines of every length up to the win condition for each player, in a single pass over the board.
+        The count for each length matches what check_for_lines returns for that length.
+
+        :param players: Tuple of the player values whose counters are being checked.
+        :return: Dictionary mapping each player value to a list, where element i is the number of lines of i counters in
+            a row that were found. Element 0 is always 0.
+        """
+        if self.__track_lines:
+            return {player: list(self._line_counts[player]) for player in players}
+
+        histogram = {}
+        for player in players:
+            mask = self._masks[player]
+            counts = [0] * (self.__win_condition + 1)
+            for shift in self._shifts:
+                starts = mask & ~(mask << shift)
+                lines = mask
+                for line_len in range(1, self.__win_condition + 1):
+                    # Each step extends the lines being matched by one counter, so every length is found in turn.
+                    counts[line_len] += (lines & starts).bit_count()
+                    lines &= lines >> shift
+            histogram[player] = counts
+        return histogram
+
+    def last_move_wins(self) -> bool:
+        """
+        Checks whether the most recently placed counter completed a line of the win condition length.
+        Only the four lines passing through that counter are inspected, as no other line can have changed.
+
+        :return: Boolean indicating whether the last move won the game.
+        """
+        if not self._moves:
+            return False
+
+        column, player = self._moves[-1]
+        bit = (column * self._col_bits) + self._heights[column] - 1
+        mask = self._masks[player]
+        for shift in self._shifts:
+            # Count the placed counter, plus the unbroken line of counters in both directions along the line.
+            ahead, behind = self._run_lengths(mask, bit, shift)
+            if ahead + behind + 1 >= self.__win_condition:
+                return True
+        return False
+
     def print_board(self, latest_move: int or None):
         """
         Prints a view of the current game board to the console.
@@ -277,10 +482,11 @@ class Board:
 
         # Prints player 1 counters as yellow 'o's and player 2 counters as red 'x's.
         # Empty positions are marked with a dash.
+        board = self.board_array()
         for i in range(self.max_moves):
-            if self.get_board_element(i) == 1:
+            if board[i] == 1:
                 print(f"{Fore.YELLOW}o{Style.RESET_ALL}", end=' ')
-            elif self.get_board_element(i) == 2:
+            elif board[i] == 2:
                 print(f"{Fore.RED}x{Style.RESET_ALL}", end=' ')
             else:
                 print('-', end=' ')
@@ -291,6 +497,34 @@ class Board:
         """
         Resets all information in the class relevant to a game, so that the board can be reused.
         """
-        self._board_array = np.zeros(self.max_moves)
-        self._col_counters = np.zeros(self.cols)
+        self._masks = [0, 0, 0]
+        self._heights = [0] * self.cols
+        self._moves = []
+        self._hash = 0
+        self._mirror_hash = 0
+        self._line_counts = [[0] * (self.win_condition + 1) for _ in range(3)]
+        self._obs.fill(0)
         logging.info(f"The board has been reset.")
+
+    def load_grid(self, grid: np.ndarray):
+        """
+        Sets the board to the position in a grid of player values, such as one of a batch of boards.
+
+        The order of the moves that led to the position isn't known, so they are recorded row by row from the bottom of
+        the board. This keeps undo, the hash and the line counts consistent, but the last move is not necessarily the
+        last counter placed in the game.
+
+        :param grid: Array of shape (rows, cols) of the player value held in each position, with the top row first.
+        """
+        grid = np.asarray(grid)
+        if grid.shape != (self.rows, self.cols):
+            raise ValueError(f"grid must have shape ({self.rows}, {self.cols}).")
+
+        self.reset_board()
+        for row in range(self.rows - 1, -1, -1):
+            for column in range(self.cols):
+                player = int(grid[row, column])
+                if player:
+                    if self._heights[column] != self.rows - 1 - row:
+                        raise ValueError("grid must not have counters floating above empty positions.")
+                    self.update_board(column, player)
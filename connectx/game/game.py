@@ -2,9 +2,11 @@ import logging
 
 from connectx.game.board import Board
 from connectx.players.players import Player, UserPlayer
-from connectx.players.agents.agents import Agent, RandomAgent, MinimumAgent, LookAheadAgent
+from connectx.players.agents.agents import Agent, RandomAgent, MinimumAgent, LookAheadAgent, AlphaBetaAgent, \
+    SolverAgent, MCTSAgent, PPOAgent, A2CAgent
 
 from colorama import Fore, Style
+import numpy as np
 
 
 class Game:
@@ -20,7 +22,8 @@ class Game:
             board_cols: int = 7,
             win_condition: int = 4,
             player1: str or None = None,
-            player2: str or None = None
+            player2: str or None = None,
+            obs_dtype: np.dtype = np.int8
     ):
         """
         This class is used to play a game of Connect-X.
@@ -39,8 +42,10 @@ class Game:
         :param win_condition: Int value for the required number of counters in a row in order to win the game.
         :param player1: String that specifies who will be player 1, or what file should be loaded.
         :param player2: String that specifies who will be player 2, or what file should be loaded.
+        :param obs_dtype: Numpy data type of the board's observation.
         """
-        self.board: Board = Board(board_rows, board_cols, win_condition)
+        # Line counts are tracked so that the agents' heuristics don't need to scan the board.
+        self.board: Board = Board(board_rows, board_cols, win_condition, track_lines=True, obs_dtype=obs_dtype)
 
         if not isinstance(verbose, bool):
             raise TypeError("verbose must be a bool.")
@@ -89,6 +94,34 @@ class Game:
             raise ValueError(
                 f"Specified agent filepath \'{agent_file_path}\' does not exist or is not supported.")
 
+    @staticmethod
+    def _parse_time_budget(time_budget: str) -> float:
+        """
+        Converts the time budget given in an agent's name, such as the '50ms' of 'look@50ms', to seconds.
+
+        :param time_budget: String for the time budget, in either milliseconds (ms) or seconds (s).
+        :return: Float value for the time budget in seconds.
+        """
+        if time_budget[-2:] == 'ms':
+            return float(time_budget[:-2]) / 1000
+        elif time_budget[-1:] == 's':
+            return float(time_budget[:-1])
+        raise ValueError(f"Time budget '{time_budget}' must be given in milliseconds (ms) or seconds (s).")
+
+    @staticmethod
+    def _parse_workers(agent_name: str) -> tuple[str, int]:
+        """
+        Splits the number of worker processes off the end of an agent's name, such as the 8 of 'look6x8'.
+
+        :param agent_name: String that specifies the agent.
+        :return: Tuple of the agent's name without the number of workers, and the number of workers, which is 1 if
+            none were given.
+        """
+        name, _, workers = agent_name.rpartition('x')
+        if name and workers.isdigit():
+            return name, int(workers)
+        return agent_name, 1
+
     def _initialise_agent(self, agent_name: str, player_num: int) -> Agent:
         """
         Initialises an agent to play the game.
@@ -102,18 +135,50 @@ class Game:
             return self._use_agent_file(agent_name, player_num)
 
         agent_name = str.lower(agent_name)
+        if agent_name[:4] in ('look', 'mcts') or agent_name[:2] == 'ab':
+            # Search agents can search in parallel, over the number of worker processes given after an 'x'.
+            agent_name, workers = self._parse_workers(agent_name)
         if agent_name == 'rand':
             return RandomAgent(player_num, self.board, self.verbose)
         elif agent_name == 'min':
             return MinimumAgent(player_num, self.board, self.verbose)
+        elif agent_name[:5] == 'look@':
+            return LookAheadAgent(player_num, self.board, self.verbose,
+                                  time_budget=self._parse_time_budget(agent_name[5:]), workers=workers)
         elif agent_name[:4] == 'look':
             try:
                 steps = int(agent_name[4:])
                 if steps > 10:
                     raise ValueError(f"It is inadvisable to use more than 10 steps.")
-                return LookAheadAgent(player_num, self.board, self.verbose, steps)
+                return LookAheadAgent(player_num, self.board, self.verbose, steps, workers=workers)
             except IndexError():
-                return LookAheadAgent(player_num, self.board, self.verbose)
+                return LookAheadAgent(player_num, self.board, self.verbose, workers=workers)
+        elif agent_name[:3] == 'ab@':
+            return AlphaBetaAgent(player_num, self.board, self.verbose,
+                                  time_budget=self._parse_time_budget(agent_name[3:]), workers=workers)
+        elif agent_name[:2] == 'ab':
+            # Pruning keeps the search fast enough that no limit is placed on the steps.
+            if agent_name[2:]:
+                return AlphaBetaAgent(player_num, self.board, self.verbose, int(agent_name[2:]), workers=workers)
+            return AlphaBetaAgent(player_num, self.board, self.verbose, workers=workers)
+        elif agent_name[:11] == 'solve-weak@':
+            return SolverAgent(player_num, self.board, self.verbose, weak=True,
+                               time_budget=self._parse_time_budget(agent_name[11:]))
+        elif agent_name[:6] == 'solve@':
+            return SolverAgent(player_num, self.board, self.verbose,
+                               time_budget=self._parse_time_budget(agent_name[6:]))
+        elif agent_name == 'solve':
+            # Without a time budget, every move is solved, however long it takes, so the agent always plays perfectly.
+            return SolverAgent(player_num, self.board, self.verbose, time_budget=None)
+        elif agent_name == 'solve-weak':
+            return SolverAgent(player_num, self.board, self.verbose, weak=True, time_budget=None)
+        elif agent_name[:5] == 'mcts@':
+            return MCTSAgent(player_num, self.board, self.verbose,
+                             time_budget=self._parse_time_budget(agent_name[5:]), workers=workers)
+        elif agent_name[:4] == 'mcts':
+            if agent_name[4:]:
+                return MCTSAgent(player_num, self.board, self.verbose, int(agent_name[4:]), workers=workers)
+            return MCTSAgent(player_num, self.board, self.verbose, workers=workers)
         elif agent_name == 'ppo':
             return PPOAgent(player_num, self.board, self.verbose)
         elif agent_name == 'a2c':
@@ -149,8 +214,8 @@ class Game:
         if self.verbose:
             self.board.print_board(action)
 
-        # Check if win condition has been met at the end of each turn.
-        return self.WIN if self.board.check_for_lines(player.player_num) > 0 else self.NO_WIN
+        # Check if win condition has been met at the end of each turn, using only lines through the new counter.
+        return self.WIN if self.board.last_move_wins() else self.NO_WIN
 
     def all_turns(self) -> int or None:
         """
@@ -183,6 +248,14 @@ class Game:
 
         return None
 
+    def close(self):
+        """
+        Shuts down the worker processes of any agents playing the game.
+        """
+        for player in self.__players:
+            if isinstance(player, Agent):
+                player.close()
+
     def play(self):
         """
         Runes through the entirety of a game, allowing for a new game to played after one has finished.
@@ -206,3 +279,5 @@ class Game:
                 if not done:
                     print("\n")
                     self.board.reset_board()
+
+        self.close()
@@ -1,14 +1,121 @@
 import logging
 import time
 import random
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 
 from connectx.players.players import Player
 from connectx.game.board import Board
+from connectx.game import batch
+from connectx.players.agents.transposition import TranspositionTable
+from connectx.players.agents.solver import Solver
+from connectx.players.agents.book import OpeningBook
+from connectx.players.agents.mcts import MCTS, MCTSNode
 
-from treelib import Tree
-import copy
+import numpy as np
 
-# from stable_baselines3 import PPO, A2C
+
+class _SearchTimeout(Exception):
+    """
+    Raised inside a search when its time budget has run out, to abandon the search.
+    """
+
+
+# Agents used by the search worker processes, kept between tasks so that their transposition tables are reused.
+_WORKER_AGENTS: dict = {}
+
+
+def _worker_agent(agent_class: type, player_num: int, rows: int, cols: int, win_condition: int, track_lines: bool,
+                  moves: tuple[tuple[int, int], ...], kwargs: dict) -> 'Agent':
+    """
+    Gets an agent in a worker process, with its board set to the board state of the agent that the work is for.
+
+    :param agent_class: The class of the agent that the work is for.
+    :param player_num: The player value for the agent.
+    :param rows: Integer value for the number of rows the board has.
+    :param cols: Integer value for the number of columns the board has.
+    :param win_condition: Integer value for the number of counters in a row required to win.
+    :param track_lines: Bool that indicates whether the board tracks its line counts.
+    :param moves: Every (column, player) move made on the board so far.
+    :param kwargs: Keyword arguments to create the agent with.
+    :return: The agent in the worker process.
+    """
+    key = (agent_class, player_num, rows, cols, win_condition, track_lines, tuple(sorted(kwargs.items())))
+    agent = _WORKER_AGENTS.get(key)
+    if agent is None:
+        agent = agent_class(player_num, Board(rows, cols, win_condition, track_lines), False, **kwargs)
+        _WORKER_AGENTS[key] = agent
+
+    agent.board.reset_board()
+    for col, player in moves:
+        agent.board.play(col, player)
+    return agent
+
+
+def _look_ahead_worker(agent_spec: tuple, action: int, steps: int, time_left: float or None) -> np.ndarray or None:
+    """
+    Looks ahead from one of a LookAheadAgent's possible actions, in a worker process.
+
+    :param agent_spec: Tuple of the arguments to _worker_agent.
+    :param action: The agent's action to look ahead from.
+    :param steps: The number of steps to look ahead, including the action.
+    :param time_left: The number of seconds left before the look-ahead must be abandoned, or None to not limit it.
+    :return: Array of the reward at the nth step of the look-ahead for every sequence of the agent's actions starting
+        with the action, or None if time ran out.
+    """
+    agent = _worker_agent(*agent_spec)
+    leaf_rewards = np.empty(agent.board.cols ** (steps - 1))
+    agent._deadline = time.perf_counter() + time_left if time_left is not None else None
+    try:
+        agent._look_ahead_action(leaf_rewards, agent.board, action, 0, 0, 0, steps)
+    except _SearchTimeout:
+        return None
+    finally:
+        agent._deadline = None
+    return leaf_rewards
+
+
+def _search_worker(agent_spec: tuple, action: int, depth: int, time_left: float or None) -> float or None:
+    """
+    Searches one of an AlphaBetaAgent's possible actions, in a worker process.
+
+    :param agent_spec: Tuple of the arguments to _worker_agent.
+    :param action: The agent's action to search.
+    :param depth: The number of moves to search, including the action.
+    :param time_left: The number of seconds left before the search must be abandoned, or None to not limit it.
+    :return: The score of the action, or None if time ran out.
+    """
+    agent = _worker_agent(*agent_spec)
+    agent._deadline = time.perf_counter() + time_left if time_left is not None else None
+    try:
+        agent.board.play(action, agent.player_num)
+        return -agent._negamax(agent.board, depth - 1, -agent._infinity, agent._infinity, agent.opp_player_num)
+    except _SearchTimeout:
+        return None
+    finally:
+        agent._deadline = None
+
+
+def _mcts_worker(mcts: MCTS, masks: list[int], heights: list[int], num_moves: int, player_num: int,
+                 playouts: int or None, time_left: float or None, seed: int) -> list[tuple[int, int, float]]:
+    """
+    Grows a Monte Carlo search tree from the agent's board state, in a worker process.
+
+    :param mcts: The search to run.
+    :param masks: List of each player's bitboard, indexed by player value.
+    :param heights: List of the number of counters in each column.
+    :param num_moves: Integer number of counters on the board.
+    :param player_num: The player value for the agent.
+    :param playouts: Integer number of playouts to run, or None to run until time runs out.
+    :param time_left: The number of seconds to search for, or None to run the given number of playouts.
+    :param seed: Seed for the worker's random playouts, so that each worker's tree is different.
+    :return: List of the move, number of visits and number of wins of each child of the root.
+    """
+    random.seed(seed)
+    root = MCTSNode(None, 1 if player_num == 2 else 2)
+    deadline = time.perf_counter() + time_left if time_left is not None else None
+    mcts.search(root, masks, heights, num_moves, playouts, deadline)
+    return [(child.move, child.visits, child.wins) for child in root.children]
 
 
 class Agent(Player):
@@ -20,12 +127,56 @@ class Agent(Player):
         """
         super().__init__(player_num, board)
         self.verbose = verbose
+        # Pool of worker processes, created the first time an agent searches in parallel.
+        self._executor: ProcessPoolExecutor or None = None
+        # Board that each of a batch of boards is loaded into, created the first time one is needed.
+        self._batch_board: Board or None = None
 
     def perform_turn(self):
         if self.verbose:
             print("Agent is choosing a move...\n")
             time.sleep(random.uniform(0.8, 1.2))
 
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(workers)
+        return self._executor
+
+    def close(self):
+        """
+        Shuts down the agent's worker processes, if it has any.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Chooses the agent's action on each of a batch of boards, such as those of a VecConnectXEnv.
+
+        This takes a turn on each board in turn, by loading it into a board of its own, for agents that have no faster
+        way of choosing actions for many boards at once.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        if self._batch_board is None:
+            self._batch_board = Board(self.board.rows, self.board.cols, self.board.win_condition,
+                                      self.board.track_lines)
+
+        # The agent's turn is taken on its own board, which is swapped for each of the boards in the batch.
+        board = self.board
+        self.board = self._batch_board
+        try:
+            actions = np.empty(len(boards), dtype=np.int64)
+            for i, grid in enumerate(boards):
+                self.board.load_grid(grid)
+                actions[i] = self.perform_turn()
+        finally:
+            self.board = board
+        return actions
+
 
 class RandomAgent(Agent):
     def perform_turn(self) -> int:
@@ -33,8 +184,20 @@ class RandomAgent(Agent):
         Agent selects a random valid (non-full) column to drop a counter into.
         """
         super().perform_turn()
-        return random.choice(
-            [i for i in range(self.board.cols) if not self.board.check_col_full(i)])
+        return int(random.choice(np.flatnonzero(self.board.legal_moves())))
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Agent selects a random valid (non-full) column on each of a batch of boards.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        # A column is valid if its top position is empty, and the valid column with the highest random score is a
+        # uniformly random valid column.
+        valid = boards[:, 0, :] == 0
+        return np.where(valid, np.random.random(valid.shape), -1).argmax(axis=1)
 
 
 class MinimumAgent(Agent):
@@ -43,12 +206,27 @@ class MinimumAgent(Agent):
         Agent performs turn by selecting non-full column with minimum value to drop a counter into.
         """
         super().perform_turn()
-        return min([i for i in range(self.board.cols)
-                    if not self.board.check_col_full(i)])
+        # The first column that isn't full.
+        return int(self.board.legal_moves().argmax())
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Agent selects the non-full column with minimum value on each of a batch of boards.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        # The first column whose top position is empty.
+        return (boards[:, 0, :] == 0).argmax(axis=1)
 
 
 class LookAheadAgent(Agent):
-    def __init__(self, player_num: int, board: Board, verbose: bool, steps: int = 4):
+    # Most boards whose rewards are found at once when looking ahead on a batch of boards, to limit the memory used.
+    BATCH_SIZE = 2 ** 16
+
+    def __init__(self, player_num: int, board: Board, verbose: bool, steps: int = 4, tt_size_mb: float or None = None,
+                 time_budget: float or None = None, workers: int = 1):
         """
         Agent that uses monte-carlo look-ahead strategy to choose the best action.
 
@@ -57,10 +235,50 @@ class LookAheadAgent(Agent):
         :param board: A reference to the current board state of the game.
         :param player_num: The player value for the agent.
         :param steps: The number of steps to look ahead.
+        :param tt_size_mb: The memory, in megabytes, of the transposition table used to remember positions that have
+            already been searched, or None to not use one. The table is kept between turns, and games, so the opponent's
+            reply to a position is only chosen once, with any ties broken the same way from then on. It is off by
+            default, so that the agent stays a varied, fixed-strength opponent for benchmarks and training.
+        :param time_budget: The number of seconds the agent may spend choosing each move, or None to always look the
+            given number of steps ahead. With a time budget, the agent looks 1, 2, 3... steps ahead until time runs out,
+            and uses the deepest look-ahead that finished.
+        :param workers: The number of processes to look ahead with. With more than 1, the agent's possible actions are
+            split between the processes, which each keep their own transposition table.
         """
         super().__init__(player_num, board, verbose)
         self.opp_player_num = 1 if player_num == 2 else 2
         self.steps = steps
+        self._tt: TranspositionTable or None = TranspositionTable(tt_size_mb) if tt_size_mb is not None else None
+
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be larger than 0.")
+        self.time_budget: float or None = time_budget
+        # Time at which the current search must be abandoned, if it has a time budget.
+        self._deadline: float or None = None
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("workers must be an integer of at least 1.")
+        self.workers: int = workers
+        # Keyword arguments that create an agent in a worker process which searches in the same way as this one.
+        self._worker_kwargs: dict = {'steps': steps, 'tt_size_mb': tt_size_mb}
+
+    def _worker_spec(self) -> tuple:
+        """
+        :return: Tuple of the arguments that get an agent, with the current board state, in a worker process.
+        """
+        return (type(self), self.player_num, self.board.rows, self.board.cols, self.board.win_condition,
+                self.board.track_lines, self.board.moves, self._worker_kwargs)
+
+    def _time_left(self) -> float or None:
+        """
+        :return: The number of seconds left before the current search must be abandoned, or None if it has no limit.
+        """
+        if self._deadline is None:
+            return None
+        time_left = self._deadline - time.perf_counter()
+        if time_left <= 0:
+            raise _SearchTimeout()
+        return time_left
 
     def _calculate_rewards(self, board: Board, player: int = None) -> float:
         """
@@ -74,31 +292,30 @@ class LookAheadAgent(Agent):
             # Default to agent player value.
             player = self.player_num
 
+        lines = board.line_histogram((player,))[player]
         reward = 0
         for i in range(2, board.win_condition):
             # Weighting applied to reward depending on size of connected counters.
-            reward += board.check_for_lines(player, i) * (i ** 3)
-        reward += board.check_for_lines(player, board.win_condition) * (board.win_condition ** 10)
+            reward += lines[i] * (i ** 3)
+        reward += lines[board.win_condition] * (board.win_condition ** 10)
         return reward
 
-    def _try_action(self, action: int, player: int, board: Board) -> tuple[float, Board]:
+    def _try_action(self, action: int, player: int, board: Board) -> tuple[float, bool]:
         """
         Allows a player's potential action to be done and reward found.
+        The action is left on the board, so the caller must undo it if it was played.
 
         :param action: Action being taken/tested.
         :param player: Player value for player taking action.
         :param board: Current state of the game's board.
-        :return: Integer value for the heuristic reward of action.
+        :return: Tuple of the heuristic reward of action, and whether the action was played on the board.
         """
-        board_copy = copy.deepcopy(board)
-
-        if board_copy.check_col_full(action):
+        if board.check_col_full(action):
             # Return heavily negative reward if full column chosen.
-            return -(10 ** 100), board_copy
+            return -(10 ** 100), False
 
-        board_copy.update_board(action, player)
-        # Track all possible action, reward pair in dictionary.
-        return self._calculate_rewards(board_copy, player), board_copy
+        board.play(action, player)
+        return self._calculate_rewards(board, player), True
 
     def _opposition_optimal_action(self, board: Board) -> tuple[int, float]:
         """
@@ -107,160 +324,843 @@ class LookAheadAgent(Agent):
         :param board: Current state of the game's board.
         :return: Tuple of the opponent's best action and the reward they would get for it.
         """
-        actions = {}
+        if self._tt is not None:
+            # The same position is often reached through different orders of moves, or as a mirror image, so reuse the
+            # stored reply.
+            key, mirrored = board.canonical_key()
+            entry = self._tt.lookup(key)
+            if entry is not None:
+                return board.cols - 1 - entry[3] if mirrored else entry[3], entry[0]
+
+        actions = np.empty(board.cols)
         for i in range(board.cols):
-            reward, board_copy = self._try_action(i, self.opp_player_num, board)
-            actions[str(i)] = reward
+            reward, played = self._try_action(i, self.opp_player_num, board)
+            if played:
+                board.undo()
+            actions[i] = reward
 
         optimal_action, max_reward = self._choose_optimal_action(actions)
+        if self._tt is not None:
+            self._tt.store(key, 0, max_reward, TranspositionTable.EXACT,
+                           board.cols - 1 - optimal_action if mirrored else optimal_action)
         return optimal_action, max_reward
 
-    def _look_ahead(self, tree: Tree, board: Board, parent: str, parent_reward: float, step: int):
+    def _check_deadline(self):
         """
-        Recursive function to create the look-ahead tree.
+        Abandons the current search if its time budget has run out.
+        """
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+    def _look_ahead(self, leaf_rewards: np.ndarray, board: Board, parent: int, parent_reward: float, step: int,
+                    steps: int):
+        """
+        Recursive function to look ahead from the prior board state.
         looks 1 agent turn and 1 opposition turn ahead from the prior board state.
 
-        :param tree: Tree structure storing information the agent's current turn's look-ahead.
-        :param board: The state of the board prior to this look-ahead step.
-        :param parent: The parent node of the current look-ahead set, being the previous turn.
+        :param leaf_rewards: Array storing the reward at the end of every sequence of the agent's actions.
+        :param board: The state of the board prior to this look-ahead step, which is restored before returning.
+        :param parent: The index of the previous turn, formed from the agent's actions leading to it as a number in base
+            board.cols.
         :param parent_reward: The reward of the parent/previous turn.
         :param step: The current step of the look-ahead.
+        :param steps: The number of steps to look ahead.
         """
-        if step < self.steps:
+        self._check_deadline()
+        if step < steps:
             # Uncoil recursion if number of steps of look-ahead reached.
             for i in range(board.cols):
-                step_reward = parent_reward
-                # Iterate over all possible actions and adding the new action to the node id.
-                nid = parent + str(i)
+                # Iterate over all possible actions and adding the new action as the last digit of the index.
+                self._look_ahead_action(leaf_rewards, board, i, (parent * board.cols) + i, parent_reward, step, steps)
+        else:
+            # The reward of the last step is the reward of the whole sequence of actions.
+            leaf_rewards[parent] = parent_reward
 
-                reward, board_copy = self._try_action(i, self.player_num, board)
-                step_reward += reward * (1 - (step / (10 + self.steps)))
+    def _look_ahead_action(self, leaf_rewards: np.ndarray, board: Board, action: int, index: int,
+                           parent_reward: float, step: int, steps: int):
+        """
+        Takes one of the agent's actions, and the opponent's reply, then looks ahead from the resulting board state.
 
-                if step < self.steps - 1:
-                    # Whilst number of steps not reached, predict opposition's optimal turn, and add reward
-                    # negatively to this node's reward.
-                    opp_action, opp_reward = self._opposition_optimal_action(board_copy)
-                    board_copy.update_board(opp_action, self.opp_player_num)
-                    # Multiplying opponent reward to make agent more defensive.
-                    step_reward -= opp_reward * 1.5
+        :param leaf_rewards: Array storing the reward at the end of every sequence of the agent's actions.
+        :param board: The state of the board prior to the action, which is restored before returning.
+        :param action: The agent's action.
+        :param index: The index of this turn, formed from the agent's actions leading to it as a number in base
+            board.cols.
+        :param parent_reward: The reward of the parent/previous turn.
+        :param step: The current step of the look-ahead.
+        :param steps: The number of steps to look ahead.
+        """
+        step_reward = parent_reward
+        reward, played = self._try_action(action, self.player_num, board)
+        step_reward += reward * (1 - (step / (10 + steps)))
+
+        opp_played = False
+        if step < steps - 1:
+            # Whilst number of steps not reached, predict opposition's optimal turn, and add reward
+            # negatively to this node's reward.
+            opp_action, opp_reward = self._opposition_optimal_action(board)
+            if not board.check_col_full(opp_action):
+                board.play(opp_action, self.opp_player_num)
+                opp_played = True
+            # Multiplying opponent reward to make agent more defensive.
+            step_reward -= opp_reward * 1.5
 
-                # Add updated copy of previous board with action, and corresponding reward, as a new node from
-                # previous action node.
-                tree.create_node(step_reward, nid, parent=parent)
+        # From this action, look ahead another step.
+        self._look_ahead(leaf_rewards, board, index, step_reward, step + 1, steps)
 
-                # From this node, look ahead another step.
-                self._look_ahead(tree, board_copy, nid, step_reward, step + 1)
+        # Unwind the moves made for this node, so the board is back to its prior state for the next action.
+        if opp_played:
+            board.undo()
+        if played:
+            board.undo()
 
-    def _look_ahead_N_steps(self) -> dict[str: int]:
+    def _look_ahead_N_steps(self, steps: int = None) -> np.ndarray:
         """
-        Initialises and constructs the look-ahead tree from the agent's current turn's board state.
+        Looks ahead from the agent's current turn's board state.
 
-        :return: Dictionary containing the set of actions, reward from the leaves of the tree, which correlates to the
-        nth step of the look-ahead.
+        :param steps: The number of steps to look ahead, defaulting to the agent's steps.
+        :return: Array of the reward at the nth step of the look-ahead for every sequence of the agent's actions, with
+            one row for each of the agent's possible actions this turn.
         """
-        # Create tree and root node.
-        tree = Tree()
-        tree.create_node(0, '')
+        if steps is None:
+            steps = self.steps
+        if self.workers > 1:
+            return self._parallel_look_ahead(steps)
+        # Every sequence of actions is given a position up front, rather than building a tree of them.
+        leaf_rewards = np.empty(self.board.cols ** steps)
 
-        logging.info(f"LookAheadAgent creating look-ahead tree...")
-        self._look_ahead(tree, self.board, '', 0, 0)
-        logging.info(f"LookAheadAgent finished creating look-ahead tree.")
+        logging.info("LookAheadAgent looking ahead...")
+        self._look_ahead(leaf_rewards, self.board, 0, 0, 0, steps)
+        logging.info("LookAheadAgent finished looking ahead.")
 
-        return {leaf.identifier: leaf.tag for leaf in tree.leaves()}
+        return leaf_rewards.reshape(self.board.cols, -1)
+
+    def _parallel_look_ahead(self, steps: int) -> np.ndarray:
+        """
+        Looks ahead from the agent's current turn's board state, with each of the agent's possible actions looked ahead
+        from in a worker process.
+
+        :param steps: The number of steps to look ahead.
+        :return: Array of rewards, as returned by _look_ahead_N_steps.
+        """
+        logging.info(f"LookAheadAgent looking ahead with {self.workers} workers...")
+        executor = self._get_executor(self.workers)
+        spec = self._worker_spec()
+        time_left = self._time_left()
+        futures = [executor.submit(_look_ahead_worker, spec, i, steps, time_left) for i in range(self.board.cols)]
+
+        all_actions = np.empty((self.board.cols, self.board.cols ** (steps - 1)))
+        for i, future in enumerate(futures):
+            leaf_rewards = future.result()
+            if leaf_rewards is None:
+                raise _SearchTimeout()
+            all_actions[i] = leaf_rewards
+        logging.info("LookAheadAgent finished looking ahead.")
+        return all_actions
+
+    def _iterative_look_ahead(self) -> np.ndarray:
+        """
+        Looks ahead an increasing number of steps until the agent's time budget runs out.
+        The first step is always completed, so that there is an action to take.
+
+        :return: Array of rewards, as returned by _look_ahead_N_steps, from the deepest look-ahead that was completed.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        num_moves = self.board.num_moves
+        all_actions = self._look_ahead_N_steps(1)
+
+        steps = 2
+        self._deadline = deadline
+        try:
+            # Each step past the first is an opposition turn and an agent turn, which must fit on the board.
+            while num_moves + (2 * steps) - 1 <= self.board.max_moves:
+                all_actions = self._look_ahead_N_steps(steps)
+                steps += 1
+        except _SearchTimeout:
+            # Unwind any moves left on the board by the abandoned look-ahead.
+            while self.board.num_moves > num_moves:
+                self.board.undo()
+        finally:
+            self._deadline = None
+
+        logging.info(f"LookAheadAgent completed a look-ahead of {steps - 1} steps within its time budget.")
+        return all_actions
 
     @staticmethod
-    def _choose_optimal_action(all_actions: dict[str: int]) -> tuple[int, float]:
+    def _choose_optimal_action(all_actions: np.ndarray) -> tuple[int, float]:
         """
         Filter all possible actions down to equally optimal actions.
 
-        :param all_actions: Dictionary containing action, reward pairs for all the agent's possible actions in this
-            turn.
-        :return: List of strings representing optimal actions, all of which give an equal reward.
+        :param all_actions: Array of rewards, with one row for each of the possible actions in this turn, containing the
+            rewards of every sequence of actions starting with it.
+        :return: Tuple of an optimal action, chosen at random from the sequences that give an equal reward, and its
+            reward.
+        """
+        rewards = all_actions.reshape(all_actions.shape[0], -1)
+        max_reward = rewards.max()
+        optimal_sequence = random.choice(np.flatnonzero(rewards == max_reward))
+        return int(optimal_sequence // rewards.shape[1]), float(max_reward)
+
+    def _batch_rewards(self, boards: np.ndarray, player: int) -> np.ndarray:
+        """
+        Calculate the heuristic rewards for a batch of board states, as _calculate_rewards does for one.
+
+        :param boards: Array of the board states being evaluated, as given to act_batch.
+        :param player: The player value for whom the rewards are being calculated.
+        :return: Array of the heuristic reward of each board state.
+        """
+        win_condition = self.board.win_condition
+        lines = batch.line_histogram(boards, player, win_condition).astype(np.float64)
+        weights = np.array([i ** 3 for i in range(2, win_condition)], dtype=np.float64)
+        return (lines[:, 2:win_condition] @ weights) + (lines[:, win_condition] * (win_condition ** 10))
+
+    def _batch_try_actions(self, boards: np.ndarray, heights: np.ndarray, actions: np.ndarray,
+                           player: int) -> np.ndarray:
+        """
+        Takes an action on each of a batch of boards, as _try_action does for one, leaving them on the boards.
+
+        :param boards: Array of board states, as given to act_batch, which is changed in place.
+        :param heights: Array of the number of counters in each column of each board, which is changed in place.
+        :param actions: Array of the action taken on each board.
+        :param player: Player value for player taking the actions.
+        :return: Array of the heuristic reward of each action, which is heavily negative for full columns.
         """
-        max_reward = max(all_actions.values())
-        optimal_actions = [action for action, reward in all_actions.items() if reward == max_reward]
-        return int(random.choice(optimal_actions)[0]), max_reward
+        played = np.flatnonzero(heights[np.arange(len(boards)), actions] < self.board.rows)
+        batch.drop(boards, heights, played, actions[played], player)
+        rewards = np.full(len(boards), -(10.0 ** 100))
+        rewards[played] = self._batch_rewards(boards[played], player)
+        return rewards
+
+    def _batch_opposition_optimal_actions(self, boards: np.ndarray,
+                                          heights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the opponent's best turn on each of a batch of boards, as _opposition_optimal_action does for one.
+
+        :param boards: Array of board states, as given to act_batch.
+        :param heights: Array of the number of counters in each column of each board.
+        :return: Tuple of arrays of the opponent's best action on each board and the reward they would get for it.
+        """
+        cols = self.board.cols
+        children = np.repeat(boards, cols, axis=0)
+        child_heights = np.repeat(heights, cols, axis=0)
+        rewards = self._batch_try_actions(children, child_heights, np.tile(np.arange(cols), len(boards)),
+                                          self.opp_player_num).reshape(len(boards), cols)
+
+        max_rewards = rewards.max(axis=1)
+        # Choose at random between equally optimal actions.
+        optimal = rewards == max_rewards[:, None]
+        return np.where(optimal, np.random.random(optimal.shape), -1).argmax(axis=1), max_rewards
+
+    def _batch_look_ahead(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Looks ahead from each of a batch of board states at once, as _look_ahead_N_steps does for one.
+
+        Each step expands every board into a board for each of the agent's actions, and plays the opponent's optimal
+        reply on each of them, so the whole tree of one step is evaluated with array operations.
+
+        :param boards: Array of board states, as given to act_batch.
+        :return: Array of shape (boards, cols ** steps) of the reward at the nth step of the look-ahead for every
+            sequence of the agent's actions, on each board.
+        """
+        cols = self.board.cols
+        steps = self.steps
+        boards = boards.astype(np.int8)
+        heights = (boards != 0).sum(axis=1).astype(np.int8)
+        rewards = np.zeros(len(boards))
+        for step in range(steps):
+            # Every action is added as the last digit of the index of each sequence of actions.
+            boards = np.repeat(boards, cols, axis=0)
+            heights = np.repeat(heights, cols, axis=0)
+            rewards = np.repeat(rewards, cols)
+            actions = np.tile(np.arange(cols), len(boards) // cols)
+            rewards += self._batch_try_actions(boards, heights, actions, self.player_num) * (1 - (step / (10 + steps)))
+
+            if step < steps - 1:
+                # Predict the opposition's optimal turns, and add their rewards negatively.
+                opp_actions, opp_rewards = self._batch_opposition_optimal_actions(boards, heights)
+                played = np.flatnonzero(heights[np.arange(len(boards)), opp_actions] < self.board.rows)
+                batch.drop(boards, heights, played, opp_actions[played], self.opp_player_num)
+                # Multiplying opponent reward to make agent more defensive.
+                rewards -= opp_rewards * 1.5
+        return rewards.reshape(-1, cols ** steps)
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Looks ahead from each of a batch of boards at once, choosing the best column on each.
+
+        Look-aheads with a time budget, or too many steps to look ahead on even one board at once, look ahead from each
+        board in turn.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        leaves = self.board.cols ** self.steps
+        if self.time_budget is not None or leaves > self.BATCH_SIZE:
+            return super().act_batch(boards)
+
+        actions = np.empty(len(boards), dtype=np.int64)
+        # The boards are looked ahead from in chunks, as memory grows with the number of sequences of actions.
+        chunk_size = self.BATCH_SIZE // leaves
+        for start in range(0, len(boards), chunk_size):
+            rewards = self._batch_look_ahead(boards[start:start + chunk_size])
+            # Choose at random between the sequences of actions with an equally optimal reward, as
+            # _choose_optimal_action does.
+            optimal = rewards == rewards.max(axis=1)[:, None]
+            sequences = np.where(optimal, np.random.random(optimal.shape), -1).argmax(axis=1)
+            actions[start:start + chunk_size] = sequences // (leaves // self.board.cols)
+        return actions
 
     def perform_turn(self) -> int:
         """
-        Filter all actions retrieved from the look-ahead tree to get the best column.
+        Filter all actions retrieved from the look-ahead to get the best column.
 
         :return: Integer value representing the action that the agent will take.
         """
         super().perform_turn()
-        all_actions = self._look_ahead_N_steps()
+        if self.time_budget is None:
+            all_actions = self._look_ahead_N_steps()
+        else:
+            all_actions = self._iterative_look_ahead()
         action, max_reward = self._choose_optimal_action(all_actions)
         return action
 
 
-# class RLAgent(Agent):
-#     def __init__(self, player_num: int, board: Board, verbose: bool, filepath: str):
-#         """
-#         Base class for reinforcement learning agents.
-#
-#         :param board: Reference to the game board.
-#         :param filepath: Filepath for the agent's model.
-#         """
-#         super().__init__(player_num, board, verbose)
-#         self.model = self._load_model(filepath)
-#
-#     @staticmethod
-#     def _load_model(filePath):
-#         """
-#         Load the agent's model from a file.
-#
-#         :param filePath: Filepath that the agent's model is stored in.
-#         """
-#         pass
-#
-#     def _predict_action_proba(self) -> np.float:
-#         """
-#         Retrieve the probability of the model taking each possible action in action space depending on current board.
-#         See: https://stackoverflow.com/questions/66428307/how-to-get-action-propability-in-stable-baselines-3
-#
-#         :return: Array of floats indicating probability of each action in the action space.
-#         """
-#         obs = self.model.policy.obs_to_tensor(self.board.get_observation())[0]
-#         dis = self.model.policy.get_distribution(obs)
-#         probs = dis.distribution.probs
-#         probs_np = probs.detach().numpy()
-#         return probs_np[0]
-#
-#     def perform_turn(self) -> int:
-#         """
-#         Agent uses action space probabilities to decide on its action.
-#         """
-#         super().perform_turn()
-#         action_proba = self._predict_action_proba()
-#         action = np.argmax(action_proba)
-#         while self.board.get_col_counter(int(action)) == self.board.rows:
-#             # Selects action with the highest probability that doesn't correspond to a full column.
-#             action_proba[action] = 0
-#             action = np.argmax(action_proba)
-#         return int(action)
-#
-#
-# class PPOAgent(RLAgent):
-#     def __init__(self, player_num: int, board: Board, verbose: bool,
-#                  filepath: str = 'connectx/models/PPO_6-7-4_v0.1/PPO_6-7-4_v0.1_50000'):
-#         """
-#         Agent that uses a Proximal Policy Optimisation policy gradient method.
-#         """
-#         super().__init__(player_num, board, verbose, filepath)
-#
-#     @staticmethod
-#     def _loadModel(filepath) -> PPO:
-#         return PPO.load(filepath)
-#
-#
-# class A2CAgent(RLAgent):
-#     def __init__(self, player_num: int, board: Board, verbose: bool,
-#                  filepath: str = 'connectx/models/A2C_6-7-4_v0.1/A2C_6-7-4_v0.1_50000'):
-#         """
-#         Agent that uses an Advantage Actor Critic policy gradient method.
-#         """
-#         super().__init__(player_num, board, verbose, filepath)
-#
-#     @staticmethod
-#     def _loadModel(filepath) -> A2C:
-#         return A2C.load(filepath)
+class AlphaBetaAgent(LookAheadAgent):
+    # Score for a won position, per move left on the board, large enough to outweigh any heuristic reward.
+    # Scaling by the moves left means quicker wins score higher, without the score depending on the search ply.
+    WIN_SCORE = 10.0 ** 20
+
+    def __init__(self, player_num: int, board: Board, verbose: bool, steps: int = 4, tt_size_mb: float or None = 16,
+                 time_budget: float or None = None, use_book: bool = True, workers: int = 1):
+        """
+        Agent that uses a negamax search with alpha-beta pruning to choose the best action.
+
+        The steps have the same meaning as for the LookAheadAgent, being the number of the agent's own turns looked
+        ahead, with the opponent's replies in between. Unlike the LookAheadAgent, the opponent is assumed to play the
+        move that is best for them over the rest of the search, rather than greedily.
+
+        :param board: A reference to the current board state of the game.
+        :param player_num: The player value for the agent.
+        :param steps: The number of steps to look ahead.
+        :param tt_size_mb: The memory, in megabytes, of the transposition table used to remember positions that have
+            already been searched, or None to not use one. The table is kept between turns.
+        :param time_budget: The number of seconds the agent may spend choosing each move, or None to always search the
+            given number of steps ahead. With a time budget, the agent searches 1, 2, 3... moves ahead until time runs
+            out, and uses the deepest search that finished.
+        :param use_book: Bool that indicates whether the agent plays the moves in the opening book for the board size,
+            when one has been built and the board state is in it.
+        :param workers: The number of processes to search with. With more than 1, the agent's possible actions are
+            split between the processes, and each is searched with a full window, as the scores of the other actions
+            aren't known.
+        """
+        super().__init__(player_num, board, verbose, steps, tt_size_mb, time_budget, workers)
+        # Columns nearest the centre are searched first, as they tend to be strongest, giving more cut-offs.
+        centre = (board.cols - 1) / 2
+        self._move_order: list[int] = sorted(range(board.cols), key=lambda col: abs(col - centre))
+        # A score beyond any that the search can return.
+        self._infinity: float = self.WIN_SCORE * (board.max_moves + 2)
+        # Only the agent itself looks in the opening book, so the worker processes needn't load it.
+        self._worker_kwargs['use_book'] = False
+        self._book: OpeningBook or None = OpeningBook.load(board.rows, board.cols, board.win_condition) \
+            if use_book else None
+
+    def _evaluate(self, board: Board, player: int) -> float:
+        """
+        Evaluates a board state at the search horizon from the point of view of one player.
+
+        :param board: The board state being evaluated.
+        :param player: The player value for whom the board is being evaluated.
+        :return: Heuristic reward of the player, less the heuristic reward of their opponent.
+        """
+        return self._calculate_rewards(board, player) - self._calculate_rewards(board, 1 if player == 2 else 2)
+
+    def _negamax(self, board: Board, depth: int, alpha: float, beta: float, player: int) -> float:
+        """
+        Recursive negamax search with alpha-beta pruning.
+
+        :param board: The state of the board being searched, which is restored before returning.
+        :param depth: The number of moves left to search.
+        :param alpha: The lowest score the player to move is already guaranteed.
+        :param beta: The highest score the opponent will allow the player to move.
+        :param player: The player value for the player to move.
+        :return: The score of the board state from the point of view of the player to move.
+        """
+        self._check_deadline()
+        if board.last_move_wins():
+            # The previous move won for the opponent.
+            return -self.WIN_SCORE * (board.max_moves - board.num_moves + 1)
+        if board.num_moves == board.max_moves:
+            return 0
+        if depth == 0:
+            return self._evaluate(board, player)
+
+        move_order = self._move_order
+        alpha_orig = alpha
+        if self._tt is not None:
+            # Mirror images share an entry, with their best move stored the way round of the canonical position.
+            key, mirrored = board.canonical_key()
+            entry = self._tt.lookup(key)
+            if entry is not None:
+                value, entry_depth, flag, tt_move = entry
+                if mirrored and tt_move >= 0:
+                    tt_move = board.cols - 1 - tt_move
+                if entry_depth >= depth:
+                    if flag == TranspositionTable.EXACT:
+                        return value
+                    if flag == TranspositionTable.LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+                if tt_move >= 0:
+                    # Search the best move found previously first, as it is likely to still be best.
+                    move_order = [tt_move] + [col for col in self._move_order if col != tt_move]
+
+        opp_player = 1 if player == 2 else 2
+        best = -self._infinity
+        best_move = -1
+        for col in move_order:
+            if board.check_col_full(col):
+                continue
+            board.play(col, player)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, opp_player)
+            board.undo()
+
+            if score > best:
+                best = score
+                best_move = col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                # The opponent would never allow this position, so the remaining moves needn't be searched.
+                break
+
+        if self._tt is not None:
+            if best <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif best >= beta:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            if mirrored and best_move >= 0:
+                best_move = board.cols - 1 - best_move
+            self._tt.store(key, depth, best, flag, best_move)
+        return best
+
+    def _search(self, depth: int, first_action: int = None) -> tuple[int, float]:
+        """
+        Searches every action from the agent's current turn's board state.
+
+        :param depth: The number of moves to search, including the agent's action.
+        :param first_action: An action to search before the others, such as the best action of a shallower search.
+        :return: Tuple of the best action and its score.
+        """
+        move_order = self._move_order
+        if first_action is not None:
+            move_order = [first_action] + [col for col in self._move_order if col != first_action]
+        if self.workers > 1:
+            return self._parallel_search(depth, move_order)
+
+        alpha = -self._infinity
+        best_action = None
+        for col in move_order:
+            if self.board.check_col_full(col):
+                continue
+            self.board.play(col, self.player_num)
+            score = -self._negamax(self.board, depth - 1, -self._infinity, -alpha, self.opp_player_num)
+            self.board.undo()
+
+            if score > alpha:
+                alpha = score
+                best_action = col
+        return best_action, alpha
+
+    def _parallel_search(self, depth: int, move_order: list[int]) -> tuple[int, float]:
+        """
+        Searches every action from the agent's current turn's board state, with each action searched in a worker
+        process.
+
+        :param depth: The number of moves to search, including the agent's action.
+        :param move_order: The order of the actions, with the first of equally scored actions being chosen.
+        :return: Tuple of the best action and its score.
+        """
+        executor = self._get_executor(self.workers)
+        spec = self._worker_spec()
+        time_left = self._time_left()
+        futures = {col: executor.submit(_search_worker, spec, col, depth, time_left)
+                   for col in move_order if not self.board.check_col_full(col)}
+
+        best_score = -self._infinity
+        best_action = None
+        for col, future in futures.items():
+            score = future.result()
+            if score is None:
+                raise _SearchTimeout()
+            if score > best_score:
+                best_score = score
+                best_action = col
+        return best_action, best_score
+
+    def _iterative_search(self) -> tuple[int, float]:
+        """
+        Searches an increasing number of moves ahead until the agent's time budget runs out.
+        Each search starts with the best action of the one before, and the transposition table carries the best moves
+        found deeper in the tree, so the earlier searches order the moves of the later ones.
+        The first search is always completed, so that there is an action to take.
+
+        :return: Tuple of the best action and its score, from the deepest search that was completed.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        num_moves = self.board.num_moves
+        action, score = self._search(1)
+
+        depth = 2
+        self._deadline = deadline
+        try:
+            # Stop early once a forced win or loss has been found, as searching deeper can't change it.
+            while num_moves + depth <= self.board.max_moves and abs(score) < self.WIN_SCORE:
+                action, score = self._search(depth, action)
+                depth += 1
+        except _SearchTimeout:
+            # Unwind any moves left on the board by the abandoned search.
+            while self.board.num_moves > num_moves:
+                self.board.undo()
+        finally:
+            self._deadline = None
+
+        logging.info(f"AlphaBetaAgent completed a search of {depth - 1} moves within its time budget.")
+        return action, score
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Searches from each of a batch of boards in turn, as the search prunes differently on every board, so can't be
+        done on them all at once.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        return Agent.act_batch(self, boards)
+
+    def perform_turn(self) -> int:
+        """
+        Searches the agent's own moves and the opponent's replies to find the best column.
+
+        :return: Integer value representing the action that the agent will take.
+        """
+        super(LookAheadAgent, self).perform_turn()
+
+        if self._book is not None:
+            book_move = self._book.lookup(self.board)
+            if book_move is not None:
+                logging.info("AlphaBetaAgent playing move from the opening book.")
+                return book_move[0]
+
+        if self.time_budget is None:
+            logging.info(f"AlphaBetaAgent searching {self.steps} steps ahead...")
+            action, score = self._search((2 * self.steps) - 1)
+        else:
+            logging.info(f"AlphaBetaAgent searching within a time budget of {self.time_budget} seconds...")
+            action, score = self._iterative_search()
+        logging.info(f"AlphaBetaAgent finished searching, with a best score of {score}.")
+        return action
+
+
+class SolverAgent(Agent):
+    def __init__(self, player_num: int, board: Board, verbose: bool, weak: bool = False, tt_size_mb: float = 64,
+                 use_book: bool = True, time_budget: float or None = 1.0):
+        """
+        Agent that solves the game from the current board state, to play perfectly.
+
+        Solving is only practical on small boards, such as the standard 6 row, 7 column board, and is slowest near the
+        start of the game, where solving the standard board takes minutes. Board states that can't be solved within the
+        time budget, and aren't in the opening book, are searched by an AlphaBetaAgent for the rest of the budget
+        instead, so the agent only plays perfectly once the board state is in the book or can be solved in time.
+
+        :param board: A reference to the current board state of the game.
+        :param player_num: The player value for the agent.
+        :param weak: Bool that indicates whether the agent only needs to keep the best result (win, draw or loss),
+            rather than win as quickly, or lose as slowly, as possible. Weak solving is much faster.
+        :param tt_size_mb: The memory, in megabytes, of the transposition table used by the solver. The table is kept
+            between turns, so positions solved before running out of time are quicker to solve on later turns.
+        :param use_book: Bool that indicates whether the agent plays the moves in the opening book for the board size,
+            when one has been built and the board state is in it, rather than solving the opening itself.
+        :param time_budget: The number of seconds the agent may spend choosing each move, or None to always solve the
+            board state, however long that takes. Half of the budget is spent trying to solve the board state.
+        """
+        super().__init__(player_num, board, verbose)
+        self.weak = weak
+        self._solver: Solver = Solver(board.rows, board.cols, board.win_condition, tt_size_mb)
+        self._book: OpeningBook or None = OpeningBook.load(board.rows, board.cols, board.win_condition) \
+            if use_book else None
+
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be larger than 0.")
+        self.time_budget: float or None = time_budget
+        # Agent that searches the board states that can't be solved in time.
+        self._fallback: AlphaBetaAgent or None = AlphaBetaAgent(player_num, board, False, time_budget=time_budget / 2,
+                                                                use_book=use_book) \
+            if time_budget is not None else None
+
+    def perform_turn(self) -> int:
+        """
+        Agent performs turn by solving the board state, and choosing the move with the best score.
+
+        :return: Integer value representing the action that the agent will take.
+        """
+        super().perform_turn()
+        if self._book is not None:
+            book_move = self._book.lookup(self.board)
+            if book_move is not None:
+                logging.info("SolverAgent playing move from the opening book.")
+                return book_move[0]
+
+        if self.time_budget is None:
+            action, score = self._solver.best_move(self.board, self.player_num, self.weak)
+            return action
+
+        start = time.perf_counter()
+        try:
+            action, score = self._solver.best_move(self.board, self.player_num, self.weak,
+                                                   start + (self.time_budget / 2))
+            return action
+        except TimeoutError:
+            logging.info("SolverAgent could not solve the board state in time, so is searching it instead.")
+        # The fallback searches whichever board the agent is playing on, which changes when acting on a batch.
+        self._fallback.board = self.board
+        self._fallback.time_budget = max(self.time_budget - (time.perf_counter() - start), self.time_budget / 10)
+        return self._fallback.perform_turn()
+
+
+class MCTSAgent(Agent):
+    def __init__(self, player_num: int, board: Board, verbose: bool, playouts: int or None = 1000,
+                 time_budget: float or None = None, exploration: float = 1.41, workers: int = 1):
+        """
+        Agent that chooses moves using Monte Carlo tree search, scoring moves by the results of random playouts.
+
+        The part of the search tree below the move that is played is kept, and reused on the agent's next turn.
+        With more than 1 worker, each worker process grows its own tree from the current board state, with its own
+        random playouts, and the move visited most across all of the trees is chosen. The trees aren't kept between
+        turns.
+
+        :param board: A reference to the current board state of the game.
+        :param player_num: The player value for the agent.
+        :param playouts: The number of playouts the agent runs for each move. Ignored if a time budget is given.
+        :param time_budget: The number of seconds the agent may spend choosing each move, or None to run a fixed number
+            of playouts.
+        :param exploration: How strongly the search favours less visited moves over those that have scored well.
+        :param workers: The number of processes to search with. Each process runs the given number of playouts, or
+            searches for the whole time budget.
+        """
+        super().__init__(player_num, board, verbose)
+        if time_budget is None and (playouts is None or playouts < 1):
+            raise ValueError("playouts must be at least 1 when there is no time_budget.")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be larger than 0.")
+        self.playouts: int or None = playouts
+        self.time_budget: float or None = time_budget
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("workers must be an integer of at least 1.")
+        self.workers: int = workers
+
+        self._mcts: MCTS = MCTS(board.rows, board.cols, board.win_condition, exploration)
+        self._root: MCTSNode or None = None
+        self._root_moves: tuple[tuple[int, int], ...] = ()
+        # Board that the moves of the kept tree are replayed on, to check that a node holds the current board state.
+        self._key_board: Board = Board(board.rows, board.cols, board.win_condition)
+
+    def _reuse_root(self) -> MCTSNode:
+        """
+        Finds the node for the current board state in the tree kept from the agent's last turn, or starts a new tree if
+        the board state isn't in it.
+
+        :return: The root node to search from.
+        """
+        moves = self.board.moves
+        node = self._root
+        if node is not None and moves[:len(self._root_moves)] == self._root_moves:
+            self._key_board.reset_board()
+            for move, player in self._root_moves:
+                self._key_board.update_board(move, player)
+            for move, _ in moves[len(self._root_moves):]:
+                node = node.child(move)
+                if node is None:
+                    break
+                self._key_board.update_board(node.move, node.player)
+            # Boards loaded from a grid, such as when acting on a batch, record their moves row by row rather than in
+            # the order they were played, so the node found by following their columns can be for a different board
+            # state. It is only reused if it holds the same position.
+            if node is not None and self._key_board.hash_key != self.board.hash_key:
+                node = None
+        else:
+            node = None
+
+        if node is None:
+            return MCTSNode(None, 1 if self.player_num == 2 else 2)
+        node.parent = None
+        return node
+
+    def perform_turn(self) -> int:
+        """
+        Agent performs turn by searching from the current board state, and choosing the most visited move.
+
+        :return: Integer value representing the action that the agent will take.
+        """
+        super().perform_turn()
+        masks = [0, self.board.get_bitboard(1), self.board.get_bitboard(2)]
+        heights = [int(self.board.get_col_counter(i)) for i in range(self.board.cols)]
+        if self.workers > 1:
+            return self._parallel_search(masks, heights)
+
+        root = self._reuse_root()
+
+        if self.time_budget is None:
+            logging.info(f"MCTSAgent running {self.playouts} playouts...")
+            playouts = self._mcts.search(root, masks, heights, self.board.num_moves, playouts=self.playouts)
+        else:
+            logging.info(f"MCTSAgent searching within a time budget of {self.time_budget} seconds...")
+            playouts = self._mcts.search(root, masks, heights, self.board.num_moves,
+                                         deadline=time.perf_counter() + self.time_budget)
+
+        best = max(root.children, key=lambda c: c.visits)
+        logging.info(f"MCTSAgent ran {playouts} playouts, and its chosen move won {best.wins} of {best.visits}.")
+
+        self._root = best
+        self._root_moves = self.board.moves + ((best.move, self.player_num),)
+        return best.move
+
+    def _parallel_search(self, masks: list[int], heights: list[int]) -> int:
+        """
+        Grows a search tree in each worker process, and merges the visits of the moves at their roots.
+
+        :param masks: List of each player's bitboard, indexed by player value.
+        :param heights: List of the number of counters in each column.
+        :return: Integer value representing the action that the agent will take.
+        """
+        logging.info(f"MCTSAgent searching with {self.workers} workers...")
+        executor = self._get_executor(self.workers)
+        futures = [executor.submit(_mcts_worker, self._mcts, masks, heights, self.board.num_moves, self.player_num,
+                                   self.playouts if self.time_budget is None else None, self.time_budget,
+                                   random.getrandbits(64))
+                   for _ in range(self.workers)]
+
+        visits = np.zeros(self.board.cols)
+        wins = np.zeros(self.board.cols)
+        for future in futures:
+            for move, move_visits, move_wins in future.result():
+                visits[move] += move_visits
+                wins[move] += move_wins
+
+        action = int(np.argmax(visits))
+        logging.info(f"MCTSAgent ran {int(visits.sum())} playouts, and its chosen move won {wins[action]} of "
+                     f"{int(visits[action])}.")
+        return action
+
+
+class RLAgent(Agent):
+    def __init__(self, player_num: int, board: Board, verbose: bool, filepath: str):
+        """
+        Base class for reinforcement learning agents, which are created through a subclass that loads a particular type
+        of model.
+
+        The observations given to the model are built in the layout and data type of the observation space it was
+        trained with, so models trained with any of ConnectXEnv's observation modes and data types can be played.
+
+        :param board: Reference to the game board.
+        :param filepath: Filepath for the agent's model.
+        """
+        super().__init__(player_num, board, verbose)
+        self.model = self._load_model(filepath)
+
+    @staticmethod
+    @abstractmethod
+    def _load_model(filepath: str):
+        """
+        Load the agent's model from a file.
+
+        :param filepath: Filepath that the agent's model is stored in.
+        :return: The loaded model.
+        """
+
+    def _observations(self, boards: np.ndarray, heights: np.ndarray) -> np.ndarray:
+        """
+        Builds the observation the model sees of each of a batch of boards, as ConnectXEnv would give it.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :param heights: Array of the number of counters in each column of each board.
+        :return: Array of the observation of each board.
+        """
+        space = self.model.observation_space
+        if len(space.shape) == 3:
+            observations = batch.planes(boards, heights, self.player_num)
+        else:
+            observations = np.concatenate((boards.reshape(len(boards), -1), heights), axis=1)
+        return observations.astype(space.dtype)
+
+    def _predict_action_proba(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Retrieve the probability of the model taking each possible action in action space for each of a batch of
+        observations.
+        See: https://stackoverflow.com/questions/66428307/how-to-get-action-propability-in-stable-baselines-3
+
+        :param observations: Array of observations, as returned by _observations.
+        :return: Array of floats indicating probability of each action in the action space, for each observation.
+        """
+        obs = self.model.policy.obs_to_tensor(observations)[0]
+        dis = self.model.policy.get_distribution(obs)
+        probs = dis.distribution.probs
+        return probs.detach().cpu().numpy()
+
+    def perform_turn(self) -> int:
+        """
+        Agent uses action space probabilities to decide on its action.
+        """
+        super().perform_turn()
+        board = self.board.board_array().reshape(1, self.board.rows, self.board.cols)
+        action_proba = self._predict_action_proba(self._observations(board, self.board.col_counters().reshape(1, -1)))
+        # Selects action with the highest probability that doesn't correspond to a full column.
+        return int(np.where(self.board.legal_moves(), action_proba[0], -1).argmax())
+
+    def act_batch(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Agent selects the action with the highest probability that isn't a full column, on each of a batch of boards,
+        with the model run on every board at once.
+
+        :param boards: Array of shape (boards, rows, cols) of the player value held in each position of each board, with
+            the top row first.
+        :return: Array of the agent's action on each board.
+        """
+        heights = (boards != 0).sum(axis=1)
+        action_proba = self._predict_action_proba(self._observations(boards, heights))
+        return np.where(boards[:, 0, :] == 0, action_proba, -1).argmax(axis=1)
+
+
+class PPOAgent(RLAgent):
+    def __init__(self, player_num: int, board: Board, verbose: bool,
+                 filepath: str = 'connectx/models/PPO_6-7-4_v0.1/PPO_6-7-4_v0.1_50000'):
+        """
+        Agent that uses a Proximal Policy Optimisation policy gradient method.
+        """
+        super().__init__(player_num, board, verbose, filepath)
+
+    @staticmethod
+    def _load_model(filepath: str):
+        # Only imported when a model is played, as the other agents don't need stable_baselines3.
+        from stable_baselines3 import PPO
+        return PPO.load(filepath)
+
+
+class A2CAgent(RLAgent):
+    def __init__(self, player_num: int, board: Board, verbose: bool,
+                 filepath: str = 'connectx/models/A2C_6-7-4_v0.1/A2C_6-7-4_v0.1_50000'):
+        """
+        Agent that uses an Advantage Actor Critic policy gradient method.
+        """
+        super().__init__(player_num, board, verbose, filepath)
+
+    @staticmethod
+    def _load_model(filepath: str):
+        from stable_baselines3 import A2C
+        return A2C.load(filepath)
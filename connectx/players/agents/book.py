@@ -0,0 +1,155 @@
+import os
+import logging
+import time
+
+import numpy as np
+
+from connectx.game.board import Board
+from connectx.players.agents.solver import Solver
+
+
+class OpeningBook:
+    # Books are kept in the package, rather than the working directory, so that the same books are found wherever
+    # the agents are run from.
+    BOOKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "books")
+
+    # Each entry is a position's hash, followed by the best move and its score. Entries are sorted by hash.
+    ENTRY_DTYPE = np.dtype([('key', '<u8'), ('move', 'i1'), ('score', '<i2')])
+
+    def __init__(self, filepath: str):
+        """
+        Book of the best moves for the opening positions of a board size, read from a file built by build_book.py.
+        Positions are stored by their canonical key, so a position and its mirror image share an entry.
+
+        The file is memory-mapped rather than read in, so opening a book is instant and the pages of the file are shared
+        by every process using it. Positions are found by binary search on their hash.
+
+        :param filepath: String for the filepath of the book.
+        """
+        if not os.path.exists(filepath):
+            raise ValueError(f"Opening book \'{filepath}\' does not exist.")
+
+        if os.path.getsize(filepath) == 0:
+            # Empty files can't be memory-mapped.
+            self._entries: np.ndarray = np.zeros(0, dtype=self.ENTRY_DTYPE)
+        else:
+            self._entries: np.ndarray = np.memmap(filepath, dtype=self.ENTRY_DTYPE, mode='r')
+        self._keys: np.ndarray = self._entries['key']
+        logging.info(f"Opened opening book \'{filepath}\' with {len(self._entries)} positions.")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def filepath(cls, rows: int, cols: int, win_condition: int) -> str:
+        return os.path.join(cls.BOOKS_DIR, f"{rows}-{cols}-{win_condition}.book")
+
+    @classmethod
+    def load(cls, rows: int, cols: int, win_condition: int) -> 'OpeningBook' or None:
+        """
+        Opens the opening book for a board size, if one has been built.
+
+        :param rows: Integer value for the number of rows the board has.
+        :param cols: Integer value for the number of columns the board has.
+        :param win_condition: Integer value for the number of counters in a row required to win.
+        :return: The opening book, or None if there isn't one for the board size.
+        """
+        filepath = cls.filepath(rows, cols, win_condition)
+        if not os.path.exists(filepath):
+            return None
+        return cls(filepath)
+
+    def lookup(self, board: Board) -> tuple[int, int] or None:
+        """
+        Finds the best move for the board state in the book.
+
+        :param board: The board state being looked up.
+        :return: Tuple of the best move and its score, or None if the board state isn't in the book.
+        """
+        key, mirrored = board.canonical_key()
+        key = np.uint64(key)
+        i = int(np.searchsorted(self._keys, key))
+        if i < len(self._keys) and self._keys[i] == key:
+            move = int(self._entries[i]['move'])
+            return board.cols - 1 - move if mirrored else move, int(self._entries[i]['score'])
+        return None
+
+    @classmethod
+    def build(cls, rows: int, cols: int, win_condition: int, depth: int, weak: bool = False,
+              tt_size_mb: float = 64, min_depth: int = 0, time_limit: float or None = None) -> np.ndarray:
+        """
+        Solves every position reachable within a number of moves from the start of the game.
+
+        Positions near the start of the game are by far the slowest to solve. On the standard 6 row, 7 column board, the
+        empty board takes hours to solve, and positions in the first 12 moves often take tens of seconds each, so a
+        complete book is only practical for smaller boards. For larger boards, min_depth leaves out the positions
+        nearest the start, and time_limit leaves out any position that can't be solved quickly, giving a partial book.
+
+        :param rows: Integer value for the number of rows the board has.
+        :param cols: Integer value for the number of columns the board has.
+        :param win_condition: Integer value for the number of counters in a row required to win.
+        :param depth: Integer value for the number of moves from the start of the game to include positions up to.
+        :param weak: Bool that indicates whether only the result (win, draw or loss) of each move is needed.
+        :param tt_size_mb: The memory, in megabytes, of the transposition table used by the solver.
+        :param min_depth: Integer value for the number of moves from the start of the game to include positions from.
+        :param time_limit: The number of seconds each position may take to solve before it is left out of the book, or
+            None to solve every position, however long it takes.
+        :return: Array of book entries, sorted by their hash.
+        """
+        board = Board(rows, cols, win_condition)
+        solver = Solver(rows, cols, win_condition, tt_size_mb)
+        entries = {}
+        # Canonical keys of every position reached, including those that weren't solved.
+        visited = set()
+
+        def add_positions():
+            # Positions reached through different orders of moves, or as mirror images, are only visited once.
+            key, mirrored = board.canonical_key()
+            if key in visited:
+                return
+            visited.add(key)
+
+            if board.num_moves < depth:
+                for col in range(cols):
+                    if board.check_col_full(col):
+                        continue
+                    board.play(col)
+                    if not board.last_move_wins() and board.num_moves < board.max_moves:
+                        add_positions()
+                    board.undo()
+
+            if board.num_moves < min_depth:
+                return
+            # Positions are solved after the ones that follow them, which leaves the solver's transposition table full
+            # of results that speed up solving this one.
+            deadline = time.perf_counter() + time_limit if time_limit is not None else None
+            try:
+                move, score = solver.best_move(board, board.player_to_move, weak, deadline)
+            except TimeoutError:
+                return
+            entries[key] = (board.cols - 1 - move if mirrored else move, score)
+            if len(entries) % 1000 == 0:
+                logging.info(f"Solved {len(entries)} opening positions.")
+
+        add_positions()
+        if time_limit is not None:
+            logging.info(f"{len(entries)} of the opening positions could be solved within the time limit.")
+
+        book = np.zeros(len(entries), dtype=cls.ENTRY_DTYPE)
+        book['key'] = list(entries.keys())
+        book['move'] = [move for move, _ in entries.values()]
+        book['score'] = [score for _, score in entries.values()]
+        return np.sort(book, order='key')
+
+    @staticmethod
+    def write(book: np.ndarray, filepath: str):
+        """
+        Writes book entries to a flat binary file, which can be opened as an OpeningBook.
+
+        :param book: Array of book entries, sorted by their hash.
+        :param filepath: String for the filepath the book is written to.
+        """
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        book.tofile(filepath)
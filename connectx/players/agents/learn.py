@@ -1,7 +1,45 @@
 import os
+from functools import partial
+
+import numpy as np
 
 from connectx.env.connectXEnv import ConnectXEnv
+from connectx.env.mirrorWrapper import MirrorWrapper
+from connectx.env.sharedMemoryVecEnv import SharedMemoryVecEnv
+from connectx.env.vecConnectXEnv import VecConnectXEnv
 from stable_baselines3 import PPO, A2C
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
+
+
+def makeEnv(modelPlayer: int, opponentName: str, rows: int, cols: int, winCondition: int,
+            seed: int or None, obsDtype: str = 'float64', obsMode: str = 'flat',
+            mirrorProb: float = 0.0) -> ConnectXEnv or MirrorWrapper:
+    """
+    Function that creates one of the environments the model trains in, at module level so that worker processes can
+    create it.
+
+    :param modelPlayer: Integer player value for the agent being trained.
+    :param opponentName: String indicating the opponent the agent is playing against.
+    :param rows: Integer value for the number of rows the board will have.
+    :param cols: Integer value for the number of columns the board will have.
+    :param winCondition: Integer value for the number of counters in a row required to win.
+    :param seed: Seed for the environment's random choices.
+    :param obsDtype: String for the data type of the environment's observations.
+    :param obsMode: String for the layout of the environment's observations, 'flat' or 'planes'.
+    :param mirrorProb: Float probability of each episode being shown to the agent as a mirror image, or 0 to never
+        mirror them.
+    :return: Environment object for the Connect-X Environment.
+    """
+    if modelPlayer == 1:
+        env = ConnectXEnv(rows=rows, cols=cols, winCondition=winCondition, player2=opponentName,
+                          obsDtype=obsDtype, obsMode=obsMode)
+    else:
+        env = ConnectXEnv(rows=rows, cols=cols, winCondition=winCondition, player1=opponentName,
+                          obsDtype=obsDtype, obsMode=obsMode)
+    env.seed(seed)
+    if mirrorProb > 0:
+        return MirrorWrapper(env, mirrorProb)
+    return env
 
 
 class Learn:
@@ -10,6 +48,9 @@ class Learn:
 
     MODEL_TYPES = ['PPO', 'A2C']
     PLAYERS = [1, 2]
+    BACKENDS = ['dummy', 'subproc', 'shared-memory', 'batched']
+    OBS_DTYPES = ['int8', 'float32', 'float64']
+    OBS_MODES = ConnectXEnv.OBS_MODES
 
     def __init__(self,
                  modelType: str,
@@ -19,7 +60,13 @@ class Learn:
                  opponentName: str = 'rand',
                  rows: int = 6,
                  cols: int = 7,
-                 winCondition: int = 4):
+                 winCondition: int = 4,
+                 numEnvs: int = 1,
+                 backend: str = 'dummy',
+                 seed: int or None = None,
+                 obsDtype: str = 'float64',
+                 obsMode: str = 'flat',
+                 mirrorProb: float = 0.0):
         """
         Class that helps to automate bulk training of the agent model.
 
@@ -31,6 +78,21 @@ class Learn:
         :param rows: Integer value for the number of rows the board will have.
         :param cols: Integer value for the number of columns the board will have.
         :param winCondition: Integer value for the number of counters in a row required to win.
+        :param numEnvs: Integer number of environments the model collects its rollouts from.
+        :param backend: String indicating how the environments are run: 'dummy' runs them one after another in this
+                        process, 'subproc' runs each in its own process, and 'shared-memory' also runs each in its own
+                        process, but passes observations back through shared memory. 'batched' steps every
+                        environment at once in this process, on a single array of boards, which is fastest for the
+                        built-in opponents.
+        :param seed: Integer seed that each environment's seed is drawn from, or None for unseeded environments.
+        :param obsDtype: String for the data type of the environments' observations: 'int8' stores observations in an
+                         eighth of the memory of 'float64', which a model must have been trained with to be loaded.
+        :param obsMode: String for the layout of the environments' observations: 'flat' for the board followed by the
+                        column counters, or 'planes' for the planes described in ConnectXEnv. The MlpPolicy flattens
+                        the planes, and a model must have been trained with the same layout to be loaded.
+        :param mirrorProb: Float probability of each episode being shown to the agent as a mirror image of the board,
+                           to train on both versions of positions, or 0 to never mirror them. Not supported by the
+                           'batched' backend.
         """
 
         if modelType not in self.MODEL_TYPES:
@@ -40,6 +102,30 @@ class Learn:
         if modelPlayer not in self.PLAYERS:
             raise ValueError("Player must be either 1 or 2.")
 
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend must be one of {self.BACKENDS}.")
+
+        if obsDtype not in self.OBS_DTYPES:
+            raise ValueError(f"Observation data type must be one of {self.OBS_DTYPES}.")
+
+        if obsMode not in self.OBS_MODES:
+            raise ValueError(f"Observation mode must be one of {self.OBS_MODES}.")
+
+        if not 0 <= mirrorProb <= 1:
+            raise ValueError("Mirror probability must be between 0 and 1.")
+        if mirrorProb > 0 and backend == 'batched':
+            # The batched environments are stepped together, so can't be mirrored separately by a wrapper.
+            raise ValueError("Mirrored episodes are not supported by the batched backend.")
+
+        if numEnvs < 1:
+            raise ValueError("Number of environments must be at least 1.")
+        self._numEnvs = numEnvs
+        self._backend = backend
+        self._seed = seed
+        self._obsDtype = obsDtype
+        self._obsMode = obsMode
+        self._mirrorProb = mirrorProb
+
         if not os.path.exists(self.MODELS_DIR):
             os.makedirs(self.MODELS_DIR)
         if not os.path.exists(self.LOGS_DIR):
@@ -54,7 +140,13 @@ class Learn:
             opponentName,
             rows,
             cols,
-            winCondition)
+            winCondition,
+            self._numEnvs,
+            self._backend,
+            self._seed,
+            self._obsDtype,
+            self._obsMode,
+            self._mirrorProb)
         self._model = self._initModel(modelType, modelFile)
 
     def _initModel(self, modelType: str, modelFile: str or None) -> PPO or A2C:
@@ -96,22 +188,42 @@ class Learn:
 
     @staticmethod
     def _initEnv(modelPlayer: int, opponentName: str,
-                 rows: int = 6, cols: int = 7, winCondition: int = 4):
+                 rows: int = 6, cols: int = 7, winCondition: int = 4,
+                 numEnvs: int = 1, backend: str = 'dummy', seed: int or None = None,
+                 obsDtype: str = 'float64', obsMode: str = 'flat', mirrorProb: float = 0.0) -> VecEnv:
         """
-        Function used to initialise the environment, and game, the model will use for training.
+        Function used to initialise the environments, and games, the model will use for training.
 
         :param modelPlayer: Integer player value for the agent being trained.
         :param opponentName: String indicating the opponent the agent is playing against.
         :param rows: Integer value for the number of rows the board will have.
         :param cols: Integer value for the number of columns the board will have.
         :param winCondition: Integer value for the number of counters in a row required to win.
-        :return: Environment object for the Connect-X Environment being used to train the agent.
+        :param numEnvs: Integer number of environments.
+        :param backend: String indicating how the environments are run.
+        :param seed: Integer seed that each environment's seed is drawn from, or None for unseeded environments.
+        :param obsDtype: String for the data type of the environments' observations.
+        :param obsMode: String for the layout of the environments' observations.
+        :param mirrorProb: Float probability of each episode being shown to the agent as a mirror image.
+        :return: Vectorised environment object for the Connect-X Environments being used to train the agent.
         """
-        if modelPlayer == 1:
-            return ConnectXEnv(rows=rows, cols=cols,
-                               winCondition=winCondition, player2=opponentName)
-        return ConnectXEnv(rows=rows, cols=cols,
-                           winCondition=winCondition, player1=opponentName)
+        if backend == 'batched':
+            opponents = {'player2': opponentName} if modelPlayer == 1 else {'player1': opponentName}
+            return VecConnectXEnv(numEnvs, rows, cols, winCondition, seed=seed, obsDtype=obsDtype, obsMode=obsMode,
+                                  **opponents)
+
+        # Each environment gets an independent seed, so that their opponents don't make the same random choices.
+        seeds = [int(s) for s in np.random.SeedSequence(seed).generate_state(numEnvs)] if seed is not None \
+            else [None] * numEnvs
+        envFns = [partial(makeEnv, modelPlayer, opponentName, rows, cols, winCondition, envSeed, obsDtype, obsMode,
+                          mirrorProb)
+                  for envSeed in seeds]
+
+        if backend == 'subproc':
+            return SubprocVecEnv(envFns)
+        if backend == 'shared-memory':
+            return SharedMemoryVecEnv(envFns)
+        return DummyVecEnv(envFns)
 
     def updateEnv(self, modelPlayer: int, opponentName: str,
                   rows: int = 6, cols: int = 7, winCondition: int = 4):
@@ -127,12 +239,20 @@ class Learn:
         :param winCondition: Integer value for the number of counters in a row required to win.
         :return: Environment object for the Connect-X Environment being used to train the agent.
         """
+        self._env.close()
         self._env = self._initEnv(
             modelPlayer,
             opponentName,
             rows,
             cols,
-            winCondition)
+            winCondition,
+            self._numEnvs,
+            self._backend,
+            self._seed,
+            self._obsDtype,
+            self._obsMode,
+            self._mirrorProb)
+        self._model.set_env(self._env)
         print("\nEnvironment updated.\n")
 
     def train(self, numIterations: int, numTimesteps: int, logIters: int = 5):
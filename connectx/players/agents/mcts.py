@@ -0,0 +1,171 @@
+import math
+import random
+import time
+
+
+class MCTSNode:
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins', 'result')
+
+    def __init__(self, move: int or None, player: int, parent: 'MCTSNode' or None = None):
+        """
+        Node of a Monte Carlo search tree, for the position after a move has been made.
+
+        :param move: Integer value for the column of the move leading to this node, or None for the root of a new tree.
+        :param player: The player value for the player who made the move leading to this node.
+        :param parent: The node the move was made from.
+        """
+        self.move: int or None = move
+        self.player: int = player
+        self.parent: MCTSNode or None = parent
+        self.children: list[MCTSNode] = []
+        # Moves that haven't been expanded yet, filled in when the node is first expanded.
+        self.untried: list[int] or None = None
+        self.visits: int = 0
+        # Playouts won by the player who made the move leading to this node, with draws counting as half a win.
+        self.wins: float = 0
+        # Player value of the winner if the game is over at this node, 0 for a draw, or None if it isn't over.
+        self.result: int or None = None
+
+    def child(self, move: int) -> 'MCTSNode' or None:
+        for child in self.children:
+            if child.move == move:
+                return child
+        return None
+
+
+class MCTS:
+    def __init__(self, rows: int = 6, cols: int = 7, win_condition: int = 4, exploration: float = 1.41):
+        """
+        Monte Carlo tree search using the UCT rule to choose which moves to explore.
+
+        Positions are held as bitboards, laid out in the same way as the Board class, and playouts are played on them
+        directly with random moves, so that no Board, Game or Player objects are involved.
+
+        :param rows: Integer value for the number of rows the board has.
+        :param cols: Integer value for the number of columns the board has.
+        :param win_condition: Integer value for the number of counters in a row required to win.
+        :param exploration: Float value for how strongly less visited moves are favoured when exploring.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.win_condition: int = win_condition
+        self.max_moves: int = rows * cols
+        self.exploration: float = exploration
+
+        self._col_bits: int = rows + 1
+        self._shifts: tuple[int, ...] = (1, self._col_bits, self._col_bits + 1, self._col_bits - 1)
+
+    def _wins(self, mask: int) -> bool:
+        """
+        Checks whether a player's counters contain a line of the win condition length.
+
+        :param mask: Bitboard of the player's counters.
+        :return: Boolean indicating whether the player has won.
+        """
+        for shift in self._shifts:
+            lines = mask
+            matched = 1
+            while matched < self.win_condition:
+                step = min(matched, self.win_condition - matched)
+                lines &= lines >> (step * shift)
+                matched += step
+            if lines:
+                return True
+        return False
+
+    def _playout(self, masks: list[int], heights: list[int], num_moves: int, player: int) -> int:
+        """
+        Plays random moves until the end of the game.
+
+        :param masks: List of each player's bitboard, indexed by player value, which is changed by the playout.
+        :param heights: List of the number of counters in each column, which is changed by the playout.
+        :param num_moves: Integer number of counters on the board.
+        :param player: The player value for the player to move.
+        :return: Player value of the winner, or 0 for a draw.
+        """
+        legal = [col for col in range(self.cols) if heights[col] < self.rows]
+        while legal:
+            col = legal[int(random.random() * len(legal))]
+            masks[player] |= 1 << ((col * self._col_bits) + heights[col])
+            heights[col] += 1
+            num_moves += 1
+
+            if self._wins(masks[player]):
+                return player
+            if heights[col] == self.rows:
+                legal.remove(col)
+            player = 1 if player == 2 else 2
+        return 0
+
+    def _iteration(self, root: MCTSNode, masks: list[int], heights: list[int], num_moves: int):
+        """
+        Runs one iteration of the search: selecting a leaf of the tree, expanding it, playing out from it and backing up
+        the result.
+
+        :param root: The root node of the tree.
+        :param masks: List of each player's bitboard at the root, indexed by player value.
+        :param heights: List of the number of counters in each column at the root.
+        :param num_moves: Integer number of counters on the board at the root.
+        """
+        masks = list(masks)
+        heights = list(heights)
+
+        # Select the most promising child of each fully expanded node, until a node with untried moves is reached.
+        node = root
+        while node.result is None and node.untried is not None and not node.untried:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda c: (c.wins / c.visits) +
+                       (self.exploration * math.sqrt(log_visits / c.visits)))
+            masks[node.player] |= 1 << ((node.move * self._col_bits) + heights[node.move])
+            heights[node.move] += 1
+            num_moves += 1
+
+        if node.result is None:
+            if node.untried is None:
+                node.untried = [col for col in range(self.cols) if heights[col] < self.rows]
+            # Expand a random untried move.
+            col = node.untried.pop(int(random.random() * len(node.untried)))
+            player = 1 if node.player == 2 else 2
+            masks[player] |= 1 << ((col * self._col_bits) + heights[col])
+            heights[col] += 1
+            num_moves += 1
+
+            child = MCTSNode(col, player, node)
+            if self._wins(masks[player]):
+                child.result = player
+            elif num_moves == self.max_moves:
+                child.result = 0
+            node.children.append(child)
+            node = child
+
+        if node.result is not None:
+            winner = node.result
+        else:
+            winner = self._playout(masks, heights, num_moves, 1 if node.player == 2 else 2)
+
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1
+            elif winner == 0:
+                node.wins += 0.5
+            node = node.parent
+
+    def search(self, root: MCTSNode, masks: list[int], heights: list[int], num_moves: int,
+               playouts: int or None = None, deadline: float or None = None) -> int:
+        """
+        Grows the search tree from a root node, until either the number of playouts or the deadline is reached.
+
+        :param root: The root node of the tree, which may already have been searched.
+        :param masks: List of each player's bitboard at the root, indexed by player value.
+        :param heights: List of the number of counters in each column at the root.
+        :param num_moves: Integer number of counters on the board at the root.
+        :param playouts: Integer number of playouts to run, or None to run until the deadline.
+        :param deadline: Time, from time.perf_counter, at which to stop, or None to run the given number of playouts.
+        :return: Integer number of playouts run.
+        """
+        count = 0
+        while (playouts is None or count < playouts) and (deadline is None or time.perf_counter() < deadline):
+            self._iteration(root, masks, heights, num_moves)
+            count += 1
+        return count
@@ -0,0 +1,254 @@
+import logging
+import time
+
+from connectx.game.board import Board
+from connectx.players.agents.transposition import TranspositionTable
+
+
+class Solver:
+    def __init__(self, rows: int = 6, cols: int = 7, win_condition: int = 4, tt_size_mb: float = 64):
+        """
+        Finds the game-theoretic value of Connect-X positions, assuming perfect play from both players.
+
+        Positions are held as a pair of bitboards, laid out in the same way as the Board class: the counters of the
+        player to move, and all counters on the board. Scores follow the convention of the standard Connect Four
+        solvers: a positive score means the player to move wins, and is larger the sooner they win. Winning with their
+        final counter scores 1, and each counter saved scores 1 more. A draw scores 0, and losses score negatively.
+
+        :param rows: Integer value for the number of rows the board has.
+        :param cols: Integer value for the number of columns the board has.
+        :param win_condition: Integer value for the number of counters in a row required to win.
+        :param tt_size_mb: The memory, in megabytes, of the transposition table used to remember searched positions.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.win_condition: int = win_condition
+        self.max_moves: int = rows * cols
+
+        self._col_bits: int = rows + 1
+        self._shifts: tuple[int, ...] = (1, self._col_bits, self._col_bits + 1, self._col_bits - 1)
+        self._bottom_mask: int = sum(1 << (col * self._col_bits) for col in range(cols))
+        self._board_mask: int = self._bottom_mask * ((1 << rows) - 1)
+        # Columns nearest the centre are searched first, as they tend to be strongest, giving more cut-offs.
+        centre = (cols - 1) / 2
+        self._move_order: list[int] = sorted(range(cols), key=lambda col: abs(col - centre))
+        self._column_masks: list[int] = [((1 << rows) - 1) << (col * self._col_bits) for col in range(cols)]
+        # Shifts to each of the positions in a line from a position, for every direction.
+        self._line_shifts: list[list[int]] = [
+            [k * shift for k in range(1, win_condition)] for shift in self._shifts
+        ]
+
+        self._tt: TranspositionTable = TranspositionTable(tt_size_mb)
+        self.node_count: int = 0
+        # Time at which the current solve must be abandoned, if it has one.
+        self._deadline: float or None = None
+
+    def _winning_positions(self, position: int, mask: int) -> int:
+        """
+        Finds every empty position where a counter would complete a line for a player.
+
+        :param position: Bitboard of the player's counters.
+        :param mask: Bitboard of all counters on the board.
+        :return: Bitboard of the empty positions that would win for the player.
+        """
+        winning = 0
+        for shifts in self._line_shifts:
+            # Positions with k of the player's counters directly ahead of them, and directly behind them.
+            ahead = [-1]
+            behind = [-1]
+            for shift in shifts:
+                ahead.append(ahead[-1] & (position >> shift))
+                behind.append(behind[-1] & (position << shift))
+            # A position wins if the counters either side of it make up a full line.
+            for k in range(self.win_condition):
+                winning |= ahead[k] & behind[-1 - k]
+        return winning & (self._board_mask ^ mask)
+
+    def _key(self, position: int, mask: int) -> int:
+        """
+        Builds a key that identifies a position, and fits in the 64 bits of the transposition table.
+
+        :param position: Bitboard of the counters of the player to move.
+        :param mask: Bitboard of all counters on the board.
+        :return: Integer key of the position.
+        """
+        # Adding the bottom row marks the height of each column, so the key is unique to the position.
+        key = position + mask + self._bottom_mask
+        if key >> 64:
+            # Boards too large for a unique 64-bit key fall back to hashing it.
+            return hash(key) & ((1 << 64) - 1)
+        return key
+
+    def _non_losing_moves(self, position: int, mask: int) -> int:
+        """
+        Finds the moves that don't let the opponent win on their next turn.
+
+        :param position: Bitboard of the counters of the player to move.
+        :param mask: Bitboard of all counters on the board.
+        :return: Bitboard of the positions of the moves that don't lose straight away.
+        """
+        possible = (mask + self._bottom_mask) & self._board_mask
+        opponent_wins = self._winning_positions(position ^ mask, mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                # The opponent has more than one winning move, which can't all be blocked.
+                return 0
+            possible = forced
+        # Never play directly below a position where the opponent would win.
+        return possible & ~(opponent_wins >> 1)
+
+    def _negamax(self, position: int, mask: int, num_moves: int, alpha: int, beta: int) -> int:
+        """
+        Recursive negamax search with alpha-beta pruning, searching until the end of the game.
+        The player to move must not be able to win straight away.
+
+        :param position: Bitboard of the counters of the player to move.
+        :param mask: Bitboard of all counters on the board.
+        :param num_moves: Integer number of counters on the board.
+        :param alpha: The lowest score the player to move is already guaranteed.
+        :param beta: The highest score the opponent will allow the player to move.
+        :return: The score of the position if it lies within (alpha, beta), otherwise a bound on it beyond the window.
+        """
+        self.node_count += 1
+        # The clock is only checked every few thousand positions, as checking it is slow compared to a position.
+        if self._deadline is not None and not self.node_count & 4095 and time.perf_counter() > self._deadline:
+            raise TimeoutError("The solver ran out of time.")
+
+        moves = self._non_losing_moves(position, mask)
+        if not moves:
+            # Every move lets the opponent win on their next turn.
+            return -((self.max_moves - num_moves) // 2)
+        if num_moves >= self.max_moves - 2:
+            # Neither player can win with the counters that are left.
+            return 0
+
+        # The opponent can't win on their next turn, so the score is at least that of losing after it.
+        lowest = -((self.max_moves - 2 - num_moves) // 2)
+        if alpha < lowest:
+            alpha = lowest
+            if alpha >= beta:
+                return alpha
+        # The player can't win on this turn, so the score is at most that of winning on their next turn.
+        highest = (self.max_moves - 1 - num_moves) // 2
+        key = self._key(position, mask)
+        entry = self._tt.lookup(key)
+        if entry is not None:
+            value, _, flag, _ = entry
+            if flag == TranspositionTable.LOWER:
+                lowest = int(value)
+                if alpha < lowest:
+                    alpha = lowest
+                    if alpha >= beta:
+                        return alpha
+            else:
+                highest = min(highest, int(value))
+        if beta > highest:
+            beta = highest
+            if alpha >= beta:
+                return beta
+
+        # Moves that create the most winning positions for the player are searched first.
+        ordered = []
+        for col in self._move_order:
+            move = moves & self._column_masks[col]
+            if move:
+                ordered.append((-self._winning_positions(position | move, mask).bit_count(), len(ordered), move))
+        ordered.sort()
+
+        for _, _, move in ordered:
+            # After the move, the opponent becomes the player to move.
+            score = -self._negamax(position ^ mask, mask | move, num_moves + 1, -beta, -alpha)
+            if score >= beta:
+                self._tt.store(key, 0, score, TranspositionTable.LOWER, -1)
+                return score
+            if score > alpha:
+                alpha = score
+
+        self._tt.store(key, 0, alpha, TranspositionTable.UPPER, -1)
+        return alpha
+
+    def _can_win_now(self, position: int, mask: int) -> bool:
+        """
+        Checks whether the player to move can complete a line with their next counter.
+
+        :param position: Bitboard of the counters of the player to move.
+        :param mask: Bitboard of all counters on the board.
+        :return: Boolean indicating whether the player to move can win straight away.
+        """
+        possible = (mask + self._bottom_mask) & self._board_mask
+        return bool(self._winning_positions(position, mask) & possible)
+
+    def _solve(self, position: int, mask: int, num_moves: int, weak: bool = False) -> int:
+        """
+        Finds the score of a position, using a series of null-window searches to narrow down the range it lies in.
+
+        :param position: Bitboard of the counters of the player to move.
+        :param mask: Bitboard of all counters on the board.
+        :param num_moves: Integer number of counters on the board.
+        :param weak: Bool that indicates whether only the result (win, draw or loss) is needed, rather than the score.
+        :return: The score of the position, or just its sign if weak.
+        """
+        if self._can_win_now(position, mask):
+            score = (self.max_moves + 1 - num_moves) // 2
+            return 1 if weak else score
+        if num_moves == self.max_moves:
+            return 0
+
+        lowest = -((self.max_moves - num_moves) // 2)
+        highest = (self.max_moves + 1 - num_moves) // 2
+        if weak:
+            lowest, highest = -1, 1
+        while lowest < highest:
+            # Each null-window search finds whether the score is above or below the middle of the range. Searching
+            # nearer zero first is quicker, as the search can stop as soon as a win or loss is found.
+            middle = lowest + ((highest - lowest) // 2)
+            if middle <= 0 and int(lowest / 2) < middle:
+                middle = int(lowest / 2)
+            elif middle >= 0 and int(highest / 2) > middle:
+                middle = int(highest / 2)
+            score = self._negamax(position, mask, num_moves, middle, middle + 1)
+            if score <= middle:
+                highest = score
+            else:
+                lowest = score
+        return lowest
+
+    def best_move(self, board: Board, player: int, weak: bool = False,
+                  deadline: float or None = None) -> tuple[int, int]:
+        """
+        Finds the best move for a player, assuming perfect play from both players.
+
+        :param board: The state of the board, which the player is to move on.
+        :param player: The player value for the player to move.
+        :param weak: Bool that indicates whether any move with the best result (win, draw or loss) will do, rather than
+            the move giving the best score.
+        :param deadline: The time, from time.perf_counter, by which the board state must be solved, or None to take as
+            long as is needed. A TimeoutError is raised if it isn't solved in time, with the positions solved so far
+            kept in the transposition table.
+        :return: Tuple of the best move and its score.
+        """
+        position = board.get_bitboard(player)
+        mask = board.get_bitboard(1) | board.get_bitboard(2)
+        num_moves = board.num_moves
+        self.node_count = 0
+
+        best_move, best_score = None, None
+        self._deadline = deadline
+        try:
+            for col in self._move_order:
+                if board.check_col_full(col):
+                    continue
+                move = (mask + self._bottom_mask) & self._column_masks[col]
+                if self._winning_positions(position, mask) & move:
+                    # Winning straight away is always the best move.
+                    best_move, best_score = col, 1 if weak else (self.max_moves + 1 - num_moves) // 2
+                    break
+                score = -self._solve(position ^ mask, mask | move, num_moves + 1, weak)
+                if best_score is None or score > best_score:
+                    best_move, best_score = col, score
+        finally:
+            self._deadline = None
+
+        logging.info(f"Solver searched {self.node_count} positions, finding a score of {best_score}.")
+        return best_move, best_score
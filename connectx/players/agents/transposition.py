@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class TranspositionTable:
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # Bytes used by each entry: key (8), value (8), depth (2), bound type (1) and best move (1).
+    ENTRY_BYTES = 20
+
+    def __init__(self, size_mb: float = 16):
+        """
+        Fixed-size hash table used by search agents to store the results of positions they have already searched.
+
+        Entries are looked up by a board's Zobrist hash. Each bucket holds two entries: one that is only replaced by a
+        search of at least the same depth, and one that is always replaced. This keeps the most expensive results
+        whilst still storing the most recent ones.
+
+        :param size_mb: The memory, in megabytes, that the table may use.
+        """
+        if not isinstance(size_mb, (int, float)):
+            raise TypeError("size_mb must be a number.")
+        if size_mb <= 0:
+            raise ValueError("size_mb must be larger than 0.")
+
+        self.__num_buckets: int = max(1, int(size_mb * (1024 ** 2)) // (2 * self.ENTRY_BYTES))
+
+        self._keys: np.ndarray = np.zeros((self.__num_buckets, 2), dtype=np.uint64)
+        self._values: np.ndarray = np.zeros((self.__num_buckets, 2))
+        # Depths are stored plus one, so that 0 marks an empty slot.
+        self._depths: np.ndarray = np.zeros((self.__num_buckets, 2), dtype=np.int16)
+        self._flags: np.ndarray = np.zeros((self.__num_buckets, 2), dtype=np.int8)
+        self._moves: np.ndarray = np.zeros((self.__num_buckets, 2), dtype=np.int8)
+
+    @property
+    def num_buckets(self) -> int:
+        return self.__num_buckets
+
+    def lookup(self, key: int) -> tuple[float, int, int, int] or None:
+        """
+        Finds the entry stored for a position.
+
+        :param key: Integer Zobrist hash of the position.
+        :return: Tuple of the stored value, search depth, bound type and best move, or None if the position isn't
+            stored.
+        """
+        bucket = key % self.__num_buckets
+        for slot in (0, 1):
+            if self._depths[bucket, slot] and self._keys[bucket, slot] == key:
+                return (float(self._values[bucket, slot]), int(self._depths[bucket, slot]) - 1,
+                        int(self._flags[bucket, slot]), int(self._moves[bucket, slot]))
+        return None
+
+    def _write(self, bucket: int, slot: int, key: int, depth: int, value: float, flag: int, move: int):
+        self._keys[bucket, slot] = key
+        self._values[bucket, slot] = value
+        self._depths[bucket, slot] = depth + 1
+        self._flags[bucket, slot] = flag
+        self._moves[bucket, slot] = move
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: int):
+        """
+        Stores the result of searching a position, replacing an older entry if the bucket is full.
+
+        :param key: Integer Zobrist hash of the position.
+        :param depth: The number of moves the position was searched to.
+        :param value: The score found for the position.
+        :param flag: The bound type of the value, being one of EXACT, LOWER or UPPER.
+        :param move: The best move found for the position, or -1 if there is none.
+        """
+        bucket = key % self.__num_buckets
+        stored_depth = self._depths[bucket, 0] - 1
+        if self._keys[bucket, 0] == key or depth >= stored_depth:
+            if self._depths[bucket, 0] and self._keys[bucket, 0] != key:
+                # Move the replaced entry down to the always-replace slot, rather than losing it entirely.
+                self._write(bucket, 1, int(self._keys[bucket, 0]), int(stored_depth), float(self._values[bucket, 0]),
+                            int(self._flags[bucket, 0]), int(self._moves[bucket, 0]))
+            self._write(bucket, 0, key, depth, value, flag, move)
+        else:
+            self._write(bucket, 1, key, depth, value, flag, move)
+
+    def clear(self):
+        """
+        Removes every entry from the table.
+        """
+        self._depths[:] = 0
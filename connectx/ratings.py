@@ -0,0 +1,112 @@
+import math
+
+import numpy as np
+
+
+# Number of Elo points per unit of the logistic scale used by the Bradley-Terry model.
+ELO_SCALE = 400 / math.log(10)
+
+
+def expected_score(elo_diff: float) -> float:
+    """
+    Expected score of a player against an opponent, counting a draw as half a win.
+
+    :param elo_diff: The player's Elo rating less their opponent's.
+    :return: Float value between 0 and 1 for the expected score.
+    """
+    return 1 / (1 + (10 ** (-elo_diff / 400)))
+
+
+def fit_ratings(scores: np.ndarray, games: np.ndarray, prior: float = 400, z: float = 1.96,
+                tolerance: float = 1e-9, max_iterations: int = 100) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fits Elo ratings to the results of games between players, using a Bradley-Terry model.
+
+    The ratings maximise the likelihood of the results, with a draw counting as half a win and half a loss. A normal
+    prior, centred on 0, keeps the ratings of players that have won or lost every game finite. The confidence intervals
+    come from the curvature of the likelihood at the fitted ratings.
+
+    :param scores: Square array where scores[i, j] is the score of player i against player j, being their number of
+        wins plus half their number of draws.
+    :param games: Symmetric square array where games[i, j] is the number of games played between players i and j.
+    :param prior: The standard deviation, in Elo, of the prior on the ratings.
+    :param z: The number of standard errors either side of a rating that its confidence interval covers, with 1.96
+        giving a 95% interval.
+    :param tolerance: The change in the ratings, on the logistic scale, small enough to stop fitting at.
+    :param max_iterations: The number of Newton steps after which to stop fitting.
+    :return: Tuple of an array of each player's Elo rating, with a mean of 0, and an array of the half-width of each
+        rating's confidence interval.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    games = np.asarray(games, dtype=np.float64)
+    if scores.ndim != 2 or scores.shape[0] != scores.shape[1] or scores.shape != games.shape:
+        raise ValueError("scores and games must be square arrays of the same shape.")
+    if not np.allclose(games, games.T):
+        raise ValueError("games must be symmetric.")
+
+    num_players = scores.shape[0]
+    precision = (ELO_SCALE / prior) ** 2
+
+    def log_likelihood_derivatives(strengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        win_probs = 1 / (1 + np.exp(strengths[None, :] - strengths[:, None]))
+        gradient = (scores - (games * win_probs)).sum(axis=1) - (precision * strengths)
+        weights = games * win_probs * (1 - win_probs)
+        hessian = weights - np.diag(weights.sum(axis=1)) - (precision * np.eye(num_players))
+        return gradient, hessian
+
+    # Newton's method, on the logistic scale, which converges quickly as the log-likelihood is concave.
+    strengths = np.zeros(num_players)
+    for _ in range(max_iterations):
+        gradient, hessian = log_likelihood_derivatives(strengths)
+        step = np.linalg.solve(hessian, -gradient)
+        strengths += step
+        if np.abs(step).max() < tolerance:
+            break
+
+    # Only differences in rating are meaningful, so the uncertainty is that of the ratings relative to their mean.
+    gradient, hessian = log_likelihood_derivatives(strengths)
+    centring = np.eye(num_players) - (1 / num_players)
+    covariance = centring @ np.linalg.inv(-hessian) @ centring
+    errors = np.sqrt(np.clip(np.diag(covariance), 0, None))
+    ratings = (strengths - strengths.mean()) * ELO_SCALE
+    return ratings, z * errors * ELO_SCALE
+
+
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    """
+    Bounds of the log-likelihood ratio at which a sequential probability ratio test stops.
+
+    :param alpha: The probability of accepting the alternative hypothesis when the null hypothesis is true.
+    :param beta: The probability of accepting the null hypothesis when the alternative hypothesis is true.
+    :return: Tuple of the lower bound, below which the null hypothesis is accepted, and the upper bound, above which
+        the alternative hypothesis is accepted.
+    """
+    if not 0 < alpha < 1 or not 0 < beta < 1:
+        raise ValueError("alpha and beta must be between 0 and 1.")
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """
+    Log-likelihood ratio of a player being elo1 rather than elo0 stronger than their opponent, given their results.
+
+    The ratio is the generalised SPRT's normal approximation, which compares the player's mean score per game against
+    the expected scores of the two hypotheses, scaled by the variance of their scores. One game of each result is added
+    when estimating the variance, so that it isn't zero before the player has had different results.
+
+    :param wins: Integer number of games the player won.
+    :param draws: Integer number of games the player drew.
+    :param losses: Integer number of games the player lost.
+    :param elo0: The Elo difference of the null hypothesis.
+    :param elo1: The Elo difference of the alternative hypothesis.
+    :return: Float value for the log-likelihood ratio.
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0
+    score = (wins + (draws / 2)) / games
+    variance = (((wins + 1) + ((draws + 1) / 4)) / (games + 3)) - (((wins + 1) + ((draws + 1) / 2)) / (games + 3)) ** 2
+
+    score0 = expected_score(elo0)
+    score1 = expected_score(elo1)
+    return games * (score1 - score0) * ((2 * score) - score0 - score1) / (2 * variance)
@@ -0,0 +1,267 @@
+import copy
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from connectx.game.board import Board
+from connectx.game.game import Game
+from connectx.players.agents.agents import AlphaBetaAgent, LookAheadAgent, MCTSAgent, MinimumAgent, RandomAgent, \
+    RLAgent, SolverAgent, _look_ahead_worker
+
+
+@pytest.fixture
+def first_of_ties(monkeypatch):
+    # Agents break ties at random, so the first of the tied actions is always chosen to compare them with each other.
+    monkeypatch.setattr(random, "choice", lambda seq: seq[0])
+    monkeypatch.setattr(np.random, "random", lambda size: np.zeros(size))
+
+
+def _random_positions(seed: int, num_positions: int, max_moves: int) -> list[Board]:
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        board = Board(track_lines=True)
+        for _ in range(rng.randrange(max_moves)):
+            board.play(int(rng.choice(np.flatnonzero(board.legal_moves()))))
+            if board.last_move_wins():
+                break
+        else:
+            positions.append(board)
+    return positions
+
+
+def _rewards(board: Board, player: int) -> float:
+    # The look-ahead heuristic, from counts of lines of each length.
+    win_condition = board.win_condition
+    reward = sum(board.check_for_lines(player, i) * (i ** 3) for i in range(2, win_condition))
+    return reward + (board.check_for_lines(player, win_condition) * (win_condition ** 10))
+
+
+def _copying_look_ahead(agent: LookAheadAgent, board: Board, steps: int) -> np.ndarray:
+    # The look-ahead as it was first written, copying the board for every action tried, rather than undoing moves.
+    leaf_rewards = {}
+
+    def try_action(action, player, parent):
+        child = copy.deepcopy(parent)
+        if child.check_col_full(action):
+            return -(10 ** 100), child
+        child.update_board(action, player)
+        return _rewards(child, player), child
+
+    def look_ahead(parent, index, parent_reward, step):
+        if step == steps:
+            leaf_rewards[index] = parent_reward
+            return
+        for action in range(parent.cols):
+            reward, child = try_action(action, agent.player_num, parent)
+            step_reward = parent_reward + (reward * (1 - (step / (10 + steps))))
+            if step < steps - 1:
+                opp_rewards = [try_action(i, agent.opp_player_num, child)[0] for i in range(child.cols)]
+                opp_action = int(np.argmax(opp_rewards))
+                if not child.check_col_full(opp_action):
+                    child.update_board(opp_action, agent.opp_player_num)
+                step_reward -= max(opp_rewards) * 1.5
+            look_ahead(child, (index * parent.cols) + action, step_reward, step + 1)
+
+    look_ahead(board, 0, 0, 0)
+    return np.array([leaf_rewards[i] for i in range(board.cols ** steps)])
+
+
+def _minimax(agent: AlphaBetaAgent, board: Board, depth: int, player: int) -> float:
+    # The alpha-beta search's score, found by searching every move without pruning.
+    if board.last_move_wins():
+        return -agent.WIN_SCORE * (board.max_moves - board.num_moves + 1)
+    if board.num_moves == board.max_moves:
+        return 0
+    if depth == 0:
+        return _rewards(board, player) - _rewards(board, 3 - player)
+    best = None
+    for col in np.flatnonzero(board.legal_moves()):
+        board.play(int(col), player)
+        score = -_minimax(agent, board, depth - 1, 3 - player)
+        board.undo()
+        best = score if best is None else max(best, score)
+    return best
+
+
+@pytest.mark.parametrize("steps", [1, 2, 3])
+def test_look_ahead_matches_copying_look_ahead(steps, first_of_ties):
+    for board in _random_positions(steps, 8, 20):
+        agent = LookAheadAgent(board.player_to_move, board, False, steps)
+        moves = board.moves
+        expected = _copying_look_ahead(agent, board, steps)
+        assert (agent._look_ahead_N_steps().ravel() == expected).all()
+        # The board is left as it was found.
+        assert board.moves == moves
+
+        grid = board.board_array().reshape(1, board.rows, board.cols)
+        assert (agent._batch_look_ahead(grid)[0] == expected).all()
+
+
+def test_look_ahead_rows_follow_first_action(first_of_ties):
+    board = Board()
+    for col in (0, 6, 1, 6, 2):
+        board.play(col)
+    agent = LookAheadAgent(1, board, False, steps=3)
+    all_actions = agent._look_ahead_N_steps()
+    # Row i holds the rewards of every sequence of actions starting with action i.
+    assert all_actions.shape == (7, 49)
+    # Winning straight away along the bottom row gives the largest reward.
+    assert np.unravel_index(all_actions.argmax(), all_actions.shape)[0] == 3
+    assert agent._choose_optimal_action(all_actions)[0] == 3
+
+
+def test_act_batch_matches_perform_turn(first_of_ties):
+    positions = _random_positions(7, 20, 30)
+    # The agent plays the player to move on every board, so all of the boards have the same player to move.
+    positions = [board for board in positions if board.player_to_move == 1]
+    grids = np.stack([board.board_array().reshape(board.rows, board.cols) for board in positions])
+
+    for agent_type, kwargs in ((MinimumAgent, {}), (LookAheadAgent, {'steps': 2}),
+                               (AlphaBetaAgent, {'steps': 1, 'use_book': False})):
+        agent = agent_type(1, Board(), False, **kwargs)
+        expected = []
+        for board in positions:
+            agent.board = board
+            expected.append(agent.perform_turn())
+        assert agent.act_batch(grids).tolist() == expected
+
+
+def test_random_act_batch_is_legal():
+    np.random.seed(0)
+    grids = np.zeros((500, 6, 7), dtype=np.int8)
+    grids[:, :, [1, 4]] = 1
+    actions = RandomAgent(1, Board(), False).act_batch(grids)
+    # Every column that isn't full is chosen.
+    assert sorted(set(actions.tolist())) == [0, 2, 3, 5, 6]
+
+
+@pytest.mark.parametrize("tt_size_mb", [None, 1])
+def test_alpha_beta_matches_minimax(tt_size_mb):
+    for board in _random_positions(tt_size_mb or 0, 6, 20):
+        player = board.player_to_move
+        agent = AlphaBetaAgent(player, board, False, steps=2, tt_size_mb=tt_size_mb, use_book=False)
+        _, score = agent._search(3)
+        best = None
+        for col in np.flatnonzero(board.legal_moves()):
+            board.play(int(col), player)
+            score_of_col = -_minimax(agent, board, 2, 3 - player)
+            board.undo()
+            best = score_of_col if best is None else max(best, score_of_col)
+        assert score == best
+
+
+def test_alpha_beta_wins_and_blocks():
+    board = Board()
+    for col in (0, 6, 1, 6, 2):
+        board.play(col)
+    # Player 2 must block the line along the bottom row.
+    assert AlphaBetaAgent(2, board, False, steps=2, use_book=False).perform_turn() == 3
+    board.play(5)
+    assert AlphaBetaAgent(1, board, False, steps=2, use_book=False).perform_turn() == 3
+
+
+@pytest.mark.parametrize("agent_type, kwargs", [(LookAheadAgent, {}), (AlphaBetaAgent, {'use_book': False})])
+def test_time_budget_is_kept(agent_type, kwargs):
+    board = Board()
+    for col in (3, 3, 2):
+        board.play(col)
+    moves = board.moves
+    start = time.perf_counter()
+    action = agent_type(2, board, False, time_budget=0.2, **kwargs).perform_turn()
+    assert time.perf_counter() - start < 1.5
+    # The moves of the abandoned search are taken back off the board.
+    assert board.moves == moves and board.legal_moves()[action]
+
+    board = Board()
+    for col in (0, 6, 1, 6, 2):
+        board.play(col)
+    # Player 2 must block the line along the bottom row, however deep the search got.
+    assert agent_type(2, board, False, time_budget=0.2, **kwargs).perform_turn() == 3
+
+
+def test_solver_agent_keeps_to_time_budget():
+    board = Board()
+    agent = SolverAgent(1, board, False, tt_size_mb=1, use_book=False, time_budget=0.5)
+    start = time.perf_counter()
+    action = agent.perform_turn()
+    # The empty board can't be solved in time, so the alpha-beta search chooses the move instead.
+    assert time.perf_counter() - start < 2
+    assert board.legal_moves()[action] and board.num_moves == 0
+
+    small = Board(4, 4, 3)
+    small.play(0)
+    agent = SolverAgent(2, small, False, tt_size_mb=1, use_book=False, time_budget=None)
+    assert agent.perform_turn() == agent._solver.best_move(small, 2)[0]
+
+    # The plain solve agents solve every move, however long it takes, and only those given a time budget fall back.
+    game = Game(verbose=False, player1='solve', player2='solve-weak@500ms')
+    assert game.player(1).time_budget is None and game.player(1)._fallback is None
+    assert game.player(2).time_budget == 0.5 and game.player(2).weak
+
+
+@pytest.mark.parametrize("steps", [1, 3])
+def test_look_ahead_worker_matches_look_ahead(steps, first_of_ties):
+    # Each worker looks ahead from one of the agent's actions, which must give that action's row of the look-ahead.
+    for board in _random_positions(steps + 10, 4, 20):
+        agent = LookAheadAgent(board.player_to_move, board, False, steps)
+        expected = agent._look_ahead_N_steps()
+        for action in range(board.cols):
+            assert (_look_ahead_worker(agent._worker_spec(), action, steps, None) == expected[action]).all()
+
+
+def test_parallel_search_matches_search():
+    positions = [board for board in _random_positions(11, 8, 20) if board.player_to_move == 1]
+    serial = AlphaBetaAgent(1, Board(), False, steps=2, use_book=False)
+    parallel = AlphaBetaAgent(1, Board(), False, steps=2, use_book=False, workers=2)
+    try:
+        for board in positions:
+            serial.board = parallel.board = board
+            assert parallel._search(3)[1] == serial._search(3)[1]
+    finally:
+        parallel.close()
+
+    board = Board()
+    for col in (0, 6, 1, 6, 2, 5):
+        board.play(col)
+    agent = MCTSAgent(1, board, False, playouts=500, workers=2)
+    try:
+        assert agent.perform_turn() == 3
+    finally:
+        agent.close()
+    with pytest.raises(ValueError):
+        LookAheadAgent(1, board, False, workers=0)
+
+
+def test_rl_agents_need_a_model_type():
+    # Only the subclasses know how to load their type of model.
+    with pytest.raises(TypeError):
+        RLAgent(1, Board(), False, 'connectx/models/PPO_6-7-4_v0.1/PPO_6-7-4_v0.1_50000')
+
+
+class _LeftmostAgent(RLAgent):
+    # An agent whose model always prefers the columns furthest to the left.
+    @staticmethod
+    def _load_model(filepath: str):
+        return SimpleNamespace(observation_space=SimpleNamespace(shape=(49,), dtype=np.float32))
+
+    def _predict_action_proba(self, observations: np.ndarray) -> np.ndarray:
+        assert observations.shape[1:] == (49,) and observations.dtype == np.float32
+        return np.tile(np.linspace(0.25, 0.01, 7), (len(observations), 1))
+
+
+def test_rl_agents_only_choose_legal_actions():
+    board = Board()
+    agent = _LeftmostAgent(1, board, False, '')
+    assert agent.perform_turn() == 0
+    for _ in range(6):
+        board.play(0)
+    # The model's favourite column is full, so its next favourite is chosen.
+    assert agent.perform_turn() == 1
+
+    grids = np.zeros((2, 6, 7), dtype=np.int8)
+    grids[1, :, 0] = (1, 2, 1, 2, 1, 2)
+    assert agent.act_batch(grids).tolist() == [0, 1]
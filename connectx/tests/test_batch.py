@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+from connectx.game import batch
+from connectx.game.board import Board
+
+
+SIZES = [(6, 7, 4), (5, 9, 3), (10, 4, 4), (4, 4, 3)]
+
+
+def _random_boards(rng: random.Random, rows: int, cols: int, win_condition: int, num_boards: int = 60) -> list[Board]:
+    boards = []
+    for _ in range(num_boards):
+        board = Board(rows, cols, win_condition)
+        for _ in range(rng.randrange((rows * cols) + 1)):
+            board.update_board(int(rng.choice(np.flatnonzero(board.legal_moves()))), rng.choice((1, 2)))
+        boards.append(board)
+    return boards
+
+
+def _grids(boards: list[Board]) -> np.ndarray:
+    return np.stack([board.board_array().reshape(board.rows, board.cols) for board in boards])
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_line_counts_match_board(rows, cols, win_condition):
+    boards = _random_boards(random.Random(rows * cols), rows, cols, win_condition)
+    grids = _grids(boards)
+    for player in (1, 2):
+        histograms = batch.line_histogram(grids, player, win_condition)
+        for line_len in range(1, win_condition + 1):
+            expected = [board.check_for_lines(player, line_len) for board in boards]
+            assert batch.count_lines(grids, player, line_len).tolist() == expected
+        assert histograms.tolist() == [board.line_histogram((player,))[player] for board in boards]
+        expected_wins = [board.check_for_lines(player, win_condition) > 0 for board in boards]
+        assert batch.wins(grids, player, win_condition).tolist() == expected_wins
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_drop_matches_board(rows, cols, win_condition):
+    rng = random.Random(rows + cols)
+    num_boards = 20
+    boards = [Board(rows, cols, win_condition) for _ in range(num_boards)]
+    grids, heights = batch.new_grids(num_boards, rows, cols)
+    assert grids.shape == (num_boards, rows, cols) and not grids.any()
+    assert heights.shape == (num_boards, cols) and not heights.any()
+
+    for turn in range(rows * cols):
+        player = (turn % 2) + 1
+        # Only some of the boards are played on each turn.
+        indices = np.array([i for i in range(num_boards) if rng.random() < 0.7 and boards[i].legal_moves().any()])
+        if not len(indices):
+            continue
+        actions = np.array([rng.choice(np.flatnonzero(boards[i].legal_moves())) for i in indices])
+        batch.drop(grids, heights, indices, actions, player)
+        for i, action in zip(indices, actions):
+            boards[i].update_board(int(action), player)
+        assert (grids == _grids(boards)).all()
+        assert (heights == np.stack([board.col_counters() for board in boards])).all()
+
+
+def test_planes_match_board():
+    boards = _random_boards(random.Random(5), 6, 7, 4)
+    grids = _grids(boards)
+    heights = np.stack([board.col_counters() for board in boards])
+    for player in (1, 2):
+        planes = batch.planes(grids, heights, player)
+        assert planes.shape == (len(boards), 4, 6, 7)
+        for board, board_planes in zip(boards, planes):
+            grid = board.board_array().reshape(6, 7)
+            assert (board_planes[0] == (grid == player)).all()
+            assert (board_planes[1] == (grid == 3 - player)).all()
+            for col in range(7):
+                landing = np.flatnonzero(board_planes[2][:, col])
+                if board.check_col_full(col):
+                    assert not len(landing)
+                else:
+                    assert landing.tolist() == [5 - board.get_col_counter(col)]
+            assert (board_planes[3] == (player == 1)).all()
+
+        out = np.empty((len(boards), 4, 6, 7), dtype=np.float32)
+        assert batch.planes(grids, heights, player, out) is out
+        assert (out == planes).all()
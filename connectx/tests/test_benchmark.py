@@ -0,0 +1,14 @@
+from connectx.benchmark import playShard
+
+
+def test_shards_are_reproducible():
+    outcomes = playShard('rand', 'rand', 1, 20, 6, 7, 4, seed=5)
+    assert sum(outcomes.values()) == 20
+    # Each shard's games are decided by its seed alone, whichever process plays it.
+    assert playShard('rand', 'rand', 1, 20, 6, 7, 4, seed=5) == outcomes
+
+
+def test_outcomes_are_from_the_agents_side():
+    for agentPlayer in (1, 2):
+        assert playShard('look2', 'rand', agentPlayer, 10, 6, 7, 4, seed=0)['win'] >= 8
+        assert playShard('rand', 'look2', agentPlayer, 10, 6, 7, 4, seed=0)['loss'] >= 8
@@ -0,0 +1,256 @@
+import copy
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from connectx.game.board import Board
+from connectx.game.game import Game
+
+
+# Board sizes, as (rows, cols, win_condition), that the board is checked on.
+SIZES = [(6, 7, 4), (5, 9, 3), (10, 4, 4), (8, 8, 5), (1, 5, 2), (4, 4, 3)]
+
+
+def _play(board: Board, columns: list[int]) -> Board:
+    for column in columns:
+        board.update_board(column, board.player_to_move)
+    return board
+
+
+def _random_board(rng: random.Random, rows: int, cols: int, win_condition: int) -> Board:
+    # Counters are dropped in random columns, by random players, so the board may hold any number of lines.
+    board = Board(rows, cols, win_condition)
+    for _ in range(rng.randrange((rows * cols) + 1)):
+        column = rng.choice(np.flatnonzero(board.legal_moves()))
+        board.update_board(int(column), rng.choice((1, 2)))
+    return board
+
+
+def _scan_lines(grid: np.ndarray, player: int, line_len: int) -> int:
+    # Walks every line of the player's counters on a grid one position at a time, counting those at least line_len long.
+    rows, cols = grid.shape
+    num_lines = 0
+    for row_step, col_step in ((1, 0), (0, 1), (1, 1), (1, -1)):
+        for row in range(rows):
+            for col in range(cols):
+                if grid[row, col] != player:
+                    continue
+                prev_row, prev_col = row - row_step, col - col_step
+                if 0 <= prev_row < rows and 0 <= prev_col < cols and grid[prev_row, prev_col] == player:
+                    # Not the start of a line.
+                    continue
+                length = 0
+                while 0 <= row + (length * row_step) < rows and 0 <= col + (length * col_step) < cols \
+                        and grid[row + (length * row_step), col + (length * col_step)] == player:
+                    length += 1
+                if length >= line_len:
+                    num_lines += 1
+    return num_lines
+
+
+def _grid(board: Board) -> np.ndarray:
+    return board.board_array().reshape(board.rows, board.cols)
+
+
+def _state(board: Board) -> tuple:
+    return (board.get_bitboard(1), board.get_bitboard(2), board.hash_key, board.canonical_key(),
+            board.get_observation().tobytes(), board.line_histogram(), board.moves)
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_line_counts_match_scan(rows, cols, win_condition):
+    rng = random.Random(rows * cols * win_condition)
+    for _ in range(40):
+        board = _random_board(rng, rows, cols, win_condition)
+        grid = _grid(board)
+        for player in (1, 2):
+            for line_len in range(1, win_condition + 1):
+                assert board.check_for_lines(player, line_len) == _scan_lines(grid, player, line_len)
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_line_histogram_matches_scan(rows, cols, win_condition):
+    rng = random.Random(rows + (cols * win_condition))
+    for _ in range(40):
+        board = _random_board(rng, rows, cols, win_condition)
+        grid = _grid(board)
+        histogram = board.line_histogram()
+        for player in (1, 2):
+            assert histogram[player][0] == 0
+            assert histogram[player][1:] == [_scan_lines(grid, player, line_len)
+                                             for line_len in range(1, win_condition + 1)]
+        assert board.line_histogram((2,)) == {2: histogram[2]}
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_tracked_line_counts_match_histogram(rows, cols, win_condition):
+    rng = random.Random(rows * (cols + win_condition))
+    for _ in range(40):
+        board = _random_board(rng, rows, cols, win_condition)
+        # The counts kept up to date move by move must match those counted from scratch after every move.
+        tracked = Board(rows, cols, win_condition, track_lines=True)
+        untracked = Board(rows, cols, win_condition)
+        for column, player in board.moves:
+            tracked.update_board(column, player)
+            untracked.update_board(column, player)
+            assert tracked.line_histogram() == untracked.line_histogram()
+
+
+def test_long_line_counts_match_scan():
+    # Lines are matched in steps of doubling length, so lengths that aren't powers of 2 overlap their last step.
+    rng = random.Random(9)
+    for _ in range(40):
+        board = _random_board(rng, 8, 8, 5)
+        grid = _grid(board)
+        for line_len in range(6, 10):
+            assert board.check_for_lines(1, line_len) == _scan_lines(grid, 1, line_len)
+    assert board.check_for_lines(1) == _scan_lines(grid, 1, 5)
+
+    board = Board(8, 8, 5)
+    for column in range(8):
+        board.update_board(column, 1)
+    assert [board.check_for_lines(1, line_len) for line_len in (7, 8, 9)] == [1, 1, 0]
+
+
+def test_every_diagonal_is_counted():
+    # A right-to-left diagonal starting in the top row, left of column (cols - line_len), which the old scanners missed.
+    board = Board()
+    board.set_board_element(1, 1)
+    board.set_board_element(7, 1)
+    assert board.check_for_lines(1, 2) == 1
+    assert board.line_histogram((1,))[1][2] == 1
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_last_move_wins_matches_scan(rows, cols, win_condition):
+    rng = random.Random(rows - cols + win_condition)
+    for _ in range(30):
+        board = Board(rows, cols, win_condition)
+        while board.num_moves < board.max_moves:
+            player = board.player_to_move
+            board.play(int(rng.choice(np.flatnonzero(board.legal_moves()))))
+            won = _scan_lines(_grid(board), player, win_condition) > 0
+            assert board.last_move_wins() == won
+            if won:
+                break
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", SIZES)
+def test_undo_restores_board(rows, cols, win_condition):
+    rng = random.Random(rows + cols + win_condition)
+    board = Board(rows, cols, win_condition, track_lines=True)
+    states = [_state(board)]
+    for _ in range(rows * cols):
+        board.play(int(rng.choice(np.flatnonzero(board.legal_moves()))))
+        states.append(_state(board))
+
+    for state in reversed(states[:-1]):
+        board.undo()
+        assert _state(board) == state
+    with pytest.raises(IndexError):
+        board.undo()
+    assert _play(board, [0]).undo() == 0
+
+
+def test_hash_is_independent_of_move_order():
+    assert _play(Board(), [0, 1, 2, 3]).hash_key == _play(Board(), [2, 3, 0, 1]).hash_key
+    assert _play(Board(), [0, 1]).hash_key != _play(Board(), [1, 0]).hash_key
+    board = Board()
+    board.update_board(3, 2)
+    assert board.hash_key != _play(Board(), [3]).hash_key != Board().hash_key
+
+
+def test_mirror_images_share_canonical_key():
+    rng = random.Random(4)
+    for _ in range(50):
+        board = _random_board(rng, 6, 7, 4)
+        mirrored = Board()
+        for column, player in board.moves:
+            mirrored.update_board(board.cols - 1 - column, player)
+
+        key, is_mirror = board.canonical_key()
+        assert mirrored.canonical_key()[0] == key == min(board.hash_key, mirrored.hash_key)
+        if board.hash_key != mirrored.hash_key:
+            assert is_mirror == (key == mirrored.hash_key)
+            assert mirrored.canonical_key()[1] != is_mirror
+
+
+def test_legal_moves():
+    board = _play(Board(2, 3, 2), [0, 0, 2])
+    assert board.legal_moves().tolist() == [False, True, True]
+    assert board.legal_moves().tolist() == [not board.check_col_full(column) for column in range(3)]
+
+
+def test_loaded_grid_matches_played_board():
+    rng = random.Random(3)
+    for _ in range(50):
+        board = _random_board(rng, 6, 7, 4)
+        loaded = Board()
+        loaded.load_grid(_grid(board))
+        assert loaded.hash_key == board.hash_key
+        assert (loaded.get_observation() == board.get_observation()).all()
+        assert loaded.line_histogram() == board.line_histogram()
+
+    board = Board(2, 3, 2)
+    with pytest.raises(ValueError):
+        board.load_grid(np.zeros((3, 3)))
+    floating = np.zeros((2, 3), dtype=np.int8)
+    floating[0, 1] = 1
+    with pytest.raises(ValueError):
+        board.load_grid(floating)
+
+
+def test_observation_follows_board():
+    board = Board(2, 3, 2)
+    observation = board.get_observation()
+    assert not observation.flags.writeable
+
+    # The observation is a view that changes as the board does, without a new array being built.
+    _play(board, [1, 1, 2])
+    assert board.get_observation() is observation
+    assert observation.tolist() == [0, 2, 0, 0, 1, 1, 0, 2, 1]
+    assert board.board_array().tolist() == observation[:6].tolist()
+    assert board.col_counters().tolist() == [0, 2, 1]
+    board.undo()
+    assert observation.tolist() == [0, 2, 0, 0, 1, 0, 0, 2, 0]
+    board.reset_board()
+    assert not observation.any()
+
+
+@pytest.mark.parametrize("obs_dtype", [np.int8, np.float32, np.float64])
+def test_observation_dtype(obs_dtype):
+    board = _play(Board(obs_dtype=obs_dtype), [3, 3, 2])
+    assert board.get_observation().dtype == obs_dtype
+    assert (board.get_observation() == _play(Board(), [3, 3, 2]).get_observation()).all()
+    assert Board().get_observation().dtype == np.int8
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, lambda board: pickle.loads(pickle.dumps(board))])
+def test_copied_board_has_its_own_observation(clone):
+    board = _play(Board(track_lines=True), [3, 3, 2])
+    copied = clone(board)
+
+    assert copied.moves == board.moves
+    assert copied.hash_key == board.hash_key
+    assert (copied.get_observation() == board.get_observation()).all()
+    assert not copied.get_observation().flags.writeable
+
+    # The copy's views must follow the copy's moves, and leave the original untouched.
+    copied.update_board(0, 1)
+    assert copied.board_array()[35] == 1 and copied.col_counters()[0] == 1
+    assert board.board_array()[35] == 0 and board.col_counters()[0] == 0
+    copied.undo()
+    assert (copied.get_observation() == board.get_observation()).all()
+
+
+def test_game_and_agents_can_be_copied():
+    game = Game(verbose=False, player1='look2', player2='ab2')
+    _play(game.board, [3, 4])
+
+    copied = pickle.loads(pickle.dumps(game))
+    assert copied.board.moves == game.board.moves
+    # The agents still share the copied game's board.
+    assert copied.player(1).board is copied.board
+    assert copy.deepcopy(game).player(2).board is not game.board
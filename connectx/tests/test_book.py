@@ -0,0 +1,93 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+import connectx
+from connectx.game.board import Board
+from connectx.players.agents.book import OpeningBook
+from connectx.players.agents.solver import Solver
+
+
+def _positions(board: Board, depth: int):
+    # Every position, that isn't over, reachable within depth moves.
+    yield board
+    if board.num_moves < depth:
+        for col in np.flatnonzero(board.legal_moves()):
+            board.play(int(col))
+            if not board.last_move_wins():
+                yield from _positions(board, depth)
+            board.undo()
+
+
+@pytest.fixture(scope="module")
+def book_path(tmp_path_factory) -> str:
+    filepath = str(tmp_path_factory.mktemp("books") / "4-5-3.book")
+    OpeningBook.write(OpeningBook.build(4, 5, 3, 3), filepath)
+    return filepath
+
+
+def test_book_moves_match_solver(book_path):
+    book = OpeningBook(book_path)
+    solver = Solver(4, 5, 3, tt_size_mb=1)
+    keys = set()
+    for board in _positions(Board(4, 5, 3), 3):
+        keys.add(board.canonical_key()[0])
+        move, score = book.lookup(board)
+        assert score == solver.best_move(board, board.player_to_move)[1]
+
+        # The book's move, which is mirrored for mirror images of stored positions, must give its score.
+        board.play(move)
+        if board.last_move_wins():
+            assert score == (board.max_moves + 2 - board.num_moves) // 2
+        else:
+            assert -solver.best_move(board, board.player_to_move)[1] == score
+        board.undo()
+
+    # Positions reached in different ways, or as mirror images, are only stored once.
+    assert len(book) == len(keys)
+    board = Board(4, 5, 3)
+    for col in (0, 1, 2, 3):
+        board.play(col)
+    assert book.lookup(board) is None
+
+
+def test_min_depth_leaves_out_early_positions():
+    full = OpeningBook.build(4, 5, 3, 3)
+    partial = OpeningBook.build(4, 5, 3, 3, min_depth=2)
+
+    expected = {board.canonical_key()[0] for board in _positions(Board(4, 5, 3), 3) if board.num_moves >= 2}
+    assert set(partial['key'].tolist()) == expected
+    assert (np.sort(partial['key']) == partial['key']).all()
+    assert set(partial.tolist()) <= set(full.tolist())
+
+
+def test_time_limit_leaves_out_slow_positions():
+    full = OpeningBook.build(4, 5, 3, 3)
+    # Positions are only abandoned once the solver checks the time, so the quickest positions are still solved.
+    assert set(OpeningBook.build(4, 5, 3, 3, time_limit=0).tolist()) <= set(full.tolist())
+
+    # Without a time limit, these positions take over a minute to solve.
+    start = time.perf_counter()
+    assert len(OpeningBook.build(5, 5, 4, 1, time_limit=0.1)) == 0
+    assert time.perf_counter() - start < 5
+
+
+def test_missing_and_empty_books(tmp_path):
+    with pytest.raises(ValueError):
+        OpeningBook(str(tmp_path / "missing.book"))
+
+    filepath = str(tmp_path / "empty.book")
+    OpeningBook.write(np.zeros(0, dtype=OpeningBook.ENTRY_DTYPE), filepath)
+    book = OpeningBook(filepath)
+    assert len(book) == 0 and book.lookup(Board(4, 5, 3)) is None
+
+
+def test_books_are_found_from_any_directory(book_path, tmp_path, monkeypatch):
+    assert os.path.dirname(OpeningBook.filepath(6, 7, 4)) == os.path.join(os.path.dirname(connectx.__file__), "books")
+
+    monkeypatch.setattr(OpeningBook, "BOOKS_DIR", os.path.dirname(book_path))
+    monkeypatch.chdir(tmp_path)
+    assert len(OpeningBook.load(4, 5, 3)) > 0
+    assert OpeningBook.load(4, 4, 3) is None
@@ -0,0 +1,185 @@
+import functools
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("gym")
+
+from connectx.env.connectXEnv import ConnectXEnv
+from connectx.env.mirrorWrapper import MirrorWrapper
+from connectx.env.vecConnectXEnv import VecConnectXEnv
+
+
+def _mirror(observation: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    # The observation of the board with its columns reversed.
+    if observation.ndim == 3:
+        return observation[:, :, ::-1]
+    board = observation[:rows * cols].reshape(rows, cols)[:, ::-1]
+    return np.concatenate((board.ravel(), observation[rows * cols:][::-1]))
+
+
+@pytest.fixture
+def first_of_ties(monkeypatch):
+    # Opponents break ties at random, so the first of the tied actions is always chosen to compare environments.
+    monkeypatch.setattr(random, "choice", lambda seq: seq[0])
+    monkeypatch.setattr(np.random, "random", lambda size: np.zeros(size))
+
+
+def _compare_with_single_envs(vec, envs: list[ConnectXEnv], steps: int, seed: int) -> int:
+    # Steps the batch and the single environments with the same actions, checking that they give the same results, and
+    # returns the number of games that ended.
+    rng = np.random.default_rng(seed)
+    observations = vec.reset()
+    assert (observations == np.stack([env.reset() for env in envs])).all()
+    num_done = 0
+    for _ in range(steps):
+        masks = np.stack(vec.env_method('action_masks'))
+        assert (masks == np.stack([env.action_masks() for env in envs])).all()
+        # Full columns are chosen now and then, which ends the game.
+        actions = np.where(rng.random(len(envs)) < 0.05, rng.integers(vec.action_space.n, size=len(envs)),
+                           (rng.random(masks.shape) * masks).argmax(axis=1))
+        observations, rewards, dones, infos = vec.step(actions)
+        for i, env in enumerate(envs):
+            observation, reward, done, info = env.step(int(actions[i]))
+            assert dones[i] == done and rewards[i] == pytest.approx(reward, abs=1e-6)
+            if done:
+                # Finished environments are reset straight away, keeping the final observation of the game.
+                assert (infos[i]["terminal_observation"] == observation).all()
+                observation = env.reset()
+                num_done += 1
+            else:
+                assert "terminal_observation" not in infos[i]
+                # The info of a finished game holds the mask of either the old or the new game, depending on the
+                # vectorised environment, so only the masks of games still being played are compared.
+                assert (infos[i]["action_mask"] == info["action_mask"]).all()
+            assert (observations[i] == observation).all()
+    return num_done
+
+
+@pytest.mark.parametrize("opponent", ['min', 'look1'])
+@pytest.mark.parametrize("agentPlayer", [1, 2])
+def test_batch_matches_single_envs(opponent, agentPlayer, first_of_ties):
+    players = {'player2': opponent} if agentPlayer == 1 else {'player1': opponent}
+    vec = VecConnectXEnv(6, **players)
+    envs = [ConnectXEnv(**players) for _ in range(6)]
+    assert _compare_with_single_envs(vec, envs, 100, agentPlayer) > 10
+    vec.close()
+
+
+def test_batch_env_methods():
+    vec = VecConnectXEnv(4, player2='min')
+    vec.reset()
+    vec.step(np.array([0, 1, 2, 3]))
+    assert (np.array(vec.env_method('action_masks', indices=[1, 3])) == vec.action_masks()[[1, 3]]).all()
+    assert len(vec.env_method('action_masks')) == 4
+    assert vec.get_attr('agentNum', indices=2) == [1]
+    # Methods that act on every environment at once can't be called for each environment.
+    with pytest.raises(ValueError):
+        vec.env_method('reset')
+    with pytest.raises(ValueError):
+        VecConnectXEnv(4, player1='min', player2='min')
+
+
+def test_action_masks():
+    # The opponent always plays the first column that isn't full, so the agent fills the first column with it.
+    env = ConnectXEnv(player2='min')
+    vec = VecConnectXEnv(2, player2='min')
+    env.reset()
+    vec.reset()
+    for _ in range(3):
+        assert env.action_masks().all() and vec.action_masks().all()
+        info = env.step(0)[3]
+        infos = vec.step(np.array([0, 6]))[3]
+    assert env.action_masks().tolist() == info["action_mask"].tolist() == [False] + ([True] * 6)
+    assert vec.action_masks()[0].tolist() == infos[0]["action_mask"].tolist() == [False] + ([True] * 6)
+    assert vec.action_masks()[1].all()
+
+
+@pytest.mark.parametrize("agentPlayer", [1, 2])
+def test_planes_observations(agentPlayer):
+    players = {'player2': 'min'} if agentPlayer == 1 else {'player1': 'min'}
+    env = ConnectXEnv(obsMode='planes', **players)
+    observation = env.reset()
+    assert observation.shape == env.observation_space.shape == (4, 6, 7)
+    observation = env.step(3)[0]
+    grid = env.game.board.board_array().reshape(6, 7)
+    # The agent's counters come first, whichever player it is.
+    assert (observation[0] == (grid == agentPlayer)).all() and (observation[1] == (grid == 3 - agentPlayer)).all()
+    # The opponent has played in the first column, and the agent in the middle one.
+    assert observation[2, 5].tolist() == [0, 1, 1, 0, 1, 1, 1]
+    assert (observation[3] == (agentPlayer == 1)).all()
+
+    vec = VecConnectXEnv(4, obsMode='planes', **players)
+    envs = [ConnectXEnv(obsMode='planes', **players) for _ in range(4)]
+    assert _compare_with_single_envs(vec, envs, 60, agentPlayer) > 5
+
+
+@pytest.mark.parametrize("obsDtype", ConnectXEnv.OBS_DTYPES)
+def test_observation_dtype(obsDtype):
+    env = ConnectXEnv(player2='min', obsDtype=obsDtype)
+    assert env.observation_space.dtype == obsDtype
+    assert env.reset().dtype == env.step(3)[0].dtype == obsDtype
+
+    vec = VecConnectXEnv(2, player2='min', obsDtype=obsDtype)
+    assert vec.observation_space.dtype == obsDtype
+    assert vec.reset().dtype == vec.step(np.array([3, 3]))[0].dtype == obsDtype
+    with pytest.raises(ValueError):
+        ConnectXEnv(player2='min', obsDtype=np.int64)
+
+
+@pytest.mark.parametrize("obsDtype", ConnectXEnv.OBS_DTYPES)
+def test_shared_memory_matches_single_envs(obsDtype):
+    pytest.importorskip("stable_baselines3")
+    from connectx.env.sharedMemoryVecEnv import SharedMemoryVecEnv
+
+    envFn = functools.partial(ConnectXEnv, player2='min', obsDtype=obsDtype)
+    vec = SharedMemoryVecEnv([envFn] * 3)
+    try:
+        assert vec.observation_space.dtype == obsDtype
+        assert _compare_with_single_envs(vec, [envFn() for _ in range(3)], 60, 0) > 5
+        assert vec.get_attr('agentNum', indices=[0, 2]) == [1, 1]
+        assert vec.seed(7) == [[7], [8], [9]]
+    finally:
+        vec.close()
+    assert vec.closed
+
+
+@pytest.mark.parametrize("obsMode", ConnectXEnv.OBS_MODES)
+def test_mirrored_episodes_mirror_the_board(obsMode):
+    rng = random.Random(0)
+    # The opponent always plays the first column that isn't full, so both games go the same way.
+    mirrored = MirrorWrapper(ConnectXEnv(player2='min', obsMode=obsMode), mirror_prob=1)
+    plain = ConnectXEnv(player2='min', obsMode=obsMode)
+    for _ in range(5):
+        observation = mirrored.reset()
+        assert mirrored.mirrored
+        assert (observation == _mirror(plain.reset(), 6, 7)).all()
+
+        done = False
+        while not done:
+            masks = mirrored.action_masks()
+            assert (masks == plain.action_masks()[::-1]).all()
+            # The agent's actions are mirrored onto the real board, where the game is played.
+            action = int(rng.choice(np.flatnonzero(masks)))
+            observation, reward, done, info = mirrored.step(action)
+            expected_observation, expected_reward, expected_done, expected_info = plain.step(6 - action)
+            assert (observation == _mirror(expected_observation, 6, 7)).all()
+            assert (reward, done) == (expected_reward, expected_done)
+            assert (info["action_mask"] == expected_info["action_mask"][::-1]).all()
+
+
+def test_mirror_prob():
+    random.seed(1)
+    env = MirrorWrapper(ConnectXEnv(player2='min'))
+    num_mirrored = 0
+    for _ in range(100):
+        env.reset()
+        num_mirrored += env.mirrored
+    assert 20 < num_mirrored < 80
+
+    env = MirrorWrapper(ConnectXEnv(player2='min'), mirror_prob=0)
+    env.reset()
+    assert not env.mirrored and (env.step(0)[0] == env.env._observation()).all()
+    with pytest.raises(ValueError):
+        MirrorWrapper(ConnectXEnv(player2='min'), mirror_prob=1.5)
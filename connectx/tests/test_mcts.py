@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+import pytest
+
+from connectx.game.board import Board
+from connectx.players.agents.agents import MCTSAgent
+from connectx.players.agents.mcts import MCTS, MCTSNode
+
+
+@pytest.mark.parametrize("rows, cols, win_condition", [(6, 7, 4), (5, 9, 3), (8, 8, 5)])
+def test_wins_match_board(rows, cols, win_condition):
+    rng = random.Random(rows + cols)
+    mcts = MCTS(rows, cols, win_condition)
+    for _ in range(100):
+        board = Board(rows, cols, win_condition)
+        for _ in range(rng.randrange((rows * cols) + 1)):
+            board.update_board(int(rng.choice(np.flatnonzero(board.legal_moves()))), rng.choice((1, 2)))
+        for player in (1, 2):
+            assert mcts._wins(board.get_bitboard(player)) == (board.check_for_lines(player) > 0)
+
+
+def test_search_visits_add_up():
+    random.seed(0)
+    board = Board()
+    mcts = MCTS()
+    root = MCTSNode(None, 2)
+    masks = [0, board.get_bitboard(1), board.get_bitboard(2)]
+    heights = [0] * board.cols
+    assert mcts.search(root, masks, heights, 0, playouts=300) == 300
+    # Searching again grows the same tree.
+    assert mcts.search(root, masks, heights, 0, playouts=200) == 200
+
+    assert root.visits == 500
+    # Every playout passes through one of the root's children.
+    assert sum(child.visits for child in root.children) == 500
+    assert sorted(child.move for child in root.children) == list(range(board.cols))
+    for child in root.children:
+        assert child.player == 1 and 0 <= child.wins <= child.visits
+
+
+def test_wins_and_blocks():
+    random.seed(1)
+    board = Board()
+    for col in (0, 6, 1, 6, 2):
+        board.play(col)
+    # Player 2 must block the line along the bottom row.
+    assert MCTSAgent(2, board, False, playouts=2000).perform_turn() == 3
+    board.play(5)
+    assert MCTSAgent(1, board, False, playouts=2000).perform_turn() == 3
+
+
+def test_tree_is_reused():
+    random.seed(2)
+    board = Board()
+    agent = MCTSAgent(1, board, False, playouts=2000)
+    move = agent.perform_turn()
+    assert move == 3
+    board.play(move)
+    board.play(3)
+
+    root = agent._reuse_root()
+    assert root.parent is None and root.move == 3 and root.player == 2 and root.visits > 0
+    assert root is agent._root.child(3)
+
+
+def test_tree_is_only_reused_for_the_same_position():
+    random.seed(2)
+    board = Board()
+    agent = MCTSAgent(1, board, False, playouts=2000)
+    assert agent.perform_turn() == 3
+    # The tree holds the position after player 1 plays in columns 3 and 5, and player 2 in column 4.
+    assert agent._root.child(4).child(5) is not None
+
+    # A grid loaded with player 1 in columns 3 and 4, and player 2 in column 5, is recorded as the moves 3, 4 and 5.
+    grid = np.zeros((board.rows, board.cols), dtype=np.int8)
+    grid[-1, 3:6] = (1, 1, 2)
+    board.load_grid(grid)
+    assert [move for move, _ in board.moves] == [3, 4, 5]
+    root = agent._reuse_root()
+    assert root.visits == 0 and not root.children
+
+    # The tree is reused when the grid holds the same position as the tree.
+    grid[-1, 3:6] = (1, 2, 0)
+    board.load_grid(grid)
+    assert agent._reuse_root().visits > 0
@@ -0,0 +1,93 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from connectx.ratings import expected_score, fit_ratings, sprt_bounds, sprt_llr
+
+
+def _results(win_probs: np.ndarray, num_games: int) -> tuple[np.ndarray, np.ndarray]:
+    # The scores players would have if every pairing played num_games games, scoring exactly as expected.
+    games = np.full(win_probs.shape, float(num_games))
+    np.fill_diagonal(games, 0)
+    return win_probs * games, games
+
+
+def test_ratings_match_expected_scores():
+    elos = np.array([-150.0, 0.0, 50.0, 300.0])
+    win_probs = expected_score(elos[:, None] - elos[None, :])
+    ratings, errors = fit_ratings(*_results(win_probs, 10000), prior=10 ** 6)
+
+    assert np.allclose(ratings, elos - elos.mean(), atol=0.5)
+    assert abs(ratings.sum()) < 1e-6
+    # More games give tighter intervals.
+    _, fewer_games_errors = fit_ratings(*_results(win_probs, 100), prior=10 ** 6)
+    assert (errors < fewer_games_errors).all()
+    assert np.allclose(fewer_games_errors / errors, 10, rtol=0.01)
+
+
+def test_ratings_of_even_and_perfect_records():
+    scores = np.array([[0, 5], [5, 0]])
+    games = np.array([[0, 10], [10, 0]])
+    ratings, errors = fit_ratings(scores, games)
+    assert np.allclose(ratings, 0) and errors[0] == errors[1] > 0
+
+    # A player who has won every game is kept to a finite rating by the prior.
+    ratings, _ = fit_ratings(np.array([[0, 10], [0, 0]]), games)
+    assert np.isfinite(ratings).all()
+    assert ratings[0] > fit_ratings(np.array([[0, 9], [1, 0]]), games)[0][0] > 0
+    assert ratings[0] == pytest.approx(-ratings[1])
+    assert fit_ratings(np.array([[0, 10], [0, 0]]), games, prior=100)[0][0] < ratings[0]
+
+
+def test_results_are_validated():
+    with pytest.raises(ValueError):
+        fit_ratings(np.zeros((2, 3)), np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        fit_ratings(np.zeros((2, 2)), np.array([[0, 1], [2, 0]]))
+
+
+def test_expected_score():
+    assert expected_score(0) == 0.5
+    assert expected_score(400) == pytest.approx(10 / 11)
+    assert expected_score(-100) == pytest.approx(1 - expected_score(100))
+    assert math.isclose(expected_score(400 * math.log10(3)), 0.75)
+
+
+def test_sprt_bounds():
+    lower, upper = sprt_bounds(0.05, 0.05)
+    assert lower == pytest.approx(math.log(0.05 / 0.95)) and upper == pytest.approx(-lower)
+    assert sprt_bounds(0.05, 0.2)[0] > lower
+    for alpha, beta in ((0, 0.05), (0.05, 1)):
+        with pytest.raises(ValueError):
+            sprt_bounds(alpha, beta)
+
+
+def test_sprt_llr():
+    assert sprt_llr(0, 0, 0, 0, 50) == 0
+    # Scoring halfway between the hypotheses favours neither.
+    assert sprt_llr(50, 0, 50, -50, 50) == pytest.approx(0)
+    assert sprt_llr(60, 20, 40, 0, 50) > 0 > sprt_llr(40, 20, 60, 0, 50)
+    # The same results over more games are stronger evidence.
+    assert sprt_llr(120, 40, 80, 0, 50) > sprt_llr(60, 20, 40, 0, 50)
+    assert sprt_llr(60, 20, 40, 0, 50) == pytest.approx(-sprt_llr(40, 20, 60, -50, 0))
+
+
+@pytest.mark.parametrize("elo", [0, 100])
+def test_sprt_accepts_the_true_hypothesis(elo):
+    rng = random.Random(elo)
+    lower, upper = sprt_bounds(0.05, 0.05)
+    accepted = 0
+    for _ in range(100):
+        wins = losses = 0
+        llr = 0
+        while lower < llr < upper:
+            if rng.random() < expected_score(elo):
+                wins += 1
+            else:
+                losses += 1
+            llr = sprt_llr(wins, 0, losses, 0, 100)
+        accepted += llr >= upper
+    # Each test accepts the wrong hypothesis about 5% of the time.
+    assert accepted > 85 if elo == 100 else accepted < 15
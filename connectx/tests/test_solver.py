@@ -0,0 +1,75 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from connectx.game.board import Board
+from connectx.players.agents.solver import Solver
+
+
+def _minimax(board: Board, scores: dict) -> int:
+    # Plays out every continuation of the game, scoring positions in the same way as the solver.
+    key = (board.get_bitboard(1), board.get_bitboard(2))
+    if key not in scores:
+        best = 0 if board.num_moves == board.max_moves else None
+        for col in np.flatnonzero(board.legal_moves()):
+            board.play(int(col))
+            score = (board.max_moves + 2 - board.num_moves) // 2 if board.last_move_wins() else -_minimax(board, scores)
+            board.undo()
+            if best is None or score > best:
+                best = score
+        scores[key] = best
+    return scores[key]
+
+
+def _random_position(rng: random.Random, rows: int, cols: int, win_condition: int, min_moves: int) -> Board:
+    # A position that isn't over, with at least min_moves counters on the board.
+    while True:
+        board = Board(rows, cols, win_condition)
+        for _ in range(rng.randrange(min_moves, (rows * cols) - 1)):
+            board.play(int(rng.choice(np.flatnonzero(board.legal_moves()))))
+            if board.last_move_wins():
+                break
+        else:
+            return board
+
+
+@pytest.mark.parametrize("rows, cols, win_condition, min_moves", [(4, 4, 3, 2), (3, 5, 3, 3), (4, 4, 4, 6)])
+def test_scores_match_minimax(rows, cols, win_condition, min_moves):
+    rng = random.Random(rows * cols * win_condition)
+    solver = Solver(rows, cols, win_condition, tt_size_mb=1)
+    scores = {}
+    for _ in range(30):
+        board = _random_position(rng, rows, cols, win_condition, min_moves)
+        expected = _minimax(board, scores)
+
+        move, score = solver.best_move(board, board.player_to_move)
+        assert score == expected
+        board.play(move)
+        if not board.last_move_wins():
+            # The move found must give the score found.
+            assert -_minimax(board, scores) == expected
+        board.undo()
+
+        _, weak_score = solver.best_move(board, board.player_to_move, weak=True)
+        assert np.sign(weak_score) == np.sign(expected)
+
+
+def test_immediate_win_is_taken():
+    board = Board()
+    for col in (0, 6, 1, 6, 2, 5):
+        board.play(col)
+    # Winning straight away is found without solving the rest of the game.
+    assert Solver().best_move(board, 1) == (3, (board.max_moves + 1 - board.num_moves) // 2)
+
+
+def test_deadline_is_kept():
+    solver = Solver(tt_size_mb=1)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        solver.best_move(Board(), 1, deadline=start + 0.1)
+    assert time.perf_counter() - start < 2
+    # The deadline only applies to the search it was given for.
+    board = Board(4, 4, 3)
+    assert Solver(4, 4, 3, tt_size_mb=1).best_move(board, 1, deadline=time.perf_counter() + 60)[0] is not None
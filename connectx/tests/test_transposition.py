@@ -0,0 +1,48 @@
+import pytest
+
+from connectx.players.agents.transposition import TranspositionTable
+
+
+def test_stored_entries_are_found():
+    table = TranspositionTable(0.01)
+    assert table.lookup(12345) is None
+
+    table.store(12345, 3, 1.5, TranspositionTable.LOWER, 2)
+    assert table.lookup(12345) == (1.5, 3, TranspositionTable.LOWER, 2)
+    # Storing the same position again replaces its entry, whatever the depth.
+    table.store(12345, 1, -2.0, TranspositionTable.EXACT, -1)
+    assert table.lookup(12345) == (-2.0, 1, TranspositionTable.EXACT, -1)
+    # Keys that share a bucket with a stored position aren't mistaken for it.
+    assert table.lookup(12345 + table.num_buckets) is None
+
+    table.clear()
+    assert table.lookup(12345) is None
+
+
+def test_deeper_searches_are_kept():
+    table = TranspositionTable(0.01)
+    # Keys that all fall in the same bucket.
+    deep, shallow, newer, deepest = (7 + (i * table.num_buckets) for i in range(4))
+
+    table.store(deep, 5, 1.0, TranspositionTable.EXACT, 0)
+    table.store(shallow, 2, 2.0, TranspositionTable.EXACT, 1)
+    assert table.lookup(deep)[1] == 5 and table.lookup(shallow)[1] == 2
+
+    # Shallower searches only replace the always-replace entry.
+    table.store(newer, 0, 3.0, TranspositionTable.EXACT, 2)
+    assert table.lookup(deep)[1] == 5 and table.lookup(newer)[1] == 0
+    assert table.lookup(shallow) is None
+
+    # A search at least as deep takes the depth-preferred entry, moving the entry it replaces down.
+    table.store(deepest, 6, 4.0, TranspositionTable.UPPER, 3)
+    assert table.lookup(deepest) == (4.0, 6, TranspositionTable.UPPER, 3)
+    assert table.lookup(deep) == (1.0, 5, TranspositionTable.EXACT, 0)
+    assert table.lookup(newer) is None
+
+
+def test_size_is_validated():
+    with pytest.raises(TypeError):
+        TranspositionTable("16")
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+    assert TranspositionTable(1).num_buckets == (1024 ** 2) // (2 * TranspositionTable.ENTRY_BYTES)
@@ -0,0 +1,205 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from connectx.benchmark import playShard
+from connectx.ratings import fit_ratings
+
+
+def loadResults(filepath: str, rows: int, cols: int, winCondition: int) -> dict[tuple[str, str], dict[str, int]]:
+    """
+    Loads the results of the games already played in a tournament on the same size of board.
+
+    :param filepath: String for the filepath of the results file, which has one JSON record per line.
+    :param rows: Integer value for the number of rows on the board.
+    :param cols: Integer value for the number of columns on the board.
+    :param winCondition: Integer value for the number of counters in a row needed to win.
+    :return: Dictionary from each (player 1, player 2) pairing to player 1's total number of wins, draws and losses.
+    """
+    results = {}
+    if not os.path.exists(filepath):
+        return results
+
+    with open(filepath) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if (record["rows"], record["cols"], record["winCondition"]) != (rows, cols, winCondition):
+                continue
+            outcomes = results.setdefault((record["player1"], record["player2"]), {"win": 0, "draw": 0, "loss": 0})
+            for outcome in outcomes:
+                outcomes[outcome] += record[outcome]
+    return results
+
+
+def appendResult(filepath: str, record: dict):
+    """
+    Appends the result of a pairing's games to the results file, so that it is kept even if the tournament is stopped.
+
+    :param filepath: String for the filepath of the results file.
+    :param record: Dictionary of the pairing, the board size, and player 1's number of wins, draws and losses.
+    """
+    with open(filepath, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def scheduleGames(agents: list[str], games: int,
+                  results: dict[tuple[str, str], dict[str, int]]) -> list[tuple[str, str, int]]:
+    """
+    Finds the games still to be played, with every pair of agents playing each other in both player positions.
+
+    :param agents: List of the agent specs in the tournament.
+    :param games: Integer number of games each pair of agents plays in each player position.
+    :param results: Results of the games already played, as returned by loadResults.
+    :return: List of each (player 1, player 2) pairing with games still to be played, and the number of games.
+    """
+    schedule = []
+    for player1 in agents:
+        for player2 in agents:
+            if player1 == player2:
+                continue
+            played = sum(results.get((player1, player2), {}).values())
+            if played < games:
+                schedule.append((player1, player2, games - played))
+    return schedule
+
+
+def playPairing(player1: str, player2: str, games: int, rows: int, cols: int, winCondition: int,
+                seed: int) -> dict:
+    """
+    Plays the games of a pairing.
+
+    :param player1: String that specifies the agent playing as player 1.
+    :param player2: String that specifies the agent playing as player 2.
+    :param games: Integer number of games to play.
+    :param rows: Integer value for the number of rows on the board.
+    :param cols: Integer value for the number of columns on the board.
+    :param winCondition: Integer value for the number of counters in a row needed to win.
+    :param seed: Seed for the agents' random choices.
+    :return: Dictionary of the pairing, the board size, and player 1's number of wins, draws and losses.
+    """
+    outcomes = playShard(player1, player2, 1, games, rows, cols, winCondition, seed)
+    return {"player1": player1, "player2": player2, "rows": rows, "cols": cols, "winCondition": winCondition,
+            **outcomes}
+
+
+def rateAgents(agents: list[str],
+               results: dict[tuple[str, str], dict[str, int]]) -> list[tuple[str, float, float, int]]:
+    """
+    Rates the agents in a tournament from the results of their games against each other.
+
+    :param agents: List of the agent specs in the tournament.
+    :param results: Results of the games played, as returned by loadResults.
+    :return: List of each agent's spec, Elo rating, the half-width of its 95% confidence interval and number of games,
+        from highest rated to lowest.
+    """
+    index = {agent: i for i, agent in enumerate(agents)}
+    scores = np.zeros((len(agents), len(agents)))
+    games = np.zeros((len(agents), len(agents)))
+    for (player1, player2), outcomes in results.items():
+        if player1 not in index or player2 not in index:
+            continue
+        i, j = index[player1], index[player2]
+        played = sum(outcomes.values())
+        scores[i, j] += outcomes["win"] + (outcomes["draw"] / 2)
+        scores[j, i] += outcomes["loss"] + (outcomes["draw"] / 2)
+        games[i, j] += played
+        games[j, i] += played
+
+    ratings, errors = fit_ratings(scores, games)
+    table = [(agent, float(ratings[i]), float(errors[i]), int(games[i].sum())) for i, agent in enumerate(agents)]
+    return sorted(table, key=lambda row: row[1], reverse=True)
+
+
+def modelCheckpoints(modelName: str) -> list[str]:
+    """
+    Finds the checkpoints of a model saved during training.
+
+    :param modelName: String for the name of the model's directory, within the directory that models are saved to.
+    :return: List of the filepaths of the model's checkpoints.
+    """
+    # Only imported when checkpoints are used, as the models need stable_baselines3.
+    from connectx.players.agents.learn import Learn
+
+    checkpoints = glob.glob(os.path.join(Learn.MODELS_DIR, modelName, "*.zip"))
+    # Checkpoints are named by the number of timesteps trained for, so are sorted by it.
+    return sorted((path[:-len(".zip")] for path in checkpoints),
+                  key=lambda path: int(path.rsplit('_', 1)[-1]) if path.rsplit('_', 1)[-1].isdigit() else 0)
+
+
+if __name__ == '__main__':
+    """
+    This file is used to play a round-robin tournament between agents, and rate them from its results.
+    Every pair of agents plays each other in both player positions, with results saved as they come in, so that a
+    tournament can be stopped and carried on, or extended with more agents, without replaying any games.
+    Use command -h or --help to see available arguments.
+
+    Usage:
+    '''sh
+    python3 tournament.py rand min look3 ab4 mcts1000 -g 50 --workers 8 -m PPO_6-7-4_v0.1
+    '''
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('agents', type=str, nargs='*',
+                        help='The agents playing in the tournament.')
+    parser.add_argument('-m', '--models', type=str, nargs='*', default=[],
+                        help='Models whose saved checkpoints all play in the tournament.')
+    parser.add_argument('-g', '--games', type=int, nargs='?', default=10,
+                        help='Number of games to be played between each pair of agents in each player position.')
+    parser.add_argument('-w', '--winCondition', type=int, nargs='?', default=4,
+                        help='Specify number of counters in a row needed to win.')
+    parser.add_argument('-r', '--rows', type=int, nargs='?', default=6,
+                        help='Specify number of rows on board.')
+    parser.add_argument('-c', '--columns', type=int, nargs='?', default=7,
+                        help='Specify number of columns on board.')
+    parser.add_argument('--workers', type=int, nargs='?', default=1,
+                        help='Number of processes to play the games across.')
+    parser.add_argument('--results', type=str, nargs='?', default='tournament-results.jsonl',
+                        help='Filepath of the file that results are saved to and loaded from.')
+    parser.add_argument('--seed', type=int, nargs='?', default=None,
+                        help='Seed that the seeds of each pairing are drawn from, to repeat a tournament.')
+    args = parser.parse_args()
+
+    agents = list(args.agents)
+    for model in args.models:
+        agents += modelCheckpoints(model)
+    # Keep the first of any repeated agents.
+    agents = list(dict.fromkeys(agents))
+    if len(agents) < 2:
+        raise ValueError("A tournament needs at least 2 agents.")
+    if args.workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    results = loadResults(args.results, args.rows, args.columns, args.winCondition)
+    schedule = scheduleGames(agents, args.games, results)
+    seeds = [int(s.generate_state(1, np.uint64)[0]) for s in np.random.SeedSequence(args.seed).spawn(len(schedule))]
+
+    print(f"\n{len(agents)} agents in the tournament, with {len(schedule)} pairings left to play.\n")
+
+    def recordPairing(record: dict):
+        appendResult(args.results, record)
+        outcomes = results.setdefault((record["player1"], record["player2"]), {"win": 0, "draw": 0, "loss": 0})
+        for outcome in outcomes:
+            outcomes[outcome] += record[outcome]
+        print(f"{record['player1']} vs {record['player2']}: {record['win']} Wins, {record['draw']} Draws, "
+              f"{record['loss']} Losses")
+
+    if args.workers == 1:
+        for (player1, player2, games), seed in zip(schedule, seeds):
+            recordPairing(playPairing(player1, player2, games, args.rows, args.columns, args.winCondition, seed))
+    else:
+        with ProcessPoolExecutor(args.workers) as executor:
+            futures = [executor.submit(playPairing, player1, player2, games, args.rows, args.columns,
+                                       args.winCondition, seed)
+                       for (player1, player2, games), seed in zip(schedule, seeds)]
+            for future in as_completed(futures):
+                recordPairing(future.result())
+
+    print("\nRatings:")
+    for rank, (agent, rating, error, games) in enumerate(rateAgents(agents, results)):
+        print(f"{rank + 1:>3}. {agent:<40} {rating:>8.1f} +/- {error:<6.1f} ({games} games)")
@@ -12,6 +12,12 @@ ROWS = 6
 COLS = 7
 WIN_CONDITION = 4
 
+NUM_ENVS = 1
+BACKEND = 'dummy'
+OBS_DTYPE = 'float64'
+OBS_MODE = 'flat'
+MIRROR_PROB = 0.0
+
 
 if __name__ == '__main__':
     """
@@ -38,6 +44,19 @@ if __name__ == '__main__':
                         help='Specify number of columns on board.')
     parser.add_argument('-w', '--winCondition', type=int, nargs='?', default=WIN_CONDITION,
                         help='Specify number of counters in a row needed to win.')
+    parser.add_argument('-n', '--numEnvs', type=int, nargs='?', default=NUM_ENVS,
+                        help='Number of environments the model collects its rollouts from.')
+    parser.add_argument('-b', '--backend', type=str, nargs='?', default=BACKEND,
+                        help='How the environments are run: dummy, subproc, shared-memory or batched.')
+    parser.add_argument('-s', '--seed', type=int, nargs='?', default=None,
+                        help='Seed that each environment\'s seed is drawn from.')
+    parser.add_argument('-d', '--obsDtype', type=str, nargs='?', default=OBS_DTYPE,
+                        help='Data type of the observations: int8, float32 or float64.')
+    parser.add_argument('-o', '--obsMode', type=str, nargs='?', default=OBS_MODE,
+                        help='Layout of the observations: flat or planes.')
+    parser.add_argument('-m', '--mirrorProb', type=float, nargs='?', default=MIRROR_PROB,
+                        help='Probability of each episode being shown to the model as a mirror image of the board. '
+                             'Not supported by the batched backend.')
     args = parser.parse_args()
 
     # subVersion = 1
@@ -96,7 +115,13 @@ if __name__ == '__main__':
                   opponentName=args.opponentName,
                   rows=args.rows,
                   cols=args.columns,
-                  winCondition=args.winCondition)
+                  winCondition=args.winCondition,
+                  numEnvs=args.numEnvs,
+                  backend=args.backend,
+                  seed=args.seed,
+                  obsDtype=args.obsDtype,
+                  obsMode=args.obsMode,
+                  mirrorProb=args.mirrorProb)
 
     learn.updateEnv(modelPlayer=1, opponentName='models/PPO_6-7-4_v1.2/PPO_6-7-4_v1.2_1500000')
     learn.train(250, 10000)